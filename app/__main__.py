@@ -0,0 +1,13 @@
+"""
+Entry point for `python -m app` / `python app`: runs the command line interface.
+"""
+
+import os
+import sys
+
+# The app modules import each other by plain module name
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cli import main
+
+sys.exit(main())
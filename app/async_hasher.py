@@ -0,0 +1,252 @@
+"""
+Asyncio hashing backend.
+Awaitable counterpart of HashCalculator for embedding in asyncio services.
+Executables are driven as asyncio subprocesses, so stdin writes, stderr
+progress and process exit are events on the loop rather than a thread per
+pipe; in-process hashing runs on the loop's default executor.
+
+Usage:
+    hasher = AsyncHashCalculator()
+    digests = await hasher.hash_file(['SHA-256', 'MD5'], 'disk.img')
+    async for path, results, error in hasher.hash_files(['SHA-256'], paths):
+        ...
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import AsyncIterator, Callable, Iterable, Optional
+
+from hasher import HashCalculator, PROGRESS_PATTERN
+
+# Files hashed at the same time by hash_files
+DEFAULT_CONCURRENCY = 4
+
+
+def _update_hashers(hashers: dict, chunk: memoryview) -> None:
+    for hasher in hashers.values():
+        hasher.update(chunk)
+
+
+async def _write_chunk(proc: asyncio.subprocess.Process, chunk: memoryview) -> None:
+    proc.stdin.write(chunk)
+    await proc.stdin.drain()
+
+
+async def _read_progress(proc: asyncio.subprocess.Process, callback: Callable[[int], None]) -> None:
+    """Forward the PROGRESS:NN lines an executable writes to stderr."""
+    async for line in proc.stderr:
+        match = PROGRESS_PATTERN.match(line.decode('utf-8', errors='ignore').strip())
+        if match:
+            callback(int(match.group(1)))
+
+
+class AsyncHashCalculator:
+    """
+    Awaitable hashing API on top of a HashCalculator.
+
+    Cancelling the awaiting task stops the work: executables are killed and
+    in-process hashing stops at its next chunk.
+    """
+
+    def __init__(self, calculator: Optional[HashCalculator] = None):
+        """
+        Args:
+            calculator: Engine that resolves algorithms, picks read sizes and
+                holds the digest cache; a new one without warm-up by default
+        """
+        self.calculator = calculator or HashCalculator(warmup=False)
+
+    async def hash_text(self, algorithms: list[str], text: str) -> dict[str, str]:
+        """
+        Calculate hashes of text (see HashCalculator.calculate_text_sync).
+
+        Args:
+            algorithms: List of algorithm names
+            text: Input text
+
+        Returns:
+            Dictionary mapping algorithm name to hash string
+        """
+        loop = asyncio.get_running_loop()
+        cancelled = False
+        try:
+            return await loop.run_in_executor(
+                None, self.calculator.calculate_text_sync, algorithms, text, lambda: cancelled
+            )
+        except asyncio.CancelledError:
+            cancelled = True
+            self.calculator.cancel_text()
+            raise
+
+    async def hash_file(self,
+                        algorithms: list[str],
+                        file_path: str,
+                        progress_callback: Optional[Callable[[int], None]] = None) -> dict[str, str]:
+        """
+        Calculate multiple hashes of a file in a single read.
+
+        Args:
+            algorithms: List of algorithm names
+            file_path: Path to file
+            progress_callback: Called on the loop with the progress percentage
+                (for several consumers, that of the slowest)
+
+        Returns:
+            Dictionary mapping algorithm name to hash string
+
+        Raises:
+            OSError, RuntimeError or ValueError if the file cannot be hashed
+        """
+        piped = [algo for algo in algorithms if self.calculator.hasher_factory(algo) is None]
+        if piped:
+            return await self._hash_with_processes(algorithms, piped, file_path, progress_callback)
+        return await self._hash_in_executor(algorithms, file_path, progress_callback)
+
+    async def hash_files(self,
+                         algorithms: list[str],
+                         file_paths: Iterable[str],
+                         max_concurrency: int = DEFAULT_CONCURRENCY
+                         ) -> AsyncIterator[tuple[str, Optional[dict[str, str]], Optional[str]]]:
+        """
+        Hash many files concurrently.
+
+        Args:
+            algorithms: List of algorithm names
+            file_paths: Files to hash
+            max_concurrency: Number of files hashed at the same time
+
+        Yields:
+            (file_path, results, error) in the order of file_paths, where
+            exactly one of results and error is set
+        """
+        pending: deque = deque()
+        try:
+            for file_path in file_paths:
+                pending.append((file_path, asyncio.create_task(self._hash_or_error(algorithms, file_path))))
+                if len(pending) >= max(1, max_concurrency):
+                    done_path, task = pending.popleft()
+                    yield (done_path, *await task)
+            while pending:
+                done_path, task = pending.popleft()
+                yield (done_path, *await task)
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def _hash_or_error(self, algorithms: list[str],
+                             file_path: str) -> tuple[Optional[dict[str, str]], Optional[str]]:
+        try:
+            return await self.hash_file(algorithms, file_path), None
+        except (OSError, RuntimeError, ValueError) as ex:
+            return None, str(ex)
+
+    async def _hash_in_executor(self,
+                                algorithms: list[str],
+                                file_path: str,
+                                progress_callback: Optional[Callable[[int], None]]) -> dict[str, str]:
+        """Run HashCalculator.calculate_file on the default executor."""
+        loop = asyncio.get_running_loop()
+        cancelled = False
+        outcome = {}
+
+        def report(progress: int) -> None:
+            if progress_callback:
+                loop.call_soon_threadsafe(progress_callback, progress)
+
+        def run() -> None:
+            self.calculator.calculate_file(
+                algorithms,
+                file_path,
+                report,
+                lambda: cancelled,
+                lambda message: outcome.update(error=message),
+                lambda results: outcome.update(results=results)
+            )
+
+        try:
+            await loop.run_in_executor(None, run)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        if 'error' in outcome:
+            raise RuntimeError(outcome['error'])
+        return outcome['results']
+
+    async def _hash_with_processes(self,
+                                   algorithms: list[str],
+                                   piped: list[str],
+                                   file_path: str,
+                                   progress_callback: Optional[Callable[[int], None]]) -> dict[str, str]:
+        """Read the file once, feeding in-process hashers and executables together."""
+        loop = asyncio.get_running_loop()
+        file_size = os.path.getsize(file_path)
+        hashers = {
+            algo: self.calculator.new_in_process_hasher(algo)
+            for algo in algorithms if algo not in piped
+        }
+        processes: dict[str, asyncio.subprocess.Process] = {}
+        progress_tasks = []
+        # Progress percentage per consumer ('' stands for the in-process hashers)
+        progress = {}
+        last_reported = -1
+
+        def update_progress(consumer: str, percent: int) -> None:
+            nonlocal last_reported
+            progress[consumer] = percent
+            merged = min(progress.values())
+            if progress_callback and (merged >= last_reported + 5 or
+                                      (merged == 100 and last_reported < 100)):
+                last_reported = merged
+                progress_callback(merged)
+
+        try:
+            for algo in piped:
+                processes[algo] = await asyncio.create_subprocess_exec(
+                    self.calculator.executable_for(algo), str(file_size),
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                progress[algo] = 0
+                progress_tasks.append(asyncio.create_task(_read_progress(
+                    processes[algo], lambda percent, algo=algo: update_progress(algo, percent)
+                )))
+            if hashers:
+                progress[''] = 0
+
+            buffer = bytearray(self.calculator.read_size(file_size))
+            bytes_processed = 0
+            with open(file_path, 'rb', buffering=0) as f:
+                while True:
+                    count = await loop.run_in_executor(None, f.readinto, buffer)
+                    if not count:
+                        break
+                    # Every consumer takes the chunk at once; the buffer is
+                    # only refilled after all of them are done with it
+                    chunk = memoryview(buffer)[:count]
+                    consumers = [_write_chunk(proc, chunk) for proc in processes.values()]
+                    if hashers:
+                        consumers.append(loop.run_in_executor(None, _update_hashers, hashers, chunk))
+                    await asyncio.gather(*consumers)
+                    bytes_processed += count
+                    if hashers and file_size:
+                        update_progress('', min(100, bytes_processed * 100 // file_size))
+
+            results = {algo: hasher.hexdigest() for algo, hasher in hashers.items()}
+            for proc in processes.values():
+                proc.stdin.close()
+            for algo, proc in processes.items():
+                stdout = await proc.stdout.read()
+                if await proc.wait() != 0:
+                    raise RuntimeError(f"{algo}: Hash calculation failed")
+                results[algo] = stdout.decode('utf-8').strip()
+            await asyncio.gather(*progress_tasks)
+            return {algo: results[algo] for algo in algorithms}
+        finally:
+            for task in progress_tasks:
+                task.cancel()
+            for proc in processes.values():
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
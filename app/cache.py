@@ -0,0 +1,190 @@
+"""
+Persistent digest cache.
+Stores file digests in SQLite keyed by file identity, so unchanged files
+are answered without reading a single byte.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from config import get_user_data_dir
+
+# Default cache location inside the user data directory
+CACHE_FILE_NAME = "digest_cache.sqlite3"
+# Entries kept before the least recently used ones are evicted
+DEFAULT_MAX_ENTRIES = 1_000_000
+# Writes buffered before an implicit commit
+_COMMIT_INTERVAL = 256
+
+
+class DigestCache:
+    """
+    SQLite-backed cache of digests keyed by
+    (absolute path, size, st_mtime_ns, inode, device, algorithm).
+
+    A changed size, modification time or file identity makes the stored
+    entry stale; it is simply replaced the next time the file is hashed.
+    The connection is shared between threads behind a lock.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path: Database file, defaults to the user data directory
+            max_entries: Entries kept before LRU eviction kicks in
+        """
+        self.path = path or os.path.join(get_user_data_dir(), CACHE_FILE_NAME)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._pending_writes = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level='DEFERRED')
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS digests (
+                path TEXT NOT NULL,
+                algorithm TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                device INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (path, algorithm)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS digests_last_used ON digests (last_used)")
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM digests").fetchone()[0]
+
+    @staticmethod
+    def _identity(file_path: str, st: os.stat_result) -> tuple:
+        return (os.path.abspath(file_path), st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+
+    def lookup(self, file_path: str, st: os.stat_result, algorithms: list[str]) -> dict[str, str]:
+        """
+        Return the cached digests for a file.
+
+        Args:
+            file_path: Path to file
+            st: Current os.stat() result of the file
+            algorithms: Algorithm names wanted
+
+        Returns:
+            Dictionary with the algorithms that were found; a full hit
+            counts towards hits, anything else towards misses
+        """
+        path, size, mtime_ns, inode, device = self._identity(file_path, st)
+        found = {}
+        with self._lock:
+            for algo in algorithms:
+                row = self._conn.execute(
+                    "SELECT digest FROM digests WHERE path = ? AND algorithm = ? "
+                    "AND size = ? AND mtime_ns = ? AND inode = ? AND device = ?",
+                    (path, algo, size, mtime_ns, inode, device)
+                ).fetchone()
+                if row:
+                    found[algo] = row[0]
+            if found:
+                self._conn.executemany(
+                    "UPDATE digests SET last_used = ? WHERE path = ? AND algorithm = ?",
+                    [(time.time(), path, algo) for algo in found]
+                )
+                self._note_write(len(found))
+            if len(found) == len(algorithms):
+                self.hits += 1
+                self.bytes_saved += size
+            else:
+                self.misses += 1
+        return found
+
+    def store(self, file_path: str, st: os.stat_result, digests: dict[str, str]) -> None:
+        """
+        Remember digests computed for a file.
+
+        Args:
+            file_path: Path to file
+            st: os.stat() result taken before the file was read
+            digests: Dictionary mapping algorithm name to hash string
+        """
+        path, size, mtime_ns, inode, device = self._identity(file_path, st)
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            for algo, digest in digests.items():
+                cursor = self._conn.execute(
+                    "UPDATE digests SET size = ?, mtime_ns = ?, inode = ?, device = ?, "
+                    "digest = ?, last_used = ? WHERE path = ? AND algorithm = ?",
+                    (size, mtime_ns, inode, device, digest, now, path, algo)
+                )
+                if cursor.rowcount == 0:
+                    self._conn.execute(
+                        "INSERT INTO digests VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (path, algo, size, mtime_ns, inode, device, digest, now)
+                    )
+                    self._entries += 1
+            self._note_write(self._conn.total_changes - before)
+            if self._entries > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Drop a little more than needed so eviction is not run on every store
+        excess = self._entries - self.max_entries + max(1, self.max_entries // 100)
+        self._conn.execute(
+            "DELETE FROM digests WHERE rowid IN "
+            "(SELECT rowid FROM digests ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM digests").fetchone()[0]
+        self._conn.commit()
+        self._pending_writes = 0
+
+    def _note_write(self, count: int) -> None:
+        self._pending_writes += count
+        if self._pending_writes >= _COMMIT_INTERVAL:
+            self._conn.commit()
+            self._pending_writes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the bytes that did not have to be read."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bytes_saved': self.bytes_saved,
+                'entries': self._entries,
+            }
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss counters."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.bytes_saved = 0
+
+    def clear(self) -> None:
+        """Forget every cached digest."""
+        with self._lock:
+            self._conn.execute("DELETE FROM digests")
+            self._conn.commit()
+            self._entries = 0
+            self._pending_writes = 0
+
+    def flush(self) -> None:
+        """Commit buffered writes."""
+        with self._lock:
+            self._conn.commit()
+            self._pending_writes = 0
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
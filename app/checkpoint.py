@@ -0,0 +1,143 @@
+"""
+Resumable hashing checkpoints.
+Saves the digest state of large files in SQLite while they are hashed, so a
+cancelled or interrupted hash of an unchanged file continues from the last
+checkpoint instead of from the first byte.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from config import get_user_data_dir
+
+# Default checkpoint location inside the user data directory
+CHECKPOINT_FILE_NAME = "checkpoints.sqlite3"
+# Checkpoints older than this are dropped when the store is opened
+MAX_CHECKPOINT_AGE = 30 * 24 * 3600
+
+
+class Checkpoint(NamedTuple):
+    """Digest states of a partly hashed file."""
+    offset: int              # Bytes every state has consumed
+    states: dict[str, str]   # Algorithm name -> serialized hasher state
+
+
+class CheckpointStore:
+    """
+    SQLite-backed checkpoints keyed by absolute path and checked against
+    (size, st_mtime_ns, inode, device).
+
+    A file keeps at most one checkpoint; a changed file invalidates it.
+    Every save is committed at once, since checkpoints exist to survive the
+    process being closed or killed. The connection is shared between
+    threads behind a lock.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Database file, defaults to the user data directory
+        """
+        self.path = path or os.path.join(get_user_data_dir(), CHECKPOINT_FILE_NAME)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                device INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                states TEXT NOT NULL,
+                saved REAL NOT NULL
+            )
+        """)
+        self._conn.execute("DELETE FROM checkpoints WHERE saved < ?",
+                           (time.time() - MAX_CHECKPOINT_AGE,))
+        self._conn.commit()
+
+    @staticmethod
+    def _identity(file_path: str, st: os.stat_result) -> tuple:
+        return (os.path.abspath(file_path), st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+
+    def load(self, file_path: str, st: os.stat_result, algorithms: list[str]) -> Optional[Checkpoint]:
+        """
+        Return the checkpoint of a file if it is still valid.
+
+        Args:
+            file_path: Path to file
+            st: Current os.stat() result of the file
+            algorithms: Algorithm names wanted
+
+        Returns:
+            The checkpoint restricted to algorithms, or None if there is
+            none, the file changed or an algorithm is missing from it
+        """
+        path, size, mtime_ns, inode, device = self._identity(file_path, st)
+        with self._lock:
+            if self._closed:
+                return None
+            row = self._conn.execute(
+                "SELECT offset, states FROM checkpoints WHERE path = ? "
+                "AND size = ? AND mtime_ns = ? AND inode = ? AND device = ?",
+                (path, size, mtime_ns, inode, device)
+            ).fetchone()
+        if row is None:
+            return None
+        offset, states = row[0], json.loads(row[1])
+        if not 0 < offset <= size or any(algo not in states for algo in algorithms):
+            return None
+        return Checkpoint(offset, {algo: states[algo] for algo in algorithms})
+
+    def save(self, file_path: str, st: os.stat_result, offset: int, states: dict[str, str]) -> None:
+        """
+        Replace the checkpoint of a file.
+
+        Args:
+            file_path: Path to file
+            st: os.stat() result taken before the file was read
+            offset: Bytes every state has consumed
+            states: Algorithm name -> serialized hasher state
+        """
+        path, size, mtime_ns, inode, device = self._identity(file_path, st)
+        with self._lock:
+            if self._closed:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, inode, device, offset, json.dumps(states), time.time())
+            )
+            self._conn.commit()
+
+    def discard(self, file_path: str) -> None:
+        """Forget the checkpoint of a file (it was hashed to the end)."""
+        with self._lock:
+            if self._closed:
+                return
+            cursor = self._conn.execute("DELETE FROM checkpoints WHERE path = ?",
+                                        (os.path.abspath(file_path),))
+            if cursor.rowcount:
+                self._conn.commit()
+
+    def clear(self) -> None:
+        """Forget every checkpoint."""
+        with self._lock:
+            if self._closed:
+                return
+            self._conn.execute("DELETE FROM checkpoints")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database; later calls do nothing."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._conn.close()
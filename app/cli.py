@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Hash Algorithm command line interface.
+Hashes files, directories and stdin with the same single-pass engine as the
+GUI, without importing tkinter.
+
+Usage:
+    python -m app [-a ALGORITHM]... [--format sum|jsonl|csv] [PATH]...
+    python -m app --check MANIFEST [--fail-fast]
+    python -m app --duplicates [--format sum|jsonl|csv] PATH...
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+from typing import Iterable, Iterator, Optional, Sequence
+
+from config import HashAlgorithm
+from hasher import HashCalculator
+from manifest import parse_manifest, VERIFY_ERROR
+from results import (csv_header, duplicates_csv_header, format_csv, format_duplicates,
+                     format_jsonl, format_sum)
+from walker import walk_files, SYMLINK_POLICIES, SYMLINKS_FILES
+
+# Path that stands for standard input, as in sha256sum
+STDIN_PATH = '-'
+
+
+def iter_input_files(paths: Iterable[str],
+                     include: Sequence[str] = (),
+                     exclude: Sequence[str] = (),
+                     symlinks: str = SYMLINKS_FILES,
+                     max_depth: Optional[int] = None) -> Iterator[str]:
+    """
+    Expand the command line paths into files.
+
+    Directories are walked recursively with walker.walk_files; anything
+    else is passed through so the hasher reports a missing or unreadable
+    path as an error.
+
+    Args:
+        paths: Files and directories from the command line
+        include: Globs a file inside a directory must match
+        exclude: Globs of files and folders to skip inside a directory
+        symlinks: Symbolic link policy inside directories
+        max_depth: Deepest folder level to enter, None for no limit
+
+    Yields:
+        File paths, in the order their results are printed
+    """
+    def report_error(path: str, ex: OSError) -> None:
+        print(f"hashcli: {path}: {ex.strerror or ex}", file=sys.stderr)
+
+    for path in paths:
+        if path != STDIN_PATH and os.path.isdir(path):
+            for entry in walk_files(path, include, exclude, symlinks, max_depth,
+                                    error_callback=report_error):
+                yield entry.path
+        else:
+            yield path
+
+
+def iter_sized_files(paths: Iterable[str],
+                     include: Sequence[str] = (),
+                     exclude: Sequence[str] = (),
+                     symlinks: str = SYMLINKS_FILES,
+                     max_depth: Optional[int] = None) -> Iterator[tuple[str, int]]:
+    """
+    Like iter_input_files, but yield (path, size) pairs. Sizes come from
+    the directory scan; paths given directly get -1 (looked up later).
+    """
+    def report_error(path: str, ex: OSError) -> None:
+        print(f"hashcli: {path}: {ex.strerror or ex}", file=sys.stderr)
+
+    for path in paths:
+        if os.path.isdir(path):
+            for entry in walk_files(path, include, exclude, symlinks, max_depth,
+                                    error_callback=report_error):
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    size = -1
+                yield entry.path, size
+        else:
+            yield path, -1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog='hashcli',
+        description="Hash files, directories (recursively) and stdin."
+    )
+    parser.add_argument('paths', nargs='*', metavar='PATH',
+                        help="files or directories to hash; '-' or nothing reads stdin")
+    parser.add_argument('-a', '--algorithm', action='append', dest='algorithms',
+                        metavar='NAME', help="algorithm to use, may be repeated (default: SHA-256)")
+    parser.add_argument('--format', choices=('sum', 'jsonl', 'csv'), default='sum',
+                        help="sha256sum-compatible lines, JSON Lines or CSV (default: sum)")
+    parser.add_argument('--tag', action='store_true',
+                        help="BSD style 'ALGO (path) = digest' lines even for one algorithm")
+    parser.add_argument('--include', action='append', default=[], metavar='GLOB',
+                        help="inside directories, only hash files matching GLOB (may be repeated)")
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help="inside directories, skip files and folders matching GLOB (may be repeated)")
+    parser.add_argument('--symlinks', choices=SYMLINK_POLICIES, default=SYMLINKS_FILES,
+                        help="symbolic links inside directories: skip them, hash linked files, "
+                             "or also follow linked folders (default: files)")
+    parser.add_argument('--max-depth', type=int, metavar='N',
+                        help="do not descend more than N folder levels")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="files hashed at the same time (default: CPU count)")
+    parser.add_argument('-c', '--check', metavar='MANIFEST',
+                        help="verify the files listed in a sha256sum or BSD style manifest")
+    parser.add_argument('--fail-fast', action='store_true',
+                        help="with --check, stop at the first mismatch or missing file")
+    parser.add_argument('--duplicates', action='store_true',
+                        help="list groups of files with identical content instead of digests "
+                             "(sizes first, then the first and last KB, then a full SHA-256)")
+    parser.add_argument('--cache', action='store_true',
+                        help="use and update the persistent digest cache")
+    parser.add_argument('--resume', action='store_true',
+                        help="checkpoint files of 1 GB and more while hashing, so an "
+                             "interrupted run continues where it stopped")
+    parser.add_argument('--list-algorithms', action='store_true',
+                        help="print the available algorithm names and exit")
+    return parser
+
+
+def format_rate(byte_count: float, seconds: float) -> str:
+    """Format a throughput as MB/s."""
+    rate = byte_count / seconds if seconds > 0 else 0.0
+    return f"{rate / (1024 * 1024):.1f} MB/s"
+
+
+def run_check(hasher: HashCalculator, args: argparse.Namespace, check_cancel) -> int:
+    """
+    Verify a manifest and print one "name: STATUS" line per entry.
+
+    Returns:
+        Process exit status: 0 if every entry is OK, 1 otherwise
+    """
+    # A single -a forces the algorithm of untagged lines
+    forced = args.algorithms[0] if args.algorithms and len(args.algorithms) == 1 else None
+    try:
+        entries = parse_manifest(args.check, forced)
+    except (OSError, ValueError) as ex:
+        print(f"hashcli: {args.check}: {ex}", file=sys.stderr)
+        return 1
+
+    out = sys.stdout
+
+    def report(entry, status: str, detail: str) -> None:
+        if status == VERIFY_ERROR:
+            # Same wording as coreutils for unreadable files
+            print(f"hashcli: {entry.name}: {detail}", file=sys.stderr)
+            out.write(f"{entry.name}: FAILED open or read\n")
+        else:
+            out.write(f"{entry.name}: {status}\n")
+
+    summary = hasher.verify_manifest(
+        entries,
+        check_cancel,
+        report,
+        max_workers=args.jobs,
+        fail_fast=args.fail_fast
+    )
+    out.flush()
+
+    print(f"hashcli: {summary['ok']} OK, {summary['failed']} FAILED, "
+          f"{summary['missing']} MISSING, {summary['errors']} unreadable "
+          f"({summary['bytes']} bytes in {summary['seconds']:.2f}s, "
+          f"{format_rate(summary['bytes'], summary['seconds'])})", file=sys.stderr)
+    return 0 if summary['ok'] == len(entries) else 1
+
+
+def run_duplicates(hasher: HashCalculator, args: argparse.Namespace, check_cancel) -> int:
+    """
+    Print the groups of duplicate files below the command line paths.
+
+    Returns:
+        Process exit status: 0, or 1 if a file could not be read
+    """
+    entries = iter_sized_files(args.paths, args.include, args.exclude,
+                               args.symlinks, args.max_depth)
+    summary = hasher.find_duplicates(entries, check_cancel, max_workers=args.jobs)
+
+    out = sys.stdout
+    if args.format == 'csv':
+        out.write(duplicates_csv_header())
+    for index, group in enumerate(summary['groups'], 1):
+        out.write(format_duplicates(args.format, index, group.size, group.paths))
+    out.flush()
+
+    total = summary['total_bytes']
+    share = summary['bytes_read'] * 100 / total if total else 0.0
+    print(f"hashcli: {len(summary['groups'])} duplicate groups, {summary['duplicates']} "
+          f"redundant files, {summary['wasted']} bytes wasted; read {summary['bytes_read']} "
+          f"of {total} bytes ({share:.1f}%) in {summary['seconds']:.2f}s", file=sys.stderr)
+    if summary['errors']:
+        print(f"hashcli: {summary['errors']} files could not be read", file=sys.stderr)
+    return 1 if summary['errors'] else 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Run the command line interface.
+
+    Args:
+        argv: Arguments without the program name, defaults to sys.argv[1:]
+
+    Returns:
+        Process exit status: 0 on success, 1 if any input failed
+    """
+    args = build_parser().parse_args(argv)
+
+    available = HashAlgorithm.all()
+    if HashAlgorithm.load_error:
+        print(f"hashcli: {HashAlgorithm.load_error}", file=sys.stderr)
+    if args.list_algorithms:
+        for name in available:
+            print(name)
+        return 0
+
+    algorithms = args.algorithms or ['SHA-256']
+    unknown = [algo for algo in algorithms if algo not in available]
+    if unknown:
+        print(f"hashcli: unknown algorithm: {', '.join(unknown)} "
+              f"(available: {', '.join(available)})", file=sys.stderr)
+        return 2
+
+    if args.duplicates and not args.check and (not args.paths or STDIN_PATH in args.paths):
+        print("hashcli: --duplicates needs files or directories, not stdin", file=sys.stderr)
+        return 2
+
+    cache = None
+    if args.cache:
+        from cache import DigestCache  # sqlite3 is only loaded when asked for
+        cache = DigestCache()
+    checkpoints = None
+    if args.resume:
+        from checkpoint import CheckpointStore
+        checkpoints = CheckpointStore()
+    hasher = HashCalculator(cache=cache, warmup=False, checkpoints=checkpoints)
+
+    out = sys.stdout
+    failed = False
+    cancelled = False
+
+    def report(path: str, results: Optional[dict[str, str]], error: Optional[str]) -> None:
+        nonlocal failed
+        if error is not None:
+            failed = True
+        if args.format == 'jsonl':
+            out.write(format_jsonl(path, results, error))
+        elif args.format == 'csv':
+            out.write(format_csv(path, results, error, algorithms))
+        elif error is not None:
+            print(f"hashcli: {path}: {error}", file=sys.stderr)
+        else:
+            out.write(format_sum(path, results, args.tag))
+
+    def check_cancel() -> bool:
+        return cancelled
+
+    def on_interrupt(signum, frame) -> None:
+        # Flag the workers before unwinding, so they stop (and checkpoint)
+        # instead of being waited for
+        nonlocal cancelled
+        cancelled = True
+        raise KeyboardInterrupt
+
+    previous_handler = None
+    if threading.current_thread() is threading.main_thread():
+        previous_handler = signal.signal(signal.SIGINT, on_interrupt)
+
+    paths = args.paths or [STDIN_PATH]
+    try:
+        if args.check:
+            return run_check(hasher, args, check_cancel)
+        if args.duplicates:
+            return run_duplicates(hasher, args, check_cancel)
+        if args.format == 'csv':
+            out.write(csv_header(algorithms))
+        # Consecutive files go to the worker pool together; stdin is hashed inline
+        index = 0
+        while index < len(paths):
+            if paths[index] == STDIN_PATH:
+                try:
+                    results = hasher.calculate_stream(algorithms, sys.stdin.buffer)
+                    report(STDIN_PATH, results, None)
+                except Exception as ex:
+                    report(STDIN_PATH, None, str(ex))
+                index += 1
+                continue
+            end = index
+            while end < len(paths) and paths[end] != STDIN_PATH:
+                end += 1
+            hasher.calculate_files(
+                algorithms,
+                iter_input_files(paths[index:end], args.include, args.exclude,
+                                 args.symlinks, args.max_depth),
+                lambda completed: None,
+                check_cancel,
+                report,
+                max_workers=args.jobs
+            )
+            index = end
+        out.flush()
+    except KeyboardInterrupt:
+        cancelled = True
+        return 130
+    except BrokenPipeError:
+        # Output closed early (e.g. piped into head); exit quietly
+        cancelled = True
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        hasher.terminate_subprocess()
+        if cache is not None:
+            cache.close()
+        if checkpoints is not None:
+            checkpoints.close()
+        if previous_handler is not None:
+            signal.signal(signal.SIGINT, previous_handler)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
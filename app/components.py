@@ -3,8 +3,11 @@ UI components for Hash Algorithm GUI.
 """
 
 import tkinter as tk
-from tkinter import ttk
-from typing import Optional
+from tkinter import ttk, messagebox
+from typing import Callable, Optional
+
+from fileset import FileSet, STATUS_NAMES
+from progress import ProgressSnapshot, format_eta
 
 class StatusIndicator(tk.Frame):
     """Custom widget to display status with an icon and text."""
@@ -17,7 +20,7 @@ class StatusIndicator(tk.Frame):
         self.canvas.pack(side=tk.LEFT, padx=(0, 5))
         
         # Status text
-        self.label = ttk.Label(self, text="", width=35, anchor="w")
+        self.label = ttk.Label(self, text="", width=48, anchor="w")
         self.label.pack(side=tk.LEFT)
         
         self._angle = 0
@@ -37,10 +40,21 @@ class StatusIndicator(tk.Frame):
         if not self._animation_id:
             self._animate_spinner()
         
-    def set_complete(self):
-        """Set status to complete with a green check mark."""
+    def set_progress(self, snapshot: ProgressSnapshot, more_files: bool = False):
+        """Set status to calculating with batch percent, throughput and ETA."""
+        self._animating = True
+        total = f"{snapshot.files_total}+" if more_files else str(snapshot.files_total)
+        rate = snapshot.bytes_per_second / (1024 * 1024)
+        self.label.config(text=f"{snapshot.files_done}/{total}  {snapshot.percent}%  "
+                               f"{rate:.1f} MB/s  {snapshot.files_per_second:.0f} files/s  "
+                               f"ETA {format_eta(snapshot.eta_seconds)}")
+        if not self._animation_id:
+            self._animate_spinner()
+        
+    def set_complete(self, detail: str = ""):
+        """Set status to complete with a green check mark and optional detail."""
         self._stop_animation()
-        self.label.config(text="Complete")
+        self.label.config(text=f"Complete ({detail})" if detail else "Complete")
         self._draw_check_mark()
     
     def set_input_changed(self):
@@ -144,3 +158,242 @@ class ToolTip:
         self.tw= None
         if tw:
             tw.destroy()
+
+
+class FolderScanDialog(tk.Toplevel):
+    """
+    Modal dialog editing the folder scan settings (include/exclude globs,
+    symbolic link policy and maximum depth) held in the given variables.
+    """
+    
+    def __init__(self, parent, include_var: tk.StringVar, exclude_var: tk.StringVar,
+                 symlinks_var: tk.StringVar, max_depth_var: tk.StringVar,
+                 symlink_policies: tuple):
+        super().__init__(parent)
+        self.title("Folder Scan Settings")
+        self.resizable(False, False)
+        self.transient(parent)
+        
+        # Edit copies so Cancel leaves the settings untouched
+        self._targets = (include_var, exclude_var, symlinks_var, max_depth_var)
+        self._values = [tk.StringVar(self, value=var.get()) for var in self._targets]
+        
+        frame = ttk.Frame(self, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        rows = (
+            ("Include (e.g. *.iso; *.zip):", ttk.Entry(frame, textvariable=self._values[0], width=36)),
+            ("Exclude (e.g. .git; *.tmp):", ttk.Entry(frame, textvariable=self._values[1], width=36)),
+            ("Symbolic links:", ttk.Combobox(frame, textvariable=self._values[2],
+                                             values=symlink_policies, state="readonly", width=10)),
+            ("Max depth (blank = unlimited):", ttk.Entry(frame, textvariable=self._values[3], width=8)),
+        )
+        for row, (label, widget) in enumerate(rows):
+            ttk.Label(frame, text=label).grid(row=row, column=0, sticky="w", pady=2)
+            widget.grid(row=row, column=1, sticky="w", padx=(5, 0), pady=2)
+        
+        buttons = ttk.Frame(frame)
+        buttons.grid(row=len(rows), column=0, columnspan=2, sticky="e", pady=(10, 0))
+        ttk.Button(buttons, text="OK", command=self._on_ok).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(buttons, text="Cancel", command=self.destroy).pack(side=tk.LEFT)
+        
+        self.bind("<Return>", lambda event: self._on_ok())
+        self.bind("<Escape>", lambda event: self.destroy())
+        self.grab_set()
+        
+    def _on_ok(self):
+        depth = self._values[3].get().strip()
+        if depth and not depth.isdigit():
+            messagebox.showerror("Folder Scan Settings", "Max depth must be a whole number.", parent=self)
+            return
+        for target, value in zip(self._targets, self._values):
+            target.set(value.get().strip())
+        self.destroy()
+
+
+def format_size(size: int) -> str:
+    """Format a byte count for display ('' if unknown)."""
+    if size < 0:
+        return ""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class VirtualFileList(ttk.Frame):
+    """
+    Virtualized view of a FileSet.
+    
+    The Treeview only holds as many items as fit on screen; scrolling
+    rewrites their values from the model instead of creating an item per
+    file. Selection is kept as a set of file ids so it survives scrolling.
+    """
+    
+    COLUMNS = (
+        ("name", "Name", 180),
+        ("folder", "Folder", 160),
+        ("size", "Size", 70),
+        ("status", "Status", 60),
+        ("digest", "Digest", 260),
+    )
+    
+    def __init__(self, parent, file_set: FileSet,
+                 select_callback: Optional[Callable[[], None]] = None, height: int = 8):
+        """
+        Args:
+            parent: Parent widget
+            file_set: Model to display
+            select_callback: Called whenever the selection changes
+            height: Initial number of visible rows
+        """
+        super().__init__(parent)
+        self.file_set = file_set
+        self.selected_ids: set[int] = set()
+        self._select_callback = select_callback
+        self._top = 0
+        self._visible_rows = height
+        self._anchor_row: Optional[int] = None
+        self._items: list[str] = []
+        self._row_ids: list[int] = []
+        self._refresh_pending = False
+        
+        self.tree = ttk.Treeview(
+            self,
+            columns=[key for key, _, _ in self.COLUMNS],
+            show="headings",
+            selectmode="none",
+            height=height
+        )
+        for key, title, width in self.COLUMNS:
+            self.tree.heading(key, text=title, anchor="w")
+            self.tree.column(key, width=width, minwidth=40, stretch=(key == "digest"))
+        
+        # Selection is drawn with a tag because the items are recycled
+        style = ttk.Style()
+        self.tree.tag_configure(
+            "selected",
+            background=style.lookup("Treeview", "background", ("selected",)) or "#0078d7",
+            foreground=style.lookup("Treeview", "foreground", ("selected",)) or "white"
+        )
+        
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", self._on_wheel)
+        self.tree.bind("<Button-5>", self._on_wheel)
+        self.tree.bind("<Button-1>", lambda event: self._on_click(event, "single"))
+        self.tree.bind("<Control-Button-1>", lambda event: self._on_click(event, "toggle"))
+        self.tree.bind("<Shift-Button-1>", lambda event: self._on_click(event, "range"))
+        self.tree.bind("<Control-a>", self._select_all)
+        
+        self.refresh()
+    
+    def schedule_refresh(self) -> None:
+        """Redraw soon, coalescing bursts of model updates into one redraw."""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after(50, self.refresh)
+    
+    def refresh(self) -> None:
+        """Rewrite the visible rows from the model."""
+        self._refresh_pending = False
+        total = len(self.file_set)
+        rows = self._visible_rows
+        self._top = max(0, min(self._top, total - rows))
+        ids = self.file_set.ids_in_rows(self._top, self._top + rows)
+        
+        # Keep exactly one Treeview item per visible row
+        while len(self._items) < len(ids):
+            self._items.append(self.tree.insert("", tk.END))
+        while len(self._items) > len(ids):
+            self.tree.delete(self._items.pop())
+        
+        for item, file_id in zip(self._items, ids):
+            name, folder, size, status, digest = self.file_set.row_values(file_id)
+            self.tree.item(
+                item,
+                values=(name, folder, format_size(size), STATUS_NAMES.get(status, ""), digest),
+                tags=("selected",) if file_id in self.selected_ids else ()
+            )
+        self._row_ids = ids
+        
+        if total > rows:
+            self.scrollbar.set(self._top / total, (self._top + rows) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def clear_selection(self) -> None:
+        """Deselect every file."""
+        self.selected_ids.clear()
+        self._anchor_row = None
+        self.refresh()
+        self._notify_selection()
+    
+    def _notify_selection(self) -> None:
+        if self._select_callback:
+            self._select_callback()
+    
+    def _scroll_to(self, top: int) -> None:
+        self._top = top
+        self.refresh()
+    
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self.file_set)))
+        elif action == "scroll":
+            step = self._visible_rows if unit == "pages" else 1
+            self._scroll_to(self._top + int(amount) * step)
+    
+    def _on_wheel(self, event) -> str:
+        if event.num == 4 or event.delta > 0:
+            self._scroll_to(self._top - 3)
+        elif event.num == 5 or event.delta < 0:
+            self._scroll_to(self._top + 3)
+        return "break"
+    
+    def _on_resize(self, event) -> None:
+        # Measure header and row height from a rendered row when possible
+        header, row_height = 24, 20
+        if self._items:
+            bbox = self.tree.bbox(self._items[0])
+            if bbox:
+                header, row_height = bbox[1], bbox[3]
+        rows = max(1, (event.height - header) // max(1, row_height))
+        if rows != self._visible_rows:
+            self._visible_rows = rows
+            self.refresh()
+    
+    def _on_click(self, event, mode: str) -> Optional[str]:
+        if self.tree.identify_region(event.x, event.y) == "heading":
+            return None
+        self.tree.focus_set()
+        item = self.tree.identify_row(event.y)
+        if not item or item not in self._items:
+            return "break"
+        index = self._items.index(item)
+        row = self._top + index
+        file_id = self._row_ids[index]
+        
+        if mode == "toggle":
+            self.selected_ids.symmetric_difference_update((file_id,))
+            self._anchor_row = row
+        elif mode == "range" and self._anchor_row is not None:
+            start, stop = sorted((self._anchor_row, row))
+            self.selected_ids = set(self.file_set.ids_in_rows(start, stop + 1))
+        else:
+            self.selected_ids = {file_id}
+            self._anchor_row = row
+        
+        self.refresh()
+        self._notify_selection()
+        return "break"
+    
+    def _select_all(self, event=None) -> str:
+        self.selected_ids = set(self.file_set.ids_in_rows(0, len(self.file_set)))
+        self.refresh()
+        self._notify_selection()
+        return "break"
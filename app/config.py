@@ -6,13 +6,37 @@ import json
 import os
 import sys
 from typing import List, Dict, Optional
-from tkinter import messagebox
+
+# Folder name for per-user application data (cache, checkpoints, ...)
+APP_DATA_NAME = "HashingGUI"
+
+
+def get_user_data_dir() -> str:
+    """
+    Return (and create) the per-user data directory for this application.
+    
+    Returns:
+        %LOCALAPPDATA%\\HashingGUI on Windows, ~/Library/Caches/HashingGUI on
+        macOS and $XDG_CACHE_HOME/HashingGUI (default ~/.cache) elsewhere
+    """
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    path = os.path.join(base, APP_DATA_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
 
 class HashAlgorithm:
     """Dynamically loads hash algorithms from config file."""
     
     _algorithms: List[Dict] = []
     _config_loaded = False
+    # Problem found while loading the config, shown by the GUI / CLI
+    load_error: Optional[str] = None
     
     @classmethod
     def load_config(cls, config_path: str = "algorithms.json") -> None:
@@ -41,10 +65,7 @@ class HashAlgorithm:
                 cls._algorithms = config.get('algorithms', [])
                 cls._config_loaded = True
         except FileNotFoundError:
-            messagebox.showerror(
-                "Configuration Error",
-                f"Could not find {config_path}. Using default algorithms."
-            )
+            cls.load_error = f"Could not find {config_path}. Using default algorithms."
             # Fallback to default algorithms
             cls._algorithms = [
                 {"name": "SHA-256", "type": "hashlib", "hashlib_name": "sha256"},
@@ -53,10 +74,7 @@ class HashAlgorithm:
             ]
             cls._config_loaded = True
         except json.JSONDecodeError as e:
-            messagebox.showerror(
-                "Configuration Error",
-                f"Invalid JSON in {config_path}: {e}"
-            )
+            cls.load_error = f"Invalid JSON in {config_path}: {e}"
             cls._algorithms = []
             cls._config_loaded = True
     
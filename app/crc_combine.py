@@ -0,0 +1,66 @@
+"""
+CRC combination.
+Merges the CRCs of two adjacent byte ranges into the CRC of their
+concatenation (the GF(2) matrix method of zlib's crc32_combine), so a file
+can be checksummed in independent segments.
+"""
+
+# Reflected polynomials of the CRCs that can be combined
+CRC_POLYNOMIALS = {
+    "CRC-32": 0xEDB88320,
+    "CRC-32C": 0x82F63B78,
+}
+
+
+def _gf2_matrix_times(matrix: list[int], vector: int) -> int:
+    total = 0
+    row = 0
+    while vector:
+        if vector & 1:
+            total ^= matrix[row]
+        vector >>= 1
+        row += 1
+    return total
+
+
+def _gf2_matrix_square(matrix: list[int]) -> list[int]:
+    return [_gf2_matrix_times(matrix, matrix[row]) for row in range(32)]
+
+
+def crc32_combine(crc1: int, crc2: int, length2: int, polynomial: int = CRC_POLYNOMIALS["CRC-32"]) -> int:
+    """
+    Combine the CRCs of two consecutive byte ranges.
+
+    Args:
+        crc1: CRC of the first range
+        crc2: CRC of the second range
+        length2: Length of the second range in bytes
+        polynomial: Reflected CRC polynomial (see CRC_POLYNOMIALS)
+
+    Returns:
+        CRC of the first range followed by the second
+    """
+    if length2 <= 0:
+        return crc1
+
+    # Operator that appends one zero bit, then two and four zero bits
+    odd = [polynomial] + [1 << row for row in range(31)]
+    even = _gf2_matrix_square(odd)
+    odd = _gf2_matrix_square(even)
+
+    # Apply length2 zero bytes to crc1, squaring the operator per length bit
+    while True:
+        even = _gf2_matrix_square(odd)
+        if length2 & 1:
+            crc1 = _gf2_matrix_times(even, crc1)
+        length2 >>= 1
+        if not length2:
+            break
+        odd = _gf2_matrix_square(even)
+        if length2 & 1:
+            crc1 = _gf2_matrix_times(odd, crc1)
+        length2 >>= 1
+        if not length2:
+            break
+
+    return crc1 ^ crc2
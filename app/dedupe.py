@@ -0,0 +1,133 @@
+"""
+Duplicate file detection helpers.
+Duplicates are narrowed down in stages so most bytes are never read: files
+are grouped by size, same-size files by a hash of their first and last few
+KB, and only files that still collide are hashed in full.
+"""
+
+import hashlib
+import os
+from typing import Iterable, Iterator, NamedTuple
+
+# Bytes read from each end of a file for its partial hash
+PARTIAL_HASH_SIZE = 4 * 1024
+# Full hash stage: always collision resistant, whatever algorithms the user
+# picked for hashing, since a match here means a file may be deleted
+FULL_HASH_ALGORITHM = 'SHA-256'
+
+
+class DuplicateGroup(NamedTuple):
+    """Files with identical content."""
+    size: int
+    paths: list[str]
+
+    @property
+    def wasted_bytes(self) -> int:
+        """Bytes taken by every copy but one."""
+        return self.size * (len(self.paths) - 1)
+
+
+def known_sizes(entries: Iterable[tuple[str, int]]) -> Iterator[tuple[str, int]]:
+    """
+    Fill in unknown sizes.
+
+    Args:
+        entries: (path, size) pairs; a negative size is looked up with
+            os.stat and files that cannot be stat'ed are dropped
+
+    Yields:
+        (path, size) pairs with the size known
+    """
+    for path, size in entries:
+        if size < 0:
+            try:
+                size = os.stat(path).st_size
+            except OSError:
+                continue
+        yield path, size
+
+
+def drop_hard_links(paths: list[str]) -> list[str]:
+    """
+    Keep the first path of each (device, inode) pair.
+
+    Hard links are one file, not copies. Paths that cannot be stat'ed, and
+    file systems that report no inode numbers (st_ino 0), are kept as they
+    are; reading them later reports any error.
+    """
+    kept = []
+    seen: set[tuple[int, int]] = set()
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            kept.append(path)
+            continue
+        identity = (st.st_dev, st.st_ino)
+        if st.st_ino == 0 or identity not in seen:
+            seen.add(identity)
+            kept.append(path)
+    return kept
+
+
+def group_by_size(entries: Iterable[tuple[str, int]]) -> dict[int, list[str]]:
+    """
+    Group files by size, keeping only sizes shared by several files.
+
+    Args:
+        entries: (path, size) pairs with known sizes (see known_sizes)
+
+    Returns:
+        Paths per size, in input order, each path once and each hard-linked
+        file once. Empty files are left out: they are all identical and
+        waste nothing.
+    """
+    by_size: dict[int, list[str]] = {}
+    seen: set[str] = set()
+    for path, size in entries:
+        if size > 0 and path not in seen:
+            seen.add(path)
+            by_size.setdefault(size, []).append(path)
+    # Only files that share a size are stat'ed again for their identity
+    groups = {}
+    for size, paths in by_size.items():
+        if len(paths) > 1:
+            paths = drop_hard_links(paths)
+            if len(paths) > 1:
+                groups[size] = paths
+    return groups
+
+
+def partial_key(path: str, size: int) -> tuple[str, bool]:
+    """
+    Hash the first and last PARTIAL_HASH_SIZE bytes of a file.
+
+    Args:
+        path: File path
+        size: Size the file was grouped by
+
+    Returns:
+        (partial digest, complete): complete when the two ends covered the
+        whole file, in which case the digest already decides equality
+
+    Raises:
+        OSError: If the file cannot be read or no longer has that size
+    """
+    with open(path, 'rb', buffering=0) as f:
+        if os.fstat(f.fileno()).st_size != size:
+            raise OSError(f"{path} changed size while scanning")
+        digest = hashlib.blake2b(digest_size=16)
+        head = f.read(PARTIAL_HASH_SIZE)
+        digest.update(head)
+        complete = size <= 2 * PARTIAL_HASH_SIZE
+        if complete:
+            digest.update(f.read())
+        else:
+            f.seek(size - PARTIAL_HASH_SIZE)
+            digest.update(f.read(PARTIAL_HASH_SIZE))
+        return digest.hexdigest(), complete
+
+
+def partial_read_size(size: int) -> int:
+    """Return the bytes partial_key reads from a file of this size."""
+    return min(size, 2 * PARTIAL_HASH_SIZE)
@@ -0,0 +1,311 @@
+"""
+File set model for File mode.
+An ordered set of file paths that scales to millions of entries: folders are
+interned and stored once, each file keeps only its basename, and adding or
+removing a file does not shift any other entry.
+"""
+
+import os
+import threading
+from array import array
+from typing import Iterable, Optional
+
+# Per-file status codes (0 marks a removed entry)
+STATUS_REMOVED = 0
+STATUS_PENDING = 1
+STATUS_DONE = 2
+STATUS_ERROR = 3
+STATUS_NAMES = {STATUS_PENDING: "Pending", STATUS_DONE: "Done", STATUS_ERROR: "Error"}
+
+# Size stored for files whose size is not known
+UNKNOWN_SIZE = -1
+
+# Status translation table used to reset finished entries to pending
+_RESET_STATUS = bytes(
+    STATUS_PENDING if code in (STATUS_DONE, STATUS_ERROR) else code for code in range(256)
+)
+
+
+class _Fenwick:
+    """
+    Binary indexed tree over 0/1 "alive" flags.
+
+    Maps a visible row number to its file id and back in O(log n), so
+    removed entries can stay in place as tombstones.
+    """
+
+    def __init__(self):
+        self._tree = array('q', [0])
+
+    def __len__(self) -> int:
+        return len(self._tree) - 1
+
+    def append(self, value: int) -> None:
+        """Add a new last element."""
+        tree = self._tree
+        index = len(tree)
+        stop = index - (index & -index)
+        child = index - 1
+        # The new node covers itself plus the nodes of its children
+        while child > stop:
+            value += tree[child]
+            child -= child & -child
+        tree.append(value)
+
+    def add(self, position: int, delta: int) -> None:
+        """Add delta to the element at position (0-based)."""
+        tree = self._tree
+        index = position + 1
+        while index < len(tree):
+            tree[index] += delta
+            index += index & -index
+
+    def prefix(self, position: int) -> int:
+        """Sum of the elements before position."""
+        tree = self._tree
+        total = 0
+        index = position
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def find(self, rank: int) -> int:
+        """Position of the element whose prefix sum first exceeds rank."""
+        tree = self._tree
+        size = len(tree) - 1
+        position = 0
+        step = 1 << (size.bit_length() - 1) if size else 0
+        while step:
+            candidate = position + step
+            if candidate <= size and tree[candidate] <= rank:
+                position = candidate
+                rank -= tree[candidate]
+            step >>= 1
+        return position
+
+
+class FileSet:
+    """
+    Ordered, de-duplicated collection of files with per-file size, status
+    and digest.
+
+    Files are identified by an integer id that never changes until
+    compact() is called. Rows are the positions of the files that are still
+    present, which is what a list view shows. All methods are thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove every file."""
+        with self._lock:
+            self._dirs: list[str] = []
+            self._dir_ids: dict[str, int] = {}
+            self._entry_dirs = array('l')
+            self._entry_names: list[str] = []
+            self._sizes = array('q')
+            self._status = bytearray()
+            self._digests: dict[int, str] = {}
+            self._ids: dict[tuple[int, str], int] = {}
+            self._alive = _Fenwick()
+            self._count = 0
+            self._total_size = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def total_size(self) -> int:
+        """Sum of the known sizes of the present files."""
+        return self._total_size
+
+    @property
+    def removed_count(self) -> int:
+        """Number of tombstones left behind by remove()."""
+        return len(self._entry_names) - self._count
+
+    def _dir_id(self, folder: str) -> int:
+        dir_id = self._dir_ids.get(folder)
+        if dir_id is None:
+            dir_id = len(self._dirs)
+            self._dirs.append(folder)
+            self._dir_ids[folder] = dir_id
+        return dir_id
+
+    def _find(self, path: str) -> Optional[int]:
+        folder, name = os.path.split(path)
+        dir_id = self._dir_ids.get(folder)
+        return None if dir_id is None else self._ids.get((dir_id, name))
+
+    def __contains__(self, path: str) -> bool:
+        with self._lock:
+            return self._find(path) is not None
+
+    def add(self, path: str, size: int = UNKNOWN_SIZE) -> bool:
+        """
+        Append a file unless it is already present.
+
+        Returns:
+            True if the file was added
+        """
+        folder, name = os.path.split(path)
+        return self.add_entries([(folder, name, size)]) == 1
+
+    def add_entries(self, entries: Iterable[tuple[str, str, int]]) -> int:
+        """
+        Append (folder, name, size) entries, skipping files already present.
+
+        Returns:
+            Number of files added
+        """
+        added = 0
+        added_size = 0
+        with self._lock:
+            ids = self._ids
+            dir_ids = self._dir_ids
+            alive_append = self._alive.append
+            entry_dirs, names = self._entry_dirs, self._entry_names
+            sizes, status = self._sizes, self._status
+            for folder, name, size in entries:
+                dir_id = dir_ids.get(folder)
+                if dir_id is None:
+                    dir_id = self._dir_id(folder)
+                key = (dir_id, name)
+                if key in ids:
+                    continue
+                ids[key] = len(names)
+                entry_dirs.append(dir_id)
+                names.append(name)
+                sizes.append(size)
+                status.append(STATUS_PENDING)
+                alive_append(1)
+                added += 1
+                if size > 0:
+                    added_size += size
+            self._count += added
+            self._total_size += added_size
+        return added
+
+    def remove_ids(self, file_ids: Iterable[int]) -> int:
+        """
+        Remove files by id, leaving tombstones in place.
+
+        Returns:
+            Number of files removed
+        """
+        removed = 0
+        with self._lock:
+            for file_id in file_ids:
+                if self._status[file_id] == STATUS_REMOVED:
+                    continue
+                self._status[file_id] = STATUS_REMOVED
+                del self._ids[(self._entry_dirs[file_id], self._entry_names[file_id])]
+                self._digests.pop(file_id, None)
+                self._alive.add(file_id, -1)
+                self._count -= 1
+                self._total_size -= max(0, self._sizes[file_id])
+                removed += 1
+        return removed
+
+    def compact(self) -> None:
+        """Drop tombstones; file ids and rows are renumbered."""
+        with self._lock:
+            if not self.removed_count:
+                return
+            dirs, entry_dirs, names = self._dirs, self._entry_dirs, self._entry_names
+            sizes, status, digests = self._sizes, self._status, self._digests
+            kept = [file_id for file_id, code in enumerate(status) if code != STATUS_REMOVED]
+            self.clear()
+            self.add_entries((dirs[entry_dirs[old_id]], names[old_id], sizes[old_id]) for old_id in kept)
+            for new_id, old_id in enumerate(kept):
+                self._status[new_id] = status[old_id]
+                if old_id in digests:
+                    self._digests[new_id] = digests[old_id]
+
+    def path(self, file_id: int) -> str:
+        """Return the full path of a file."""
+        with self._lock:
+            return os.path.join(self._dirs[self._entry_dirs[file_id]], self._entry_names[file_id])
+
+    def id_at_row(self, row: int) -> int:
+        """Return the id of the file shown at row (0 <= row < len)."""
+        with self._lock:
+            if not 0 <= row < self._count:
+                raise IndexError(row)
+            return self._alive.find(row)
+
+    def row_of(self, file_id: int) -> int:
+        """Return the row of a present file."""
+        with self._lock:
+            return self._alive.prefix(file_id)
+
+    def ids_in_rows(self, start: int, stop: int) -> list[int]:
+        """Return the ids of the files in rows [start, stop)."""
+        with self._lock:
+            stop = min(stop, self._count)
+            if start >= stop:
+                return []
+            file_id = self._alive.find(start)
+            status = self._status
+            ids = []
+            while len(ids) < stop - start:
+                if status[file_id] != STATUS_REMOVED:
+                    ids.append(file_id)
+                file_id += 1
+            return ids
+
+    def next_path(self, file_id: int) -> Optional[tuple[int, str]]:
+        """
+        Return (id, path) of the first present file with an id >= file_id,
+        or None. Lets a consumer follow the set while files are still added.
+        """
+        with self._lock:
+            row = self._alive.prefix(min(file_id, len(self._entry_names)))
+            if row >= self._count:
+                return None
+            next_id = self._alive.find(row)
+            return next_id, self.path(next_id)
+
+    def entries(self) -> list[tuple[str, int]]:
+        """Return (path, size) of every present file in row order."""
+        with self._lock:
+            status, sizes = self._status, self._sizes
+            return [(self.path(file_id), sizes[file_id])
+                    for file_id in range(len(self._entry_names))
+                    if status[file_id] != STATUS_REMOVED]
+
+    def row_values(self, file_id: int) -> tuple[str, str, int, int, str]:
+        """Return (name, folder, size, status, digest) of a file."""
+        with self._lock:
+            return (
+                self._entry_names[file_id],
+                self._dirs[self._entry_dirs[file_id]],
+                self._sizes[file_id],
+                self._status[file_id],
+                self._digests.get(file_id, "")
+            )
+
+    def set_result(self, path: str, ok: bool, text: str) -> None:
+        """
+        Record the outcome of hashing a file (ignored if it was removed).
+
+        Args:
+            path: File path
+            ok: True for a digest, False for an error
+            text: Digest summary or error message
+        """
+        with self._lock:
+            file_id = self._find(path)
+            if file_id is None:
+                return
+            self._status[file_id] = STATUS_DONE if ok else STATUS_ERROR
+            self._digests[file_id] = text
+
+    def reset_results(self) -> None:
+        """Mark every present file as pending again."""
+        with self._lock:
+            self._status = bytearray(self._status.translate(_RESET_STATUS))
+            self._digests.clear()
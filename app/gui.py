@@ -9,13 +9,29 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
 import multiprocessing
+import concurrent.futures
 import os
+import shutil
+import sqlite3
 from typing import Optional
 
 # Import from new modules
 from config import HashAlgorithm
-from components import StatusIndicator, ToolTip
+from components import StatusIndicator, ToolTip, FolderScanDialog, VirtualFileList
 from hasher import HashCalculator
+from cache import DigestCache
+from checkpoint import CheckpointStore
+from walker import DirectoryWalker, SYMLINK_POLICIES, SYMLINKS_FILES
+from fileset import FileSet
+from manifest import parse_manifest, VERIFY_OK
+from progress import ProgressAggregator
+from results import (ResultSink, EXPORT_FORMATS, csv_header, duplicates_csv_header,
+                     format_duplicates, format_record)
+
+# Interval between status bar progress (and result view) updates during a batch
+PROGRESS_FRAME_MS = 100
+# Lines the result box keeps; complete results are in the export file
+RESULT_VIEW_LINES = 10000
 
 
 class SecureHashGUI:
@@ -29,13 +45,45 @@ class SecureHashGUI:
             root: The root tkinter window
         """
         self.root = root
-        self.selected_file_paths: list[str] = []
+        # Files selected in File mode, with per-file size, status and digest
+        self.file_set = FileSet()
+        # Folder walks still adding files, and a condition notified whenever
+        # files are added or a walk ends (hashing may consume files mid-walk)
+        self._walkers: list[DirectoryWalker] = []
+        self._files_changed = threading.Condition()
         self._calculation_thread: Optional[threading.Thread] = None
         self._cancel_flag = False
         self._debounce_timer = None
         
-        # Initialize logic engine
-        self.hasher = HashCalculator()
+        # Batch progress: workers bump the counters, the Tk thread draws a
+        # frame every PROGRESS_FRAME_MS
+        self._progress = ProgressAggregator()
+        self._progress_timer = None
+        self._progress_follows_files = False
+        
+        # Results of the last file or manifest batch, streamed to a file
+        self._result_sink: Optional[ResultSink] = None
+        self.export_format_var = tk.StringVar(value='sum')
+        
+        # Text mode hashes on one background thread; each request gets a
+        # generation number and results of superseded requests are dropped
+        self._text_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._text_generation = 0
+        self._text_future: Optional[concurrent.futures.Future] = None
+        
+        # Initialize logic engine with the persistent digest cache
+        try:
+            self.digest_cache: Optional[DigestCache] = DigestCache()
+        except (OSError, sqlite3.Error):
+            self.digest_cache = None  # Cache location not writable
+        self.hasher = HashCalculator(cache=self.digest_cache)
+        
+        # Checkpoints that let a cancelled hash of a large file resume
+        try:
+            self.checkpoints: Optional[CheckpointStore] = CheckpointStore()
+        except (OSError, sqlite3.Error):
+            self.checkpoints = None
+        self.resume_var = tk.BooleanVar(value=False)
         
         # Calculate thread count: 20% of CPU cores, minimum 1
         self._thread_count = max(1, int(multiprocessing.cpu_count() * 0.2))
@@ -43,9 +91,25 @@ class SecureHashGUI:
         # Auto-calculate toggle variable
         self.auto_calc_var = tk.BooleanVar(value=False)
         
+        # Digest cache options
+        self.use_cache_var = tk.BooleanVar(value=self.digest_cache is not None)
+        self.force_rehash_var = tk.BooleanVar(value=False)
+        
+        # Folder scan settings (see walker.walk_files)
+        self.scan_include_var = tk.StringVar(value="")
+        self.scan_exclude_var = tk.StringVar(value="")
+        self.scan_symlinks_var = tk.StringVar(value=SYMLINKS_FILES)
+        self.scan_max_depth_var = tk.StringVar(value="")
+        
+        # Manifest verification option
+        self.verify_fail_fast_var = tk.BooleanVar(value=False)
+        
         self._setup_window()
         self._create_widgets()
         
+        if HashAlgorithm.load_error:
+            messagebox.showerror("Configuration Error", HashAlgorithm.load_error)
+        
         # Handle window closing
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
         
@@ -87,6 +151,64 @@ class SecureHashGUI:
             self.hash_menu.add_checkbutton(label=algo, variable=var, command=self._on_input_change)
             self.algo_vars[algo] = var
             
+        # Options Menu
+        self.options_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="Options", menu=self.options_menu)
+        
+        cache_state = "normal" if self.digest_cache is not None else "disabled"
+        self.options_menu.add_checkbutton(
+            label="Use Digest Cache",
+            variable=self.use_cache_var,
+            command=self._on_cache_option_change,
+            state=cache_state
+        )
+        self.options_menu.add_checkbutton(
+            label="Force Rehash",
+            variable=self.force_rehash_var,
+            command=self._on_cache_option_change,
+            state=cache_state
+        )
+        self.options_menu.add_separator()
+        self.options_menu.add_command(
+            label="Clear Digest Cache",
+            command=self._clear_cache,
+            state=cache_state
+        )
+        self.options_menu.add_separator()
+        self.options_menu.add_checkbutton(
+            label="Resume Large Files",
+            variable=self.resume_var,
+            command=self._on_resume_option_change,
+            state="normal" if self.checkpoints is not None else "disabled"
+        )
+        self.options_menu.add_separator()
+        self.options_menu.add_command(
+            label="Folder Scan Settings...",
+            command=self._open_scan_settings
+        )
+        self.options_menu.add_separator()
+        self.options_menu.add_command(
+            label="Verify Manifest...",
+            command=self._verify_manifest
+        )
+        self.options_menu.add_checkbutton(
+            label="Stop at First Mismatch",
+            variable=self.verify_fail_fast_var
+        )
+        self.options_menu.add_command(
+            label="Find Duplicates",
+            command=self._find_duplicates
+        )
+        self.options_menu.add_separator()
+        format_menu = tk.Menu(self.options_menu, tearoff=0)
+        for label, value in (("sha*sum", 'sum'), ("CSV", 'csv'), ("JSON Lines", 'jsonl')):
+            format_menu.add_radiobutton(label=label, value=value, variable=self.export_format_var)
+        self.options_menu.add_cascade(label="Results Format", menu=format_menu)
+        self.options_menu.add_command(
+            label="Save Results...",
+            command=self._save_results
+        )
+            
         # Top row: Mode selection (Algorithm dropdown removed)
         top_frame = ttk.Frame(self.root)
         top_frame.pack(fill=tk.X, padx=pad_x, pady=(20, pad_y))
@@ -124,23 +246,14 @@ class SecureHashGUI:
         
         self.file_frame = ttk.Frame(self.input_container)
         
-        # Listbox with scrollbar
-        self.file_list_frame = ttk.Frame(self.file_frame)
-        self.file_list_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        self.file_scrollbar = ttk.Scrollbar(self.file_list_frame)
-        self.file_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.file_listbox = tk.Listbox(
-            self.file_list_frame, 
-            selectmode=tk.EXTENDED,
-            yscrollcommand=self.file_scrollbar.set,
-            height=8,
-            activestyle='dotbox'
+        # Virtualized file list (only the visible rows exist as Tk items)
+        self.file_list = VirtualFileList(
+            self.file_frame,
+            self.file_set,
+            select_callback=self._on_file_select,
+            height=8
         )
-        self.file_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.file_scrollbar.config(command=self.file_listbox.yview)
-        self.file_listbox.bind('<<ListboxSelect>>', self._on_file_select)
+        self.file_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Buttons frame
         self.file_btn_frame = ttk.Frame(self.file_frame)
@@ -246,12 +359,30 @@ class SecureHashGUI:
         """Handle input change event."""
         # Show input changed status
         self.status_indicator.set_input_changed()
+        # Any text hash still running is for an outdated input
+        self._invalidate_text_request()
         # Schedule hash calculation (only for text mode auto-calc)
         if self.mode_var.get() == "Text" and self.auto_calc_var.get():
             if self._debounce_timer:
                 self.root.after_cancel(self._debounce_timer)
             self._debounce_timer = self.root.after(200, self._calculate_hash)
         
+    def _on_cache_option_change(self) -> None:
+        """Apply the digest cache menu options to the hasher."""
+        self.hasher.cache = self.digest_cache if self.use_cache_var.get() else None
+        self.hasher.force_rehash = self.force_rehash_var.get()
+        
+    def _on_resume_option_change(self) -> None:
+        """Checkpoint large files (resuming them after a cancel) or not."""
+        self.hasher.checkpoints = self.checkpoints if self.resume_var.get() else None
+        
+    def _clear_cache(self) -> None:
+        """Forget all cached digests."""
+        if self.digest_cache is not None:
+            self.digest_cache.clear()
+            self.digest_cache.reset_stats()
+            messagebox.showinfo("Digest Cache", "Digest cache cleared.")
+        
     def _on_auto_calc_toggle(self) -> None:
         """Handle auto-calculate checkbox toggle."""
         if self.mode_var.get() == "Text":
@@ -261,6 +392,17 @@ class SecureHashGUI:
             else:
                 self.calculate_button.config(state="normal")
         
+    def _open_scan_settings(self) -> None:
+        """Show the folder scan settings dialog."""
+        FolderScanDialog(
+            self.root,
+            self.scan_include_var,
+            self.scan_exclude_var,
+            self.scan_symlinks_var,
+            self.scan_max_depth_var,
+            SYMLINK_POLICIES
+        )
+        
     def _add_files(self) -> None:
         """Open file dialog and add selected files."""
         file_paths = filedialog.askopenfilenames(
@@ -269,50 +411,86 @@ class SecureHashGUI:
         )
         
         if file_paths:
+            entries = []
             for path in file_paths:
-                if path not in self.selected_file_paths:
-                    self.selected_file_paths.append(path)
-                    self.file_listbox.insert(tk.END, os.path.basename(path))
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    size = -1
+                entries.append((*os.path.split(path), size))
+            self._add_entries(entries)
             
             # Show input changed status
             self.status_indicator.set_input_changed()
             
+    def _add_entries(self, entries: list[tuple[str, str, int]]) -> None:
+        """Add (folder, name, size) entries, skipping files already listed."""
+        with self._files_changed:
+            added = self.file_set.add_entries(entries)
+            self._files_changed.notify_all()
+        if added:
+            self.file_list.schedule_refresh()
+            
     def _add_folder(self) -> None:
-        """Open directory dialog and add all files in the folder."""
+        """Open directory dialog and add the files below the folder in the background."""
         folder_path = filedialog.askdirectory(title="Select folder")
+        if not folder_path:
+            return
         
-        if folder_path:
-            # Scan folder for files (non-recursive)
-            try:
-                for entry in os.scandir(folder_path):
-                    if entry.is_file():
-                        path = entry.path
-                        if path not in self.selected_file_paths:
-                            self.selected_file_paths.append(path)
-                            self.file_listbox.insert(tk.END, entry.name)
-                
-                # Show input changed status
-                self.status_indicator.set_input_changed()
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to read folder: {e}")
+        depth = self.scan_max_depth_var.get()
+        walker = DirectoryWalker(
+            folder_path,
+            lambda batch: self.root.after(0, self._add_walked_files, walker, batch),
+            lambda found, errors: self.root.after(0, self._on_walk_done, walker, errors),
+            include=self._split_patterns(self.scan_include_var.get()),
+            exclude=self._split_patterns(self.scan_exclude_var.get()),
+            symlinks=self.scan_symlinks_var.get(),
+            max_depth=int(depth) if depth else None
+        )
+        with self._files_changed:
+            self._walkers.append(walker)
+        walker.start()
+        self.status_indicator.set_input_changed()
+        
+    @staticmethod
+    def _split_patterns(text: str) -> list[str]:
+        """Split a ';' separated glob list."""
+        return [pattern.strip() for pattern in text.split(';') if pattern.strip()]
+    
+    def _add_walked_files(self, walker: DirectoryWalker, batch: list[tuple[str, str, int]]) -> None:
+        """Add a batch of files found by a folder walk (Tk thread)."""
+        if walker not in self._walkers:
+            return  # List was cleared since
+        self._add_entries(batch)
+        
+    def _on_walk_done(self, walker: DirectoryWalker, errors: list[str]) -> None:
+        """Forget a finished folder walk and report unreadable entries (Tk thread)."""
+        with self._files_changed:
+            if walker in self._walkers:
+                self._walkers.remove(walker)
+            self._files_changed.notify_all()
+        if errors:
+            shown = "\n".join(errors[:5])
+            more = f"\n... and {len(errors) - 5} more" if len(errors) > 5 else ""
+            messagebox.showwarning("Warning", f"Some entries could not be read:\n{shown}{more}")
             
     def _remove_files(self) -> None:
         """Remove selected files from the list."""
-        selection = self.file_listbox.curselection()
-        if not selection:
+        if not self.file_list.selected_ids:
             return
-            
-        # Remove in reverse order to maintain indices
-        for index in reversed(selection):
-            self.file_listbox.delete(index)
-            del self.selected_file_paths[index]
-            
-        self._on_file_select(None)
+        
+        with self._files_changed:
+            self.file_set.remove_ids(self.file_list.selected_ids)
+            # Renumbering is only safe while no hash is walking the set
+            idle = not (self._calculation_thread and self._calculation_thread.is_alive())
+            if idle and self.file_set.removed_count > len(self.file_set):
+                self.file_set.compact()
+        self.file_list.clear_selection()
         self.status_indicator.set_input_changed()
         
-    def _on_file_select(self, event=None) -> None:
+    def _on_file_select(self) -> None:
         """Handle file selection change."""
-        if self.file_listbox.curselection():
+        if self.file_list.selected_ids:
             self.remove_file_btn.config(state="normal")
         else:
             self.remove_file_btn.config(state="disabled")
@@ -328,7 +506,7 @@ class SecureHashGUI:
 
         # For file mode, use threading; for text mode, run synchronously
         if self.mode_var.get() == "File":
-            if not self.selected_file_paths:
+            if not len(self.file_set) and not self._walkers:
                 messagebox.showwarning("Warning", "No files selected!")
                 return
                 
@@ -337,61 +515,69 @@ class SecureHashGUI:
                 return  # Already calculating
             
             self._cancel_flag = False
-            self.status_indicator.set_calculating(0)
             self._set_result("") # Clear previous results
+            export_format = self.export_format_var.get()
+            header = csv_header(selected_algos) if export_format == 'csv' else ""
+            sink = self._result_sink = ResultSink(export_format, header)
             
-            # Define callbacks for the thread
-            def progress_cb(p):
-                # We'll update this to show overall progress or current file progress
-                self.root.after(0, self.status_indicator.set_calculating, p)
-                
-            def check_cancel_cb():
-                return self._cancel_flag
-                
-            def error_cb(msg):
-                self.root.after(0, lambda: messagebox.showerror("Error", msg))
-                
-            def success_cb(res):
-                # This is called per file, we need to append result
-                pass 
+            self.file_set.reset_results()
+            self.file_list.refresh()
+            self._start_progress(len(self.file_set), self.file_set.total_size, follow_files=True)
+            
+            # Wrapper to process all files on the worker pool
+            def iter_file_paths():
+                # Follow the file set by id; walks still running keep adding
+                # files, which are hashed as they arrive
+                next_id = 0
+                while True:
+                    with self._files_changed:
+                        found = self.file_set.next_path(next_id)
+                        while found is None and self._walkers and not self._cancel_flag:
+                            self._files_changed.wait(0.5)
+                            found = self.file_set.next_path(next_id)
+                    if found is None:
+                        return
+                    next_id = found[0] + 1
+                    yield found[1]
             
-            # Wrapper to process all files
             def process_files():
-                total_files = len(self.selected_file_paths)
+                def check_cancel_cb():
+                    return self._cancel_flag
                 
-                for i, file_path in enumerate(self.selected_file_paths):
-                    if self._cancel_flag:
-                        break
-                        
-                    filename = os.path.basename(file_path)
-                    prefix = f"{i+1}/{total_files} "
-                    
-                    # Update status initially
-                    self.root.after(0, lambda p=prefix: self.status_indicator.set_calculating(None, p))
-                    
-                    # Local progress callback with prefix
-                    def file_progress_cb(p):
-                        self.root.after(0, lambda: self.status_indicator.set_calculating(p, prefix))
-                    
-                    # Local success callback to append result
-                    def file_success_cb(results_dict):
-                        result_str = f"{file_path}:\n"
+                def result_cb(file_path, results_dict, error):
+                    result_str = f"{file_path}:\n"
+                    if error is not None:
+                        result_str += f"Error: {error}\n"
+                        summary = error
+                    else:
                         for algo, hash_val in results_dict.items():
                             result_str += f"{algo}: {hash_val}\n"
-                        result_str += "\n"
-                        self.root.after(0, self._append_result, result_str)
-                    
-                    # Calculate hash for this file
-                    self.hasher.calculate_file(
-                        selected_algos, 
-                        file_path, 
-                        file_progress_cb, 
-                        check_cancel_cb, 
-                        error_cb, 
-                        file_success_cb
-                    )
+                        summary = "  ".join(results_dict.values())
+                    result_str += "\n"
+                    # Shown by the next progress frame
+                    self.file_set.set_result(file_path, error is None, summary)
+                    sink.write(result_str, format_record(
+                        export_format, file_path, results_dict, error, selected_algos))
                 
-                self.root.after(0, self.status_indicator.set_complete)
+                cache = self.hasher.cache
+                if cache is not None:
+                    cache.reset_stats()
+                
+                self.hasher.calculate_files(
+                    selected_algos,
+                    iter_file_paths(),
+                    self._progress.set_files_done,
+                    check_cancel_cb,
+                    result_cb,
+                    max_workers=self._thread_count,
+                    bytes_callback=self._progress.add_bytes
+                )
+                
+                detail = ""
+                if cache is not None:
+                    stats = cache.stats()
+                    detail = f"cache: {stats['hits']} hit, {stats['misses']} miss"
+                self.root.after(0, self._on_batch_done, detail)
 
             # Start thread
             self._calculation_thread = threading.Thread(
@@ -400,28 +586,235 @@ class SecureHashGUI:
             )
             self._calculation_thread.start()
         else:
-            # Text mode - run synchronously
+            # Text mode - hash in the background, keep the UI responsive
+            self._invalidate_text_request()
+            generation = self._text_generation
+            text = self.input_text.get('1.0', tk.END).rstrip('\n')
             self.status_indicator.set_calculating()
-            self.root.update_idletasks()
             
-            try:
-                text = self.input_text.get('1.0', tk.END).rstrip('\n')
-                results = self.hasher.calculate_text_sync(selected_algos, text)
-                
-                result_str = ""
-                for algo, hash_val in results.items():
-                    result_str += f"{algo}: {hash_val}\n"
-                
-                self._set_result(result_str)
-            except Exception as ex:
-                messagebox.showerror("Error", str(ex))
-            finally:
-                self.status_indicator.set_complete()
+            def is_stale():
+                return generation != self._text_generation
+            
+            future = self._text_executor.submit(
+                self.hasher.calculate_text_sync, selected_algos, text, is_stale
+            )
+            self._text_future = future
+            future.add_done_callback(
+                lambda f: self.root.after(0, self._on_text_result, generation, f)
+            )
+    
+    def _verify_manifest(self) -> None:
+        """Check the files listed in a checksum manifest."""
+        if self._calculation_thread and self._calculation_thread.is_alive():
+            messagebox.showwarning("Warning", "A calculation is already running!")
+            return
+        
+        manifest_path = filedialog.askopenfilename(
+            title="Select Checksum Manifest",
+            filetypes=[
+                ("Checksum files", "*SUMS *.sha256 *.sha384 *.sha512 *.sha1 *.md5 *.crc32"),
+                ("All files", "*.*")
+            ]
+        )
+        if not manifest_path:
+            return
+        try:
+            entries = parse_manifest(manifest_path)
+        except (OSError, ValueError) as ex:
+            messagebox.showerror("Error", f"Cannot read {os.path.basename(manifest_path)}: {ex}")
+            return
+        
+        self._cancel_flag = False
+        self._set_result("")
+        sink = self._result_sink = ResultSink()
+        self._start_progress(len(entries), 0)
+        fail_fast = self.verify_fail_fast_var.get()
+        
+        def process_manifest():
+            checked = 0
+            
+            def result_cb(entry, status, detail):
+                nonlocal checked
+                checked += 1
+                line = f"{entry.name}: {status}\n"
+                if status != VERIFY_OK:
+                    line += f"    {detail}\n"
+                self._progress.set_files_done(checked)
+                sink.write(line, line)
+            
+            summary = self.hasher.verify_manifest(
+                entries,
+                lambda: self._cancel_flag,
+                result_cb,
+                max_workers=self._thread_count,
+                fail_fast=fail_fast
+            )
+            rate = summary['throughput'] / (1024 * 1024)
+            text = (f"\n{summary['ok']} OK, {summary['failed']} FAILED, "
+                    f"{summary['missing']} MISSING, {summary['errors']} unreadable\n"
+                    f"{summary['bytes']} bytes in {summary['seconds']:.2f}s ({rate:.1f} MB/s)\n")
+            detail = "all OK" if summary['ok'] == len(entries) else "mismatches found"
+            sink.write(text, text)
+            self.root.after(0, self._on_batch_done, detail)
+        
+        self._calculation_thread = threading.Thread(target=process_manifest, daemon=True)
+        self._calculation_thread.start()
+    
+    def _find_duplicates(self) -> None:
+        """List the groups of identical files among the selected files."""
+        if self.mode_var.get() != "File" or not len(self.file_set):
+            messagebox.showwarning("Warning", "No files selected!")
+            return
+        if self._walkers:
+            messagebox.showwarning("Warning", "Wait for the folder scan to finish!")
+            return
+        if self._calculation_thread and self._calculation_thread.is_alive():
+            messagebox.showwarning("Warning", "A calculation is already running!")
+            return
+        
+        entries = self.file_set.entries()
+        self._cancel_flag = False
+        self._set_result("")
+        export_format = self.export_format_var.get()
+        header = duplicates_csv_header() if export_format == 'csv' else ""
+        sink = self._result_sink = ResultSink(export_format, header)
+        self._start_progress(len(entries), 0)
+        
+        def progress_cb(stage, done, total):
+            if done == 0:
+                self._progress.set_total(total, 0)
+            self._progress.set_files_done(done)
+        
+        def process_duplicates():
+            summary = self.hasher.find_duplicates(
+                entries,
+                lambda: self._cancel_flag,
+                max_workers=self._thread_count,
+                progress_callback=progress_cb,
+                bytes_callback=self._progress.add_bytes
+            )
+            for index, group in enumerate(summary['groups'], 1):
+                sink.write(format_duplicates('sum', index, group.size, group.paths),
+                           format_duplicates(export_format, index, group.size, group.paths))
+            
+            total = summary['total_bytes']
+            share = summary['bytes_read'] * 100 / total if total else 0.0
+            text = (f"{len(summary['groups'])} duplicate groups, {summary['duplicates']} "
+                    f"redundant files, {summary['wasted']} bytes wasted\n"
+                    f"read {summary['bytes_read']} of {total} bytes ({share:.1f}%) "
+                    f"in {summary['seconds']:.2f}s\n")
+            if summary['errors']:
+                text += f"{summary['errors']} files could not be read\n"
+            sink.write(text, "")
+            detail = f"{len(summary['groups'])} duplicate groups"
+            self.root.after(0, self._on_batch_done, detail)
+        
+        self._calculation_thread = threading.Thread(target=process_duplicates, daemon=True)
+        self._calculation_thread.start()
+    
+    def _start_progress(self, files: int, size: int, follow_files: bool = False) -> None:
+        """
+        Start drawing batch progress every PROGRESS_FRAME_MS.
+        
+        Args:
+            files: Number of files in the batch
+            size: Total bytes, or 0 to measure progress in files
+            follow_files: Keep the totals in step with the file set while
+                folder walks add files
+        """
+        self._stop_progress()
+        self._progress.reset()
+        self._progress.set_total(files, size)
+        self._progress_follows_files = follow_files
+        self._show_progress()
+    
+    def _show_progress(self) -> None:
+        """Draw one coalesced progress frame and schedule the next (Tk thread)."""
+        more_files = False
+        if self._progress_follows_files:
+            self._progress.set_total(len(self.file_set), self.file_set.total_size)
+            more_files = bool(self._walkers)
+        self.status_indicator.set_progress(self._progress.snapshot(), more_files)
+        self._flush_results()
+        self._progress_timer = self.root.after(PROGRESS_FRAME_MS, self._show_progress)
+    
+    def _stop_progress(self) -> None:
+        """Stop drawing batch progress."""
+        if self._progress_timer is not None:
+            self.root.after_cancel(self._progress_timer)
+            self._progress_timer = None
+    
+    def _on_batch_done(self, detail: str) -> None:
+        """Show a finished file or manifest batch (Tk thread)."""
+        self._stop_progress()
+        self._flush_results()
+        self.status_indicator.set_complete(detail)
+    
+    def _flush_results(self) -> None:
+        """Show the results recorded since the last frame (Tk thread)."""
+        if self._result_sink is None:
+            return
+        text = self._result_sink.drain()
+        if text:
+            self._append_result(text)
+            self.file_list.schedule_refresh()
+    
+    def _close_result_sink(self) -> None:
+        """Drop the results of the last batch and delete their export file."""
+        if self._result_sink is not None:
+            self._result_sink.close()
+            self._result_sink = None
+    
+    def _save_results(self) -> None:
+        """Save the complete results of the last file or manifest batch."""
+        sink = self._result_sink
+        if sink is None or not len(sink):
+            messagebox.showwarning("Warning", "No file results to save!")
+            return
+        target = filedialog.asksaveasfilename(
+            title="Save Results",
+            defaultextension=EXPORT_FORMATS[sink.export_format],
+            filetypes=[("Results", f"*{EXPORT_FORMATS[sink.export_format]}"), ("All files", "*.*")]
+        )
+        if not target:
+            return
+        try:
+            sink.flush()
+            shutil.copyfile(sink.path, target)
+        except OSError as ex:
+            messagebox.showerror("Error", f"Cannot save results: {ex}")
+    
+    def _invalidate_text_request(self) -> None:
+        """Mark the in-flight text hash (if any) as stale and cancel it."""
+        self._text_generation += 1
+        if self._text_future is not None and not self._text_future.done():
+            self.hasher.cancel_text()
+    
+    def _on_text_result(self, generation: int, future: concurrent.futures.Future) -> None:
+        """Show a finished text hash unless a newer request superseded it."""
+        if generation != self._text_generation:
+            return
+        self._text_future = None
+        try:
+            results = future.result()
+        except Exception as ex:
+            messagebox.showerror("Error", str(ex))
+        else:
+            result_str = ""
+            for algo, hash_val in results.items():
+                result_str += f"{algo}: {hash_val}\n"
+            self._set_result(result_str)
+        self.status_indicator.set_complete()
     
     def _on_closing(self) -> None:
         """Handle window closing with proper cleanup."""
         # Set cancel flag
         self._cancel_flag = True
+        self._stop_progress()
+        for walker in list(self._walkers):
+            walker.cancel()
+        self._invalidate_text_request()
+        self._text_executor.shutdown(wait=False, cancel_futures=True)
         
         # Terminate any subprocesses in the hasher
         self.hasher.terminate_subprocess()
@@ -430,26 +823,40 @@ class SecureHashGUI:
         if self._calculation_thread and self._calculation_thread.is_alive():
             self._calculation_thread.join(timeout=2.0)
         
+        if self.digest_cache is not None:
+            self.digest_cache.close()
+        if self.checkpoints is not None:
+            self.checkpoints.close()
+        self._close_result_sink()
+        
         # Destroy window
         self.root.destroy()
             
     def _set_result(self, text: str) -> None:
-        """Set the result text box value."""
+        """Set the result text box value, dropping the last batch's results."""
+        self._close_result_sink()
         self.result_text.config(state="normal")
         self.result_text.delete('1.0', tk.END)
         self.result_text.insert('1.0', text)
         self.result_text.config(state="disabled")
         
     def _append_result(self, text: str) -> None:
-        """Append text to the result text box."""
+        """Append text to the result text box, keeping its last RESULT_VIEW_LINES lines."""
         self.result_text.config(state="normal")
         self.result_text.insert(tk.END, text)
+        lines = int(self.result_text.index('end-1c').split('.')[0])
+        if lines > RESULT_VIEW_LINES:
+            self.result_text.delete('1.0', f"{lines - RESULT_VIEW_LINES + 1}.0")
         self.result_text.see(tk.END)
         self.result_text.config(state="disabled")
         
     def _copy_result(self) -> None:
         """Copy the hash result to clipboard."""
-        result = self.result_text.get('1.0', 'end-1c')
+        if self._result_sink is not None:
+            # The box only shows the tail of a batch; copy everything
+            result = self._result_sink.read_export()
+        else:
+            result = self.result_text.get('1.0', 'end-1c')
         if result:
             self.root.clipboard_clear()
             self.root.clipboard_append(result)
@@ -464,9 +871,13 @@ class SecureHashGUI:
         if mode == "Text":
             self.input_text.delete('1.0', tk.END)
         else:  # File mode
-            self.selected_file_paths = []
-            self.file_listbox.delete(0, tk.END)
-            self.remove_file_btn.config(state="disabled")
+            with self._files_changed:
+                for walker in self._walkers:
+                    walker.cancel()
+                self._walkers.clear()
+                self.file_set.clear()
+                self._files_changed.notify_all()
+            self.file_list.clear_selection()
         
         self._set_result('')
         self.status_indicator.set_input_changed()
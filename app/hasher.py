@@ -5,25 +5,461 @@ Handles both synchronous (text) and asynchronous (file) hash calculations.
 
 import os
 import sys
+import stat
+import time
 import subprocess
 import hashlib
 import threading
 import queue
 import re
-from typing import Optional, Callable, Dict, Any
-import tkinter as tk  # For messagebox if needed, though ideally we'd raise exceptions
+import zlib
+import bisect
+import functools
+import concurrent.futures
+from collections import deque
+from typing import Optional, Callable, Dict, Any, Iterable, BinaryIO, TYPE_CHECKING
 
 from config import HashAlgorithm
+from reader import ChunkReader, BufferRing, READ_MODE_AUTO
+from workers import HashWorkerPool
+from native import NativeHasher, load_library
+from manifest import ManifestEntry, VERIFY_OK, VERIFY_FAILED, VERIFY_MISSING, VERIFY_ERROR
+from crc_combine import CRC_POLYNOMIALS, crc32_combine
+from dedupe import FULL_HASH_ALGORITHM, DuplicateGroup, group_by_size, known_sizes, partial_key, partial_read_size
+
+if TYPE_CHECKING:
+    # Only needed for annotations; keeps sqlite3 out of CLI start-up
+    from cache import DigestCache
+    from checkpoint import CheckpointStore
+
+# Upper bound on read buffers held by concurrent file workers at any one time
+DEFAULT_MAX_BYTES_IN_FLIGHT = 256 * 1024 * 1024
+# Read size used until a throughput has been measured
+CHUNK_SIZE = 16 * 1024 * 1024
+# Bounds of the adaptive read size
+MIN_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+# Adaptive reads aim to take about this long, so larger and faster disks get
+# larger reads while cancellation stays responsive
+CHUNK_TARGET_SECONDS = 0.05
+# Files up to this size are read in one go, without progress reporting
+SMALL_FILE_MAX_SIZE = 1024 * 1024
+# Seconds a persistent worker may spend on one text before it is restarted
+TEXT_HASH_TIMEOUT = 30
+# Text hashing snapshots resumable digest state every this many bytes
+# (and checks for cancellation in between)
+TEXT_CHECKPOINT_INTERVAL = 1024 * 1024
+# Files at least this large fan each chunk out to one thread per algorithm
+FAN_OUT_MIN_SIZE = 64 * 1024 * 1024
+# Chunks an algorithm thread may fall behind the reader before it blocks
+FAN_OUT_QUEUE_DEPTH = 2
+# Seconds between cancellation checks while waiting for an executable to exit
+PROCESS_POLL_INTERVAL = 0.05
+# CRC-only files are split into segments of at least this size, checksummed
+# on separate threads and combined
+SEGMENT_MIN_SIZE = 64 * 1024 * 1024
+# Read size of each segment thread
+SEGMENT_READ_SIZE = 4 * 1024 * 1024
+# Files up to this size are hashed in batches when an algorithm has a
+# multi-buffer kernel (one file per SIMD lane)
+BATCH_FILE_MAX_SIZE = 256 * 1024
+# Upper bounds of one batch
+BATCH_MAX_FILES = 64
+BATCH_MAX_BYTES = 4 * 1024 * 1024
+# Buffers timed to decide whether a batch kernel beats the per-file hasher
+BATCH_PROBE_SIZE = 16 * 1024
+BATCH_PROBE_COUNT = 64
+# ... and by how much it has to win, as batches add a copy and a thread hop
+BATCH_MIN_SPEEDUP = 1.25
+
+# Files at least this large save resumable checkpoints when a store is set
+CHECKPOINT_MIN_SIZE = 1024 * 1024 * 1024
+# Seconds between checkpoints of a file being hashed
+CHECKPOINT_INTERVAL = 10
+
+# Progress line an executable writes to stderr when given the input size
+PROGRESS_PATTERN = re.compile(r'PROGRESS:(\d+)')
+
+
+
+class _ChunkSizer:
+    """
+    Picks read sizes from the file size and the throughput measured on
+    earlier files (an exponential moving average, shared by all workers).
+    """
+    
+    def __init__(self):
+        self._throughput: Optional[float] = None  # Bytes per second
+        self._lock = threading.Lock()
+    
+    def record(self, byte_count: int, seconds: float) -> None:
+        """Feed the time it took to hash byte_count bytes of one file."""
+        if byte_count < MIN_CHUNK_SIZE or seconds <= 0:
+            return  # Small files measure per-file overhead, not throughput
+        rate = byte_count / seconds
+        with self._lock:
+            if self._throughput is None:
+                self._throughput = rate
+            else:
+                self._throughput = 0.7 * self._throughput + 0.3 * rate
+    
+    def buffer_size(self) -> int:
+        """Size of the read buffers; a power of two so it changes rarely."""
+        if self._throughput is None:
+            return CHUNK_SIZE
+        size = int(self._throughput * CHUNK_TARGET_SECONDS)
+        size = max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, size))
+        return 1 << (size.bit_length() - 1)
+    
+    def chunk_size(self, file_size: int) -> int:
+        """Read size for a file: smaller files are still read in several chunks."""
+        return min(self.buffer_size(), max(MIN_CHUNK_SIZE, file_size // 8))
+
+
+class _ByteBudget:
+    """Counting budget that limits how many buffer bytes are in flight."""
+    
+    def __init__(self, limit: int):
+        self._limit = max(1, limit)
+        self._used = 0
+        self._lock = threading.Lock()
+    
+    def try_acquire(self, amount: int) -> bool:
+        """Reserve amount bytes if they fit (always succeeds when idle)."""
+        with self._lock:
+            if self._used and self._used + amount > self._limit:
+                return False
+            self._used += amount
+            return True
+    
+    def release(self, amount: int) -> None:
+        """Return previously reserved bytes to the budget."""
+        with self._lock:
+            self._used -= amount
+
+
+class _Crc32Hasher:
+    """hashlib-style wrapper around zlib.crc32."""
+    
+    def __init__(self):
+        self._crc = 0
+    
+    def update(self, data) -> None:
+        self._crc = zlib.crc32(data, self._crc)
+    
+    def copy(self) -> '_Crc32Hasher':
+        clone = _Crc32Hasher()
+        clone._crc = self._crc
+        return clone
+    
+    def state(self) -> bytes:
+        return self._crc.to_bytes(4, 'big')
+    
+    @classmethod
+    def restore(cls, state: bytes) -> '_Crc32Hasher':
+        if len(state) != 4:
+            raise ValueError("Not a CRC-32 state")
+        hasher = cls()
+        hasher._crc = int.from_bytes(state, 'big')
+        return hasher
+    
+    def hexdigest(self) -> str:
+        return format(self._crc & 0xFFFFFFFF, '08x')
+
+
+class _ExecutableHasher:
+    """
+    hashlib-style adapter that streams data into a hash executable, so
+    algorithms without an in-process hasher share the single read of a file.
+    """
+    
+    def __init__(self, algorithm: str, proc: subprocess.Popen):
+        self.algorithm = algorithm
+        self.proc = proc
+        self._digest: Optional[str] = None
+    
+    def update(self, data) -> None:
+        view = memoryview(data)
+        while view:
+            written = self.proc.stdin.write(view)
+            view = view[written:]
+    
+    def hexdigest(self) -> str:
+        """Close the input and return the executable's digest (only once)."""
+        if self._digest is None:
+            self.proc.stdin.close()
+            stdout = self.proc.stdout.read()
+            if self.proc.wait() != 0:
+                raise RuntimeError(f"{self.algorithm}: Hash calculation failed")
+            self._digest = stdout.decode('utf-8').strip()
+        return self._digest
+
+
+class _FileModeProcess:
+    """
+    An executable hashing a file by path (--file mode). It reads the file
+    itself, so no data passes through Python or a pipe; progress and errors
+    come from its stderr.
+    """
+    
+    def __init__(self, algorithm: str, proc: subprocess.Popen):
+        self.algorithm = algorithm
+        self.proc = proc
+        self.progress = 0
+        self._error = ""
+        self._stderr_thread = threading.Thread(target=self._read_stderr, daemon=True)
+        self._stderr_thread.start()
+    
+    def _read_stderr(self) -> None:
+        for raw in self.proc.stderr:
+            line = raw.decode('utf-8', errors='ignore').strip()
+            match = PROGRESS_PATTERN.match(line)
+            if match:
+                self.progress = int(match.group(1))
+            elif line.startswith('ERROR: '):
+                self._error = line[len('ERROR: '):]
+    
+    def cannot_open(self) -> bool:
+        """
+        Wait for the executable and return True if it failed to open the
+        file, e.g. a build that cannot spell the name; the caller can stream
+        the data to it instead.
+        """
+        self.proc.wait()
+        self._stderr_thread.join()
+        return self.proc.returncode == 2 and self._error.startswith('cannot open ')
+    
+    def hexdigest(self) -> str:
+        """Wait for the executable and return its digest."""
+        stdout = self.proc.stdout.read()
+        returncode = self.proc.wait()
+        self._stderr_thread.join()
+        if returncode != 0:
+            raise RuntimeError(f"{self.algorithm}: {self._error or 'Hash calculation failed'}")
+        return stdout.decode('utf-8').strip()
+
+
+def _common_prefix_length(a: bytes, b: bytes) -> int:
+    """Length of the longest common prefix of two byte strings."""
+    view = memoryview(a)
+    limit = min(len(a), len(b))
+    # bytes.startswith compares in place, so every probe is a plain memcmp
+    if b.startswith(view[:limit]):
+        return limit
+    # Bisect the range known to contain the first mismatch
+    lo, hi = 0, limit
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if b.startswith(view[lo:mid], lo):
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+class _TextCheckpoints:
+    """
+    Resumable digest states for the most recently hashed text.
+    
+    Each algorithm keeps a copy() of its hasher every TEXT_CHECKPOINT_INTERVAL
+    bytes plus one at the end of the text. When the next text shares a
+    prefix with the previous one, hashing resumes from the last snapshot
+    inside that prefix, so appending costs only the new bytes and an edit
+    in the middle restarts from the nearest snapshot before it.
+    """
+    
+    def __init__(self):
+        self._data = b''
+        self._states: dict[str, list[tuple[int, Any]]] = {}
+    
+    def rebase(self, data: bytes) -> None:
+        """Switch to a new text, dropping snapshots past the shared prefix."""
+        common = _common_prefix_length(self._data, data)
+        for states in self._states.values():
+            del states[bisect.bisect_right(states, common, key=lambda state: state[0]):]
+        self._data = data
+    
+    def resume(self, key: str, new_hasher: Callable[[], Any]) -> tuple[int, Any]:
+        """Return (offset, hasher) to continue hashing the current text from."""
+        states = self._states.setdefault(key, [])
+        if states:
+            offset, state = states[-1]
+            return offset, state.copy()
+        return 0, new_hasher()
+    
+    def record(self, key: str, offset: int, hasher) -> None:
+        """Snapshot hasher after the first offset bytes of the current text."""
+        states = self._states[key]
+        # Only the newest snapshot may sit between interval boundaries
+        if states and states[-1][0] % TEXT_CHECKPOINT_INTERVAL:
+            states.pop()
+        states.append((offset, hasher.copy()))
+    
+    def hash(self, key: str, new_hasher: Callable[[], Any],
+             is_cancelled: Callable[[], bool]) -> Optional[str]:
+        """
+        Hash the current text, resuming from and refreshing the snapshots.
+        
+        Returns:
+            Hex digest, or None if cancelled midway
+        """
+        offset, hasher = self.resume(key, new_hasher)
+        view = memoryview(self._data)
+        while offset < len(view):
+            if is_cancelled():
+                return None
+            end = min(len(view), (offset // TEXT_CHECKPOINT_INTERVAL + 1) * TEXT_CHECKPOINT_INTERVAL)
+            hasher.update(view[offset:end])
+            offset = end
+            self.record(key, offset, hasher)
+        return hasher.hexdigest()
+
+
+class _AlgorithmFanOut:
+    """
+    Shares each chunk read from a file with one worker thread per hasher.
+    
+    Chunks are read-only views, so every worker reads the same buffer. Each
+    worker has a bounded queue; submit() blocks while the slowest worker is
+    queue_depth chunks behind, which keeps memory bounded. Once every worker
+    is done with a chunk it is passed to release_callback.
+    """
+    
+    def __init__(self, hashers: dict, queue_depth: int,
+                 release_callback: Callable[[memoryview], None]):
+        self._queues = {algo: queue.Queue(maxsize=queue_depth) for algo in hashers}
+        self._consumed = {algo: 0 for algo in hashers}
+        self._release_callback = release_callback
+        self._refcounts: dict[int, list] = {}
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._threads = [
+            threading.Thread(
+                target=self._run,
+                args=(algo, hasher, self._queues[algo]),
+                name=f"hash-{algo}",
+                daemon=True
+            )
+            for algo, hasher in hashers.items()
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def _run(self, algo: str, hasher, work: queue.Queue) -> None:
+        while True:
+            chunk = work.get()
+            if chunk is None:
+                break
+            if self._error is None:
+                try:
+                    hasher.update(chunk)
+                except BaseException as ex:
+                    self._error = ex
+            with self._lock:
+                self._consumed[algo] += len(chunk)
+            self._finish(chunk)
+    
+    def _finish(self, chunk: memoryview) -> None:
+        with self._lock:
+            entry = self._refcounts[id(chunk)]
+            entry[1] -= 1
+            if entry[1]:
+                return
+            del self._refcounts[id(chunk)]
+        self._release_callback(chunk)
+    
+    def submit(self, chunk: memoryview) -> None:
+        """Queue a chunk for every worker, blocking while one lags behind."""
+        if self._error is not None:
+            raise self._error
+        with self._lock:
+            self._refcounts[id(chunk)] = [chunk, len(self._queues)]
+        for work in self._queues.values():
+            work.put(chunk)
+    
+    def consumed_bytes(self) -> int:
+        """Bytes that every worker has finished hashing."""
+        with self._lock:
+            return min(self._consumed.values())
+    
+    def close(self) -> None:
+        """Wait for all queued chunks to be hashed and stop the workers."""
+        for work in self._queues.values():
+            work.put(None)
+        for thread in self._threads:
+            thread.join()
+        if self._error is not None:
+            raise self._error
+    
+    def abort(self) -> None:
+        """Drop queued chunks and stop the workers."""
+        for work in self._queues.values():
+            try:
+                while True:
+                    chunk = work.get_nowait()
+                    if chunk is not None:
+                        self._finish(chunk)
+            except queue.Empty:
+                pass
+            work.put(None)
+        for thread in self._threads:
+            thread.join()
+
 
 class HashCalculator:
     """Handles hash calculations."""
     
     _subprocess_warmed_up = False  # Class variable to track warmup
     
-    def __init__(self):
-        self._current_process: Optional[subprocess.Popen] = None
+    def __init__(self, parallel_algorithms: Optional[bool] = None,
+                 cache: Optional['DigestCache'] = None,
+                 warmup: bool = True,
+                 checkpoints: Optional['CheckpointStore'] = None):
+        """
+        Args:
+            parallel_algorithms: Hash large files with one thread per selected
+                algorithm instead of updating every digest on the reader thread.
+                Defaults to enabled on multi-core machines.
+            cache: Persistent digest cache consulted by calculate_file
+            warmup: Spawn a throwaway process up front so the first real
+                subprocess starts quickly (not worth it for short CLI runs)
+            checkpoints: Store for resumable hashes of large files, used by
+                calculate_file (None: always hash from the start)
+        """
+        self.cache = cache
+        self.checkpoints = checkpoints
+        # Ignore cached digests (fresh results are still stored)
+        self.force_rehash = False
+        if parallel_algorithms is None:
+            parallel_algorithms = (os.cpu_count() or 1) > 1
+        self.parallel_algorithms = parallel_algorithms
+        # File read strategy (see reader.py) and the one most recently used
+        self.read_mode = READ_MODE_AUTO
+        self.last_read_mode: Optional[str] = None
+        # Fixed read size in bytes, or None to adapt it to file size and throughput
+        self.chunk_size: Optional[int] = None
+        self._chunk_sizer = _ChunkSizer()
+        # Threads that checksum one large CRC-only file in segments
+        # (None: one per CPU, 1: never split files)
+        self.segment_workers: Optional[int] = None
+        # Let executables read files by path (--file) instead of piping data to them
+        self.direct_read = True
+        self._file_mode_support: dict[str, bool] = {}
+        # Hash small files in batches where a multi-buffer kernel is faster
+        self.batch_small_files = True
+        self._batch_kernels: dict[str, Optional[str]] = {}
+        # In-process hasher constructor per algorithm (None: executable only)
+        self._hasher_factories: dict[str, Optional[Callable[[], Any]]] = {}
+        self._thread_buffers = threading.local()
+        # Long-lived executables in server mode, reused for text hashing
+        self._workers = HashWorkerPool()
+        # Digest snapshots of the last text, reused by calculate_text_sync
+        self._text_checkpoints = _TextCheckpoints()
+        self._text_lock = threading.Lock()
+        self._active_processes: set[subprocess.Popen] = set()
+        self._process_lock = threading.Lock()
         # Warm up subprocess system on first instantiation
-        if not HashCalculator._subprocess_warmed_up:
+        if warmup and not HashCalculator._subprocess_warmed_up:
             self._warmup_subprocess()
             HashCalculator._subprocess_warmed_up = True
     
@@ -36,71 +472,303 @@ class HashCalculator:
         except:
             pass  # Ignore any errors during warmup
     
-    def calculate_text_sync(self, algorithms: list[str], text: str) -> dict[str, str]:
+    @staticmethod
+    def _get_executable_path(executable_name: str) -> str:
+        """Resolve the path of a hash executable in bin/."""
+        # Get base path (works for both dev and PyInstaller)
+        if getattr(sys, 'frozen', False):
+            base_path = sys._MEIPASS
+        else:
+            base_path = os.path.dirname(os.path.abspath(__file__))
+            base_path = os.path.join(base_path, '..')
+        
+        return os.path.join(base_path, 'bin', executable_name)
+    
+    @staticmethod
+    def _new_native_hasher(algo_config: dict) -> Optional[NativeHasher]:
+        """Create an in-process hasher for a native_lib algorithm if the library is built."""
+        if algo_config.get('type') != 'native_lib':
+            return None
+        library = load_library()
+        native_name = algo_config.get('native_name')
+        if library is None or not native_name or library.algorithm_id(native_name) < 0:
+            return None
+        return library.new(native_name)
+    
+    def hasher_factory(self, algo: str) -> Optional[Callable[[], Any]]:
+        """
+        Return a constructor of an in-process hasher for algo, or None.
+        
+        Follows algorithms.json: its hashlib_name if this Python's hashlib
+        has it, then the native library (whose CRC kernels outrun zlib),
+        then zlib for CRC-32. Algorithms with none of these can only be
+        hashed by their executable.
+        """
+        if algo in self._hasher_factories:
+            return self._hasher_factories[algo]
+        factory = None
+        algo_config = HashAlgorithm.get_algorithm_config(algo)
+        if algo_config:
+            hashlib_name = algo_config.get('hashlib_name')
+            if hashlib_name:
+                # Checksums are not a security use; keeps MD5 usable under FIPS
+                factory = functools.partial(hashlib.new, hashlib_name, usedforsecurity=False)
+                try:
+                    factory()
+                except ValueError:
+                    factory = None  # Not in this OpenSSL build
+            if factory is None and self._new_native_hasher(algo_config) is not None:
+                factory = functools.partial(self._new_native_hasher, algo_config)
+            if factory is None and algo == 'CRC-32':
+                factory = _Crc32Hasher
+        self._hasher_factories[algo] = factory
+        return factory
+    
+    def _batch_kernel(self, algo: str) -> Optional[str]:
+        """
+        Return the library name of algo if small files should be hashed in
+        batches by the native library, else None.
+        
+        Decided once per algorithm by timing the batch call against the
+        per-file hasher, since hashlib may already use CPU SHA extensions
+        that beat the multi-buffer kernel.
+        """
+        if algo in self._batch_kernels:
+            return self._batch_kernels[algo]
+        kernel = None
+        library = load_library()
+        native_name = (HashAlgorithm.get_algorithm_config(algo) or {}).get('native_name')
+        factory = self.hasher_factory(algo)
+        if (library is not None and native_name and factory is not None
+                and library.batch_lanes(native_name) > 1):
+            buffers = [os.urandom(BATCH_PROBE_SIZE) for _ in range(BATCH_PROBE_COUNT)]
+            
+            def per_file() -> None:
+                for data in buffers:
+                    hasher = factory()
+                    hasher.update(data)
+                    hasher.hexdigest()
+            
+            def best_time(run: Callable[[], Any]) -> float:
+                times = []
+                for _ in range(3):
+                    start = time.perf_counter()
+                    run()
+                    times.append(time.perf_counter() - start)
+                return min(times)
+            
+            batch_time = best_time(lambda: library.hash_many(native_name, buffers))
+            if batch_time * BATCH_MIN_SPEEDUP < best_time(per_file):
+                kernel = native_name
+        self._batch_kernels[algo] = kernel
+        return kernel
+    
+    def _batch_plan(self, algorithms: list[str]) -> dict[str, str]:
+        """
+        Return {algorithm: library name} for the algorithms whose small files
+        are hashed in batches; empty if files are hashed one by one.
+        """
+        if not self.batch_small_files:
+            return {}
+        if any(self.hasher_factory(algo) is None for algo in algorithms):
+            return {}  # Executables still need one process per file
+        plan = {}
+        for algo in algorithms:
+            kernel = self._batch_kernel(algo)
+            if kernel is not None:
+                plan[algo] = kernel
+        return plan
+    
+    @staticmethod
+    def _new_resumable_hasher(algo: str, state: Optional[str] = None):
+        """
+        Return a hasher whose state can be saved (native library, or zlib for
+        CRC-32), restored from a _hasher_state string if given; None if algo
+        has no such hasher.
+        
+        Raises:
+            ValueError: If state was saved by another kind of hasher
+        """
+        kind, _, raw = (state or '').partition(':')
+        algo_config = HashAlgorithm.get_algorithm_config(algo) or {}
+        library = load_library()
+        native_name = algo_config.get('native_name')
+        if (algo_config.get('type') == 'native_lib' and library is not None and native_name
+                and library.has_portable_state and library.algorithm_id(native_name) >= 0):
+            if state is None:
+                return library.new(native_name)
+            # 'native' checkpoints held a raw context copy, which another
+            # build may lay out differently; they are not resumed
+            if kind != 'words':
+                raise ValueError(f"{algo} checkpoint is not a native library state")
+            return library.restore(native_name, bytes.fromhex(raw))
+        if algo == 'CRC-32':
+            if state is None:
+                return _Crc32Hasher()
+            if kind != 'zlib':
+                raise ValueError(f"{algo} checkpoint is not a zlib state")
+            return _Crc32Hasher.restore(bytes.fromhex(raw))
+        return None
+    
+    @staticmethod
+    def _hasher_state(hasher) -> str:
+        """Serialize a hasher made by _new_resumable_hasher."""
+        kind = 'zlib' if isinstance(hasher, _Crc32Hasher) else 'words'
+        return f"{kind}:{hasher.state().hex()}"
+    
+    def new_in_process_hasher(self, algo: str):
+        """Return a hashlib-style hasher for algo that runs in this process, or None."""
+        factory = self.hasher_factory(algo)
+        return factory() if factory else None
+    
+    def _new_hasher(self, algo: str):
+        """Return an in-process hasher for algo, or else one fed to its executable."""
+        hasher = self.new_in_process_hasher(algo)
+        if hasher is None:
+            hasher = _ExecutableHasher(algo, self._start_stream_process(algo))
+        return hasher
+    
+    def _close_hashers(self, hashers: dict) -> None:
+        """Stop the executables behind any _ExecutableHasher or _FileModeProcess in hashers."""
+        for hasher in hashers.values():
+            if isinstance(hasher, (_ExecutableHasher, _FileModeProcess)):
+                self._stop_process(hasher.proc)
+    
+    def _buffer_size(self) -> int:
+        """Size of the read buffers currently in use."""
+        return self.chunk_size or self._chunk_sizer.buffer_size()
+    
+    def read_size(self, file_size: int) -> int:
+        """Bytes to read at a time from a file of file_size bytes."""
+        return self.chunk_size or self._chunk_sizer.chunk_size(file_size)
+    
+    def _ring_buffer_size(self, file_size: int) -> int:
+        """Size of each ring buffer used to read a file of file_size bytes."""
+        return max(1, min(self.read_size(file_size), file_size))
+    
+    def _ring_buffer_count(self, algorithms: list[str], file_size: int) -> int:
+        """
+        Number of ring buffers a file of file_size bytes may need.
+        
+        Writer threads queue chunks, so any algorithm that may get one
+        (fan-out or an executable) needs the whole ring; otherwise every
+        chunk is released before the next read.
+        """
+        if ((self.parallel_algorithms and len(algorithms) > 1 and file_size >= FAN_OUT_MIN_SIZE)
+                or any(self.hasher_factory(algo) is None for algo in algorithms)):
+            return FAN_OUT_QUEUE_DEPTH + 2
+        return 1
+    
+    def _read_buffer_bytes(self, algorithms: list[str], file_size: int) -> int:
+        """Upper bound on the read buffer bytes held while hashing a file."""
+        size = self._ring_buffer_size(file_size)
+        count = self._ring_buffer_count(algorithms, file_size)
+        return size * max(1, min(count, -(-file_size // size)))
+    
+    def _get_buffer_ring(self, count: int, size: int) -> BufferRing:
+        """Return this thread's reusable ring of count read buffers of size bytes."""
+        rings = getattr(self._thread_buffers, 'rings', None)
+        if rings is None:
+            rings = self._thread_buffers.rings = {}
+        ring = rings.get(count)
+        if ring is None or ring.size != size:
+            ring = rings[count] = BufferRing(count, size)
+        return ring
+    
+    def _drop_buffer_rings(self) -> None:
+        """Free this thread's read buffers."""
+        self._thread_buffers.rings = {}
+    
+    @staticmethod
+    def _read_small_file(file_path: str) -> Optional[bytes]:
+        """Return the content of a regular file up to SMALL_FILE_MAX_SIZE, else None."""
+        with open(file_path, 'rb', buffering=0) as f:
+            file_stat = os.fstat(f.fileno())
+            if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size > SMALL_FILE_MAX_SIZE:
+                return None
+            return f.readall()
+    
+    def calculate_text_sync(self,
+                            algorithms: list[str],
+                            text: str,
+                            check_cancel_callback: Optional[Callable[[], bool]] = None) -> dict[str, str]:
         """
         Calculate hashes for text synchronously.
         
+        In-process hashers resume from snapshots of the previous text, so
+        re-hashing after an edit near the end is proportional to the change.
+        
         Args:
             algorithms: List of algorithm names
             text: Input text
+            check_cancel_callback: Function that returns True once the result is
+                no longer wanted; hashing then stops early and a running worker
+                process is killed by cancel_text()
             
         Returns:
-            Dictionary mapping algorithm name to hash string
+            Dictionary mapping algorithm name to hash string (incomplete if cancelled)
         """
-        results = {}
         input_bytes = text.encode('utf-8')
+        is_cancelled = check_cancel_callback or (lambda: False)
+        
+        with self._text_lock:
+            self._text_checkpoints.rebase(input_bytes)
+            return self._calculate_text(algorithms, input_bytes, is_cancelled, check_cancel_callback)
+    
+    def _calculate_text(self,
+                        algorithms: list[str],
+                        input_bytes: bytes,
+                        is_cancelled: Callable[[], bool],
+                        check_cancel_callback: Optional[Callable[[], bool]]) -> dict[str, str]:
+        """Body of calculate_text_sync, run with the text checkpoints rebased."""
+        results = {}
         
         for algo in algorithms:
+            if is_cancelled():
+                break
+            
             algo_config = HashAlgorithm.get_algorithm_config(algo)
             if not algo_config:
                 results[algo] = f"Error: Unknown algorithm"
                 continue
                 
-            algo_type = algo_config.get('type')
+            new_hasher = self.hasher_factory(algo)
+            if new_hasher is not None:
+                digest = self._text_checkpoints.hash(algo, new_hasher, is_cancelled)
+                if digest is not None:
+                    results[algo] = digest
+                continue
             
-            if algo_type == 'executable':
-                executable_name = algo_config.get('executable')
-                if not executable_name:
-                    results[algo] = "Error: No executable specified"
-                    continue
-                
-                # Get base path (works for both dev and PyInstaller)
-                if getattr(sys, 'frozen', False):
-                    base_path = sys._MEIPASS
-                else:
-                    base_path = os.path.dirname(os.path.abspath(__file__))
-                    base_path = os.path.join(base_path, '..')
-                
-                executable_path = os.path.join(base_path, 'bin', executable_name)
-                
-                if not os.path.exists(executable_path):
-                    results[algo] = "Error: Executable not found"
-                    continue
-                
-                try:
-                    result = subprocess.run(
-                        [executable_path],
-                        input=input_bytes,
-                        capture_output=True,
-                        check=True,
-                        timeout=30,  # Increased from 5 to 30 seconds
-                        creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
-                    )
-                    results[algo] = result.stdout.decode('utf-8').strip()
-                except subprocess.TimeoutExpired as e:
-                    results[algo] = f"Error: Timeout after 30s (stderr: {e.stderr.decode('utf-8', errors='ignore') if e.stderr else 'none'})"
-                except Exception as e:
-                    results[algo] = f"Error: {str(e)}"
-            elif algo_type == 'hashlib':
-                # Handle hashlib types for text too
-                hashlib_name = algo_config.get('hashlib_name')
-                h = hashlib.new(hashlib_name)
-                h.update(input_bytes)
-                results[algo] = h.hexdigest()
-            else:
-                results[algo] = f"Error: Unknown type {algo_type}"
+            # No in-process hasher: use the executable
+            executable_name = algo_config.get('executable')
+            if not executable_name:
+                results[algo] = "Error: No executable specified"
+                continue
+            
+            executable_path = self._get_executable_path(executable_name)
+            
+            if not os.path.exists(executable_path):
+                results[algo] = "Error: Executable not found"
+                continue
+            
+            try:
+                # Reuse a persistent worker instead of spawning a process
+                results[algo] = self._workers.hash(
+                    executable_path,
+                    input_bytes,
+                    timeout=TEXT_HASH_TIMEOUT,
+                    check_cancel_callback=check_cancel_callback
+                )
+            except TimeoutError:
+                results[algo] = f"Error: Timeout after {TEXT_HASH_TIMEOUT}s"
+            except Exception as e:
+                results[algo] = f"Error: {str(e)}"
                 
         return results
+    
+    def cancel_text(self) -> None:
+        """Kill persistent workers whose text request has been cancelled."""
+        self._workers.cancel_requests()
 
     def calculate_file(self, 
                       algorithms: list[str], 
@@ -120,96 +788,961 @@ class HashCalculator:
             error_callback: Function to call with error message
             success_callback: Function to call with result dictionary
         """
-        # Map algorithm names to hashlib functions/constructors
-        hashlib_map = {
-            'SHA-256': hashlib.sha256,
-            'SHA-384': hashlib.sha384,
-            'SHA-512': hashlib.sha512
-        }
-        
-        # Separate algorithms into fast (hashlib/zlib) and slow (subprocess)
-        fast_algos = []
-        subprocess_algos = []
-        
-        for algo in algorithms:
-            if algo in hashlib_map or algo == 'CRC-32':
-                fast_algos.append(algo)
-            else:
-                subprocess_algos.append(algo)
+        # Answer from the digest cache when the file is unchanged
+        requested = list(algorithms)
+        cached = {}
+        file_stat = None
+        if self.cache is not None:
+            try:
+                file_stat = os.stat(file_path)
+            except OSError as ex:
+                error_callback(str(ex))
+                return
+            if not self.force_rehash:
+                cached = self.cache.lookup(file_path, file_stat, requested)
+            if len(cached) == len(requested):
+                success_callback({algo: cached[algo] for algo in requested})
+                return
+            algorithms = [algo for algo in requested if algo not in cached]
         
-        results = {}
+        # Every in-process algorithm is fed from the same read of the file;
+        # executables read it themselves by path, or else are attached to it
+        hashers = {}
+        direct = {}
         
         try:
-            # 1. Process all fast algorithms in ONE pass
-            if fast_algos:
-                file_size = os.path.getsize(file_path)
-                CHUNK_SIZE = 16 * 1024 * 1024  # 16MB
-                bytes_processed = 0
-                last_progress = 0
+            resume = self._resume_hashers(algorithms, file_path, file_stat)
+            segments = 1 if resume else self._segment_count(algorithms, file_path)
+            if resume is not None:
+                # Large file with a checkpoint store: continue from the last
+                # checkpoint and save new ones while reading
+                hashers, offset, checkpoint_stat = resume
                 
-                # Initialize hashers
-                hashers = {}
-                crc_val = 0
+                def save_checkpoint(done: int) -> None:
+                    if self._same_file_state(file_path, checkpoint_stat):
+                        states = {algo: self._hasher_state(hasher) for algo, hasher in hashers.items()}
+                        self.checkpoints.save(file_path, checkpoint_stat, done, states)
                 
-                for algo in fast_algos:
-                    if algo == 'CRC-32':
-                        crc_val = 0
+                if not self._hash_file_chunks(file_path, hashers, progress_callback,
+                                              check_cancel_callback, start_offset=offset,
+                                              checkpoint_callback=save_checkpoint):
+                    return
+                self.checkpoints.discard(file_path)
+                results = {algo: hashers[algo].hexdigest() for algo in algorithms}
+            elif segments > 1:
+                # Large CRC-only file: checksum segments in parallel
+                results = self._hash_file_segments(file_path, algorithms, segments,
+                                                   progress_callback, check_cancel_callback)
+                if results is None:
+                    return
+            else:
+                # Executables that can read the file by path run alongside
+                # the in-process read; progress is that of the slowest
+                for algo in algorithms:
+                    process = None
+                    if self.hasher_factory(algo) is None:
+                        process = self._start_file_process(algo, file_path)
+                    if process is not None:
+                        direct[algo] = process
                     else:
-                        hashers[algo] = hashlib_map[algo]()
+                        hashers[algo] = self._new_hasher(algo)
                 
-                import zlib
+                def report_progress(percent: int) -> None:
+                    progress_callback(min([percent] + [p.progress for p in direct.values()]))
                 
-                with open(file_path, 'rb') as f:
-                    while True:
-                        if check_cancel_callback():
-                            return
-                        
-                        chunk = f.read(CHUNK_SIZE)
-                        if not chunk:
-                            break
-                        
-                        # Update all hashers with the same chunk
-                        for algo in fast_algos:
-                            if algo == 'CRC-32':
-                                crc_val = zlib.crc32(chunk, crc_val)
-                            else:
-                                hashers[algo].update(chunk)
-                        
-                        bytes_processed += len(chunk)
-                        current_progress = int((bytes_processed / file_size) * 100)
-                        
+                if hashers:
+                    data = self._read_small_file(file_path)
+                    if data is not None:
+                        # Small file: one read, no progress bookkeeping
+                        for hasher in hashers.values():
+                            hasher.update(data)
+                    elif not self._hash_file_chunks(file_path, hashers,
+                                                    report_progress, check_cancel_callback):
+                        return
+                
+                if direct and not self._wait_file_processes(direct, progress_callback,
+                                                            check_cancel_callback):
+                    return
+                # Executables that could not open the path get the data piped
+                reopen = {algo: self._new_hasher(algo)
+                          for algo, process in direct.items() if process.cannot_open()}
+                if reopen:
+                    for algo in reopen:
+                        self._stop_process(direct.pop(algo).proc)
+                    hashers.update(reopen)
+                    if not self._hash_file_chunks(file_path, reopen, progress_callback,
+                                                  check_cancel_callback):
+                        return
+                results = {algo: hasher.hexdigest() for algo, hasher in {**hashers, **direct}.items()}
+                results = {algo: results[algo] for algo in algorithms}
+            
+            if self.cache is not None:
+                # Only remember digests if the file did not change while reading
+                if self._same_file_state(file_path, file_stat):
+                    self.cache.store(file_path, file_stat, results)
+                results.update(cached)
+                results = {algo: results[algo] for algo in requested if algo in results}
+            
+            success_callback(results)
+            
+        except Exception as ex:
+            error_callback(str(ex))
+        finally:
+            self._close_hashers(hashers)
+            self._close_hashers(direct)
+    
+    def _resume_hashers(self,
+                        algorithms: list[str],
+                        file_path: str,
+                        file_stat: Optional[os.stat_result]) -> Optional[tuple[dict, int, os.stat_result]]:
+        """
+        Prepare a checkpointed hash of a large file.
+        
+        Returns:
+            (hashers, offset, stat): the hashers of a still valid checkpoint
+            and its offset, or fresh resumable hashers and 0. None if
+            checkpoints do not apply: no store, a file below
+            CHECKPOINT_MIN_SIZE or an algorithm without a resumable hasher.
+        """
+        if self.checkpoints is None:
+            return None
+        file_stat = file_stat or os.stat(file_path)
+        if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size < CHECKPOINT_MIN_SIZE:
+            return None
+        hashers = {}
+        for algo in algorithms:
+            hasher = self._new_resumable_hasher(algo)
+            if hasher is None:
+                return None
+            hashers[algo] = hasher
+        
+        checkpoint = self.checkpoints.load(file_path, file_stat, algorithms)
+        if checkpoint is not None:
+            try:
+                restored = {algo: self._new_resumable_hasher(algo, checkpoint.states[algo])
+                            for algo in algorithms}
+                return restored, checkpoint.offset, file_stat
+            except ValueError:
+                pass  # Saved by another build of the hash cores; start over
+        return hashers, 0, file_stat
+    
+    def _hash_file_chunks(self,
+                          file_path: str,
+                          hashers: dict,
+                          progress_callback: Callable[[int], None],
+                          check_cancel_callback: Callable[[], bool],
+                          start_offset: int = 0,
+                          checkpoint_callback: Optional[Callable[[int], None]] = None) -> bool:
+        """
+        Feed a file to every hasher in chunks, reporting progress.
+        
+        Executables each get a writer thread, so they all hash the same read
+        concurrently; in-process hashers get threads only for large files.
+        Progress is that of the slowest consumer.
+        
+        Args:
+            start_offset: Byte offset to start reading at (the hashers
+                already hold the state of everything before it)
+            checkpoint_callback: Function called with the number of bytes
+                every hasher has consumed, every CHECKPOINT_INTERVAL seconds
+                and on cancellation; hashers are then all updated inline
+        
+        Returns:
+            False if the calculation was cancelled
+        """
+        file_size = os.path.getsize(file_path)
+        bytes_processed = start_offset
+        last_progress = 0
+        started = last_checkpoint = time.perf_counter()
+        
+        # Large files with several digests: one thread per algorithm.
+        # Otherwise only the executables' pipes get writer threads.
+        if (self.parallel_algorithms and len(hashers) > 1 and checkpoint_callback is None
+                and file_size >= FAN_OUT_MIN_SIZE):
+            threaded, inline = hashers, {}
+        else:
+            threaded = {algo: hasher for algo, hasher in hashers.items()
+                        if isinstance(hasher, _ExecutableHasher)}
+            inline = {algo: hasher for algo, hasher in hashers.items()
+                      if algo not in threaded}
+        # Inline hashing releases each chunk before the next read
+        ring = self._get_buffer_ring(FAN_OUT_QUEUE_DEPTH + 2 if threaded else 1,
+                                     self._ring_buffer_size(file_size))
+        
+        with ChunkReader(file_path, self.read_size(file_size), ring=ring,
+                         mode=self.read_mode, start_offset=start_offset) as reader:
+            self.last_read_mode = reader.mode
+            
+            fan_out = None
+            if threaded:
+                fan_out = _AlgorithmFanOut(threaded, FAN_OUT_QUEUE_DEPTH, reader.release)
+            
+            try:
+                while True:
+                    if check_cancel_callback():
+                        if checkpoint_callback:
+                            checkpoint_callback(bytes_processed)
+                        return False
+                    
+                    chunk = reader.read_chunk()
+                    if chunk is None:
+                        break
+                    
+                    # Update all hashers with the same chunk. Inline hashers go
+                    # first: the writer threads release the chunk when done.
+                    for hasher in inline.values():
+                        hasher.update(chunk)
+                    bytes_processed += len(chunk)
+                    if fan_out:
+                        fan_out.submit(chunk)
+                        done = fan_out.consumed_bytes()
+                    else:
+                        done = bytes_processed
+                        reader.release(chunk)
+                    
+                    if checkpoint_callback and time.perf_counter() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                        checkpoint_callback(bytes_processed)
+                        last_checkpoint = time.perf_counter()
+                    
+                    if file_size:
+                        current_progress = int((done / file_size) * 100)
                         if current_progress >= last_progress + 5:
                             progress_callback(current_progress)
                             last_progress = current_progress
                 
-                # Finalize results
-                for algo in fast_algos:
-                    if algo == 'CRC-32':
-                        results[algo] = format(crc_val & 0xFFFFFFFF, '08x')
+                if fan_out:
+                    fan_out.close()
+                    fan_out = None
+            finally:
+                if fan_out:
+                    fan_out.abort()
+        
+        # Threaded consumers may still have been behind at the last report
+        if file_size and last_progress < 100:
+            progress_callback(100)
+        self._chunk_sizer.record(file_size - start_offset, time.perf_counter() - started)
+        return True
+    
+    def _segment_count(self, algorithms: list[str], file_path: str) -> int:
+        """Return the number of segments to split file_path into (1: read it sequentially)."""
+        workers = self.segment_workers or os.cpu_count() or 1
+        if workers < 2 or not algorithms:
+            return 1
+        if not all(algo in CRC_POLYNOMIALS and self.hasher_factory(algo) is not None
+                   for algo in algorithms):
+            return 1
+        try:
+            file_size = os.path.getsize(file_path)
+        except OSError:
+            return 1  # Let the sequential path report the error
+        return max(1, min(workers, file_size // SEGMENT_MIN_SIZE))
+    
+    def _hash_file_segments(self,
+                            file_path: str,
+                            algorithms: list[str],
+                            segments: int,
+                            progress_callback: Callable[[int], None],
+                            check_cancel_callback: Callable[[], bool]) -> Optional[dict[str, str]]:
+        """
+        Checksum a file with CRC algorithms only, one segment per thread.
+        
+        Each thread reads its byte range through its own file handle; the
+        partial CRCs are merged with crc32_combine, which gives the same
+        digest as a sequential pass.
+        
+        Returns:
+            Dictionary mapping algorithm name to hash string, or None if cancelled
+        """
+        file_size = os.path.getsize(file_path)
+        segment_size = -(-file_size // segments)
+        ranges = [(start, min(segment_size, file_size - start))
+                  for start in range(0, file_size, segment_size)]
+        consumed = 0
+        consumed_lock = threading.Lock()
+        failed = threading.Event()
+        
+        def hash_segment(start: int, length: int) -> Optional[dict[str, int]]:
+            nonlocal consumed
+            hashers = {algo: self.new_in_process_hasher(algo) for algo in algorithms}
+            try:
+                view = memoryview(bytearray(min(SEGMENT_READ_SIZE, length)))
+                with open(file_path, 'rb', buffering=0) as f:
+                    f.seek(start)
+                    remaining = length
+                    while remaining:
+                        if failed.is_set() or check_cancel_callback():
+                            return None
+                        count = f.readinto(view[:min(len(view), remaining)])
+                        if not count:
+                            raise OSError(f"{file_path}: file shrank while reading")
+                        for hasher in hashers.values():
+                            hasher.update(view[:count])
+                        remaining -= count
+                        with consumed_lock:
+                            consumed += count
+                return {algo: int(hasher.hexdigest(), 16) for algo, hasher in hashers.items()}
+            finally:
+                self._close_hashers(hashers)
+        
+        last_progress = 0
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=len(ranges), thread_name_prefix='crc-segment') as executor:
+            futures = [executor.submit(hash_segment, start, length) for start, length in ranges]
+            while True:
+                done, running = concurrent.futures.wait(
+                    futures, timeout=PROCESS_POLL_INTERVAL,
+                    return_when=concurrent.futures.FIRST_EXCEPTION
+                )
+                if any(future.exception() for future in done):
+                    failed.set()  # Stop the other segments early
+                    break
+                if not running:
+                    break
+                current_progress = consumed * 100 // file_size
+                if current_progress >= last_progress + 5:
+                    progress_callback(current_progress)
+                    last_progress = current_progress
+            partials = [future.result() for future in futures]
+        if any(partial is None for partial in partials):
+            return None
+        if last_progress < 100:
+            progress_callback(100)
+        
+        results = {}
+        for algo in algorithms:
+            crc = partials[0][algo]
+            for (_, length), partial in zip(ranges[1:], partials[1:]):
+                crc = crc32_combine(crc, partial[algo], length, CRC_POLYNOMIALS[algo])
+            results[algo] = format(crc, '08x')
+        return results
+    
+    @staticmethod
+    def _same_file_state(file_path: str, before: os.stat_result) -> bool:
+        """Return True if size and modification time are still as in before."""
+        try:
+            after = os.stat(file_path)
+        except OSError:
+            return False
+        return after.st_size == before.st_size and after.st_mtime_ns == before.st_mtime_ns
+    
+    def _calculate_file_batch(self,
+                              algorithms: list[str],
+                              file_paths: list[str],
+                              batched: dict[str, str],
+                              check_cancel_callback: Callable[[], bool]
+                              ) -> Optional[list[tuple[Optional[dict[str, str]], Optional[str]]]]:
+        """
+        Hash a batch of small files.
+        
+        Each file is read once; the algorithms in batched are computed for
+        all files by one native library call, the others per file from the
+        same data. Files that turn out not to be small go through
+        calculate_file.
+        
+        Args:
+            algorithms: List of algorithm names
+            file_paths: Files of the batch
+            batched: Algorithms hashed by the library, mapped to its names
+                for them (see _batch_plan)
+            check_cancel_callback: Function that returns True if calculation should be cancelled
+        
+        Returns:
+            (results, error) per file in file_paths, or None if cancelled
+        """
+        outcomes: list = [None] * len(file_paths)
+        contents = []
+        for index, file_path in enumerate(file_paths):
+            if check_cancel_callback():
+                return None
+            try:
+                file_stat = None
+                if self.cache is not None:
+                    file_stat = os.stat(file_path)
+                    if not self.force_rehash:
+                        cached = self.cache.lookup(file_path, file_stat, algorithms)
+                        if len(cached) == len(algorithms):
+                            outcomes[index] = ({algo: cached[algo] for algo in algorithms}, None)
+                            continue
+                data = self._read_small_file(file_path)
+            except OSError as ex:
+                outcomes[index] = (None, str(ex))
+                continue
+            if data is None:
+                # Grew past the small-file limit (or is not a regular file)
+                outcome = {}
+                self.calculate_file(algorithms, file_path, lambda p: None, check_cancel_callback,
+                                    lambda msg: outcome.update(error=msg),
+                                    lambda res: outcome.update(results=res))
+                outcomes[index] = (outcome.get('results'), outcome.get('error'))
+            else:
+                contents.append((index, file_path, file_stat, data))
+        
+        if contents:
+            if check_cancel_callback():
+                return None
+            library = load_library()
+            buffers = [data for _, _, _, data in contents]
+            digests = {algo: library.hash_many(native_name, buffers)
+                       for algo, native_name in batched.items()}
+            for position, (index, file_path, file_stat, data) in enumerate(contents):
+                results = {}
+                for algo in algorithms:
+                    if algo in digests:
+                        results[algo] = digests[algo][position]
                     else:
-                        results[algo] = hashers[algo].hexdigest()
+                        hasher = self.new_in_process_hasher(algo)
+                        hasher.update(data)
+                        results[algo] = hasher.hexdigest()
+                if self.cache is not None and self._same_file_state(file_path, file_stat):
+                    self.cache.store(file_path, file_stat, results)
+                outcomes[index] = (results, None)
+        return outcomes
 
-            # 2. Process subprocess algorithms (sequentially, unfortunately)
-            # Note: Running these in parallel with fast algos would be complex due to disk I/O contention
-            for algo in subprocess_algos:
+    def calculate_files(self,
+                        algorithms: list[str],
+                        file_paths: Iterable[str],
+                        progress_callback: Callable[[int], None],
+                        check_cancel_callback: Callable[[], bool],
+                        result_callback: Callable[[str, Optional[dict[str, str]], Optional[str]], None],
+                        max_workers: int = 1,
+                        max_bytes_in_flight: int = DEFAULT_MAX_BYTES_IN_FLIGHT,
+                        bytes_callback: Optional[Callable[[int], None]] = None) -> None:
+        """
+        Calculate hashes for many files concurrently on a bounded worker pool.
+        
+        Each file is hashed by calculate_file on one of max_workers threads
+        (hashlib and zlib release the GIL on large buffers). Runs of small
+        files are grouped into batches when an algorithm has a faster batch
+        kernel (see _calculate_file_batch). A file is only started once its
+        read buffer fits into max_bytes_in_flight, and results are delivered
+        on the calling thread in submission order.
+        
+        Args:
+            algorithms: List of algorithm names
+            file_paths: Files to hash, in the order results are reported
+            progress_callback: Function to call with the number of completed files
+            check_cancel_callback: Function that returns True if calculation should be cancelled
+            result_callback: Function to call with (file_path, results, error) per file,
+                where exactly one of results and error is set
+            max_workers: Number of files hashed at the same time
+            max_bytes_in_flight: Upper bound on buffered bytes across all workers
+            bytes_callback: Function called from the worker threads with the
+                number of bytes every algorithm has just consumed (a
+                ProgressAggregator's add_bytes); a file counts in full once done
+        """
+        budget = _ByteBudget(max_bytes_in_flight)
+        max_pending = max(1, max_workers) * 4
+        pending: deque = deque()
+        completed = 0
+        batched = self._batch_plan(algorithms)
+        batch: list[str] = []
+        batch_size = 0
+        
+        def hash_one(file_path: str, reserved: int, file_size: int):
+            outcome = {}
+            reported = 0
+            
+            def file_progress(percent: int) -> None:
+                nonlocal reported
+                done = file_size * percent // 100
+                if done > reported:
+                    bytes_callback(done - reported)
+                    reported = done
+            
+            try:
+                self.calculate_file(
+                    algorithms,
+                    file_path,
+                    file_progress if bytes_callback else (lambda p: None),
+                    check_cancel_callback,
+                    lambda msg: outcome.update(error=msg),
+                    lambda res: outcome.update(results=res)
+                )
+            finally:
+                # The buffers must not outlive the reservation that covers them
+                self._drop_buffer_rings()
+                budget.release(reserved)
+                if bytes_callback and file_size > reported:
+                    bytes_callback(file_size - reported)
+            return [(outcome.get('results'), outcome.get('error'))]
+        
+        def hash_batch(batch_paths: list[str], reserved: int, total_size: int):
+            try:
+                outcomes = self._calculate_file_batch(algorithms, batch_paths, batched,
+                                                      check_cancel_callback)
+            finally:
+                budget.release(reserved)
+                if bytes_callback and total_size:
+                    bytes_callback(total_size)
+            return outcomes or []
+        
+        def deliver_ready(block: bool) -> None:
+            nonlocal completed
+            if block and pending and not pending[0][1].done():
+                concurrent.futures.wait(
+                    [future for _, future in pending if not future.done()],
+                    return_when=concurrent.futures.FIRST_COMPLETED
+                )
+            # Hand out finished results strictly in submission order
+            while pending and pending[0][1].done():
                 if check_cancel_callback():
                     return
-                    
-                # We reuse the single-file subprocess logic but adapt it
-                # For now, let's just run them one by one. 
-                # Ideally, we shouldn't mix fast and slow algos often.
-                self._calculate_file_subprocess(
-                    algo, 
-                    file_path, 
-                    progress_callback, # This might be jumpy if mixed with fast ones
-                    check_cancel_callback, 
-                    lambda res: results.update({algo: res})
-                )
+                submitted_paths, future = pending.popleft()
+                try:
+                    outcomes = future.result()
+                except Exception as ex:
+                    outcomes = [(None, str(ex))] * len(submitted_paths)
+                for file_path, (results, error) in zip(submitted_paths, outcomes):
+                    if results is None and error is None:
+                        continue  # Cancelled mid-file
+                    result_callback(file_path, results, error)
+                    completed += 1
+                    progress_callback(completed)
+        
+        def submit(submitted_paths: list[str], reserved: int, work: Callable, *args) -> bool:
+            while len(pending) >= max_pending or not budget.try_acquire(reserved):
+                deliver_ready(block=True)
+                if check_cancel_callback():
+                    return False
+            pending.append((submitted_paths, executor.submit(work, *args)))
+            deliver_ready(block=False)
+            return True
+        
+        def submit_batch() -> bool:
+            nonlocal batch, batch_size
+            if not batch:
+                return True
+            batch_paths, total_size = batch, batch_size
+            batch, batch_size = [], 0
+            reserved = max(1, total_size)
+            return submit(batch_paths, reserved, hash_batch, batch_paths, reserved, total_size)
+        
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix='hash-worker'
+        )
+        try:
+            for file_path in file_paths:
+                if check_cancel_callback():
+                    return
+                try:
+                    file_stat = os.stat(file_path)
+                    # Directories and devices have no file data to count
+                    # (a directory's st_size is its own metadata)
+                    regular = stat.S_ISREG(file_stat.st_mode)
+                    file_size = file_stat.st_size if regular else 0
+                    reserved = self._read_buffer_bytes(algorithms, file_size)
+                except OSError:
+                    regular = False
+                    file_size = None
+                    reserved = 1  # Let the worker report the error
+                
+                if batched and regular and file_size <= BATCH_FILE_MAX_SIZE:
+                    batch.append(file_path)
+                    batch_size += file_size
+                    if len(batch) >= BATCH_MAX_FILES or batch_size >= BATCH_MAX_BYTES:
+                        if not submit_batch():
+                            return
+                    continue
+                
+                # Files queued for a batch go first, keeping results in order
+                if not submit_batch():
+                    return
+                if not submit([file_path], reserved, hash_one, file_path, reserved, file_size or 0):
+                    return
             
-            success_callback(results)
+            if not submit_batch():
+                return
+            while pending and not check_cancel_callback():
+                deliver_ready(block=True)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if self.cache is not None:
+                self.cache.flush()
+
+    def verify_manifest(self,
+                        entries: list[ManifestEntry],
+                        check_cancel_callback: Callable[[], bool],
+                        result_callback: Callable[[ManifestEntry, str, str], None],
+                        max_workers: int = 1,
+                        fail_fast: bool = False) -> dict[str, float]:
+        """
+        Verify files against manifest entries, hashing them in parallel.
+        
+        Only the listed files are read, each once even if several entries
+        name it. Results are reported on the calling thread, in manifest
+        order, as soon as they are known.
+        
+        Args:
+            entries: Parsed manifest entries (see manifest.parse_manifest)
+            check_cancel_callback: Function that returns True if verification should be cancelled
+            result_callback: Function to call with (entry, status, detail) per entry, where
+                status is VERIFY_OK/FAILED/MISSING/ERROR and detail is the actual
+                digest or an error message
+            max_workers: Number of files hashed at the same time
+            fail_fast: Stop at the first FAILED or MISSING entry
             
-        except Exception as ex:
-            error_callback(str(ex))
+        Returns:
+            Summary with the 'ok', 'failed', 'missing' and 'errors' counts, the
+            'bytes' verified, the elapsed 'seconds' and 'throughput' in bytes/s
+        """
+        start = time.perf_counter()
+        counts = {VERIFY_OK: 0, VERIFY_FAILED: 0, VERIFY_MISSING: 0, VERIFY_ERROR: 0}
+        verified_bytes = 0
+        stopped = False
+        available = set(HashAlgorithm.all())
+        
+        # Entries per file, in order of first appearance
+        by_path: dict[str, list[ManifestEntry]] = {}
+        for entry in entries:
+            by_path.setdefault(entry.path, []).append(entry)
+        algorithms = list(dict.fromkeys(
+            entry.algorithm for entry in entries if entry.algorithm in available
+        ))
+        sizes: dict[str, int] = {}
+        missing: set[str] = set()
+        
+        def is_cancelled() -> bool:
+            return stopped or check_cancel_callback()
+        
+        def report(entry: ManifestEntry, status: str, detail: str) -> None:
+            nonlocal stopped
+            counts[status] += 1
+            result_callback(entry, status, detail)
+            if fail_fast and status in (VERIFY_FAILED, VERIFY_MISSING):
+                stopped = True
+        
+        def iter_paths():
+            for path, path_entries in by_path.items():
+                if is_cancelled():
+                    return
+                try:
+                    sizes[path] = os.stat(path).st_size
+                except FileNotFoundError:
+                    missing.add(path)
+                except OSError:
+                    pass
+                # Failing paths are still passed on so results stay in order
+                yield path
+        
+        def on_result(path: str, results: Optional[dict[str, str]], error: Optional[str]) -> None:
+            nonlocal verified_bytes
+            for entry in by_path[path]:
+                if is_cancelled():
+                    return
+                if path in missing:
+                    report(entry, VERIFY_MISSING, "No such file")
+                elif error is not None:
+                    report(entry, VERIFY_ERROR, error)
+                elif entry.algorithm not in available:
+                    report(entry, VERIFY_ERROR, f"Unsupported algorithm {entry.algorithm}")
+                else:
+                    actual = results[entry.algorithm].lower()
+                    report(entry, VERIFY_OK if actual == entry.expected else VERIFY_FAILED, actual)
+            if error is None:
+                verified_bytes += sizes.get(path, 0)
+        
+        if by_path:
+            self.calculate_files(
+                algorithms,
+                iter_paths(),
+                lambda completed: None,
+                is_cancelled,
+                on_result,
+                max_workers=max_workers
+            )
+        
+        seconds = time.perf_counter() - start
+        return {
+            'ok': counts[VERIFY_OK],
+            'failed': counts[VERIFY_FAILED],
+            'missing': counts[VERIFY_MISSING],
+            'errors': counts[VERIFY_ERROR],
+            'bytes': verified_bytes,
+            'seconds': seconds,
+            'throughput': verified_bytes / seconds if seconds > 0 else 0.0,
+        }
+    
+    def find_duplicates(self,
+                        entries: Iterable[tuple[str, int]],
+                        check_cancel_callback: Callable[[], bool],
+                        max_workers: int = 1,
+                        progress_callback: Optional[Callable[[str, int, int], None]] = None,
+                        bytes_callback: Optional[Callable[[int], None]] = None) -> dict[str, Any]:
+        """
+        Find files with identical content, reading as little as possible.
+        
+        Files are grouped by size; same-size files by a hash of their first
+        and last PARTIAL_HASH_SIZE bytes (which covers small files whole);
+        only files that still collide are hashed in full with
+        FULL_HASH_ALGORITHM through calculate_files. Hard links to one file count once and are
+        dropped before anything is read.
+        
+        Args:
+            entries: (path, size) pairs, e.g. from a folder scan; a negative
+                size is looked up and files that cannot be stat'ed are skipped
+            check_cancel_callback: Function that returns True if the search should be cancelled
+            max_workers: Number of files read at the same time
+            progress_callback: Function called with (stage, done, total) as
+                files pass the 'partial' and then the 'full' stage
+            bytes_callback: Passed on to calculate_files for the full stage
+        
+        Returns:
+            Summary with the duplicate 'groups' (DuplicateGroup, most wasted
+            bytes first), the 'files' scanned, the 'duplicates' (copies
+            beyond the first of each group), 'wasted' bytes, 'bytes_read'
+            out of 'total_bytes' (each byte counted once, even when the
+            full hash reads a file's ends again), 'errors' for unreadable
+            files and the
+            elapsed 'seconds'
+        """
+        start = time.perf_counter()
+        progress = progress_callback or (lambda stage, done, total: None)
+        entries = list(known_sizes(entries))
+        total_bytes = sum(size for _, size in entries)
+        bytes_read = 0
+        errors = 0
+        groups: list[DuplicateGroup] = []
+        
+        # Files of one size with the same ends
+        partial_groups: dict[tuple[int, str], list[str]] = {}
+        whole: set[tuple[int, str]] = set()
+        candidates = [(size, path) for size, paths in group_by_size(entries).items()
+                      for path in paths]
+        
+        def read_ends(path: str, size: int):
+            try:
+                return partial_key(path, size)
+            except OSError:
+                return None
+        
+        def record_ends(size: int, path: str, future: concurrent.futures.Future) -> None:
+            nonlocal bytes_read, errors
+            outcome = future.result()
+            if outcome is None:
+                errors += 1
+                return
+            digest, complete = outcome
+            bytes_read += partial_read_size(size)
+            key = (size, digest)
+            partial_groups.setdefault(key, []).append(path)
+            if complete:
+                whole.add(key)
+        
+        cancelled = False
+        pending: deque = deque()
+        done = 0
+        progress('partial', 0, len(candidates))
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix='dedupe-worker'
+        )
+        try:
+            for size, path in candidates:
+                if check_cancel_callback():
+                    cancelled = True
+                    break
+                while len(pending) >= max(1, max_workers) * 4:
+                    record_ends(*pending.popleft())
+                    done += 1
+                    progress('partial', done, len(candidates))
+                pending.append((size, path, executor.submit(read_ends, path, size)))
+            while pending and not cancelled:
+                record_ends(*pending.popleft())
+                done += 1
+                progress('partial', done, len(candidates))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        # Whole files already compared are settled; the rest are hashed in full
+        sizes: dict[str, int] = {}
+        for key, paths in partial_groups.items():
+            if len(paths) < 2:
+                continue
+            if key in whole:
+                groups.append(DuplicateGroup(key[0], paths))
+            else:
+                for path in paths:
+                    sizes[path] = key[0]
+        
+        if sizes and not cancelled:
+            full_groups: dict[tuple[int, str], list[str]] = {}
+            
+            def on_result(path: str, results: Optional[dict[str, str]], error: Optional[str]) -> None:
+                nonlocal bytes_read, errors
+                if error is not None:
+                    errors += 1
+                    return
+                # The ends were counted by the partial stage
+                bytes_read += sizes[path] - partial_read_size(sizes[path])
+                full_groups.setdefault((sizes[path], results[FULL_HASH_ALGORITHM]), []).append(path)
+            
+            progress('full', 0, len(sizes))
+            self.calculate_files(
+                [FULL_HASH_ALGORITHM],
+                list(sizes),
+                lambda completed: progress('full', completed, len(sizes)),
+                check_cancel_callback,
+                on_result,
+                max_workers=max_workers,
+                bytes_callback=bytes_callback
+            )
+            groups.extend(DuplicateGroup(size, paths)
+                          for (size, _), paths in full_groups.items() if len(paths) > 1)
+        
+        groups.sort(key=lambda group: (-group.wasted_bytes, group.paths[0]))
+        return {
+            'groups': groups,
+            'files': len(entries),
+            'duplicates': sum(len(group.paths) - 1 for group in groups),
+            'wasted': sum(group.wasted_bytes for group in groups),
+            'bytes_read': bytes_read,
+            'total_bytes': total_bytes,
+            'errors': errors,
+            'seconds': time.perf_counter() - start,
+        }
+    
+    def calculate_stream(self,
+                         algorithms: list[str],
+                         stream: BinaryIO,
+                         check_cancel_callback: Optional[Callable[[], bool]] = None) -> Optional[dict[str, str]]:
+        """
+        Calculate multiple hashes of a binary stream (e.g. stdin) in a single pass.
+        
+        Algorithms without an in-process hasher are fed to their executable
+        in stream mode while the stream is being read.
+        
+        Args:
+            algorithms: List of algorithm names
+            stream: Readable binary file object, read until EOF
+            check_cancel_callback: Function that returns True if calculation should be cancelled
+            
+        Returns:
+            Dictionary mapping algorithm name to hash string, or None if cancelled
+        """
+        is_cancelled = check_cancel_callback or (lambda: False)
+        hashers = {}
+        ring = self._get_buffer_ring(1, self._buffer_size())
+        buffer = ring.acquire()
+        try:
+            for algo in algorithms:
+                hashers[algo] = self._new_hasher(algo)
+            
+            view = memoryview(buffer)
+            while True:
+                if is_cancelled():
+                    return None
+                count = stream.readinto(buffer)
+                if not count:
+                    break
+                chunk = view[:count]
+                for hasher in hashers.values():
+                    hasher.update(chunk)
+            
+            return {algo: hasher.hexdigest() for algo, hasher in hashers.items()}
+        finally:
+            ring.release(buffer)
+            self._close_hashers(hashers)
+    
+    def executable_for(self, algorithm: str) -> str:
+        """Return the path of algorithm's executable, raising if there is none."""
+        algo_config = HashAlgorithm.get_algorithm_config(algorithm)
+        if not algo_config:
+            raise ValueError(f"Invalid algorithm configuration: {algorithm}")
+        executable_name = algo_config.get('executable')
+        if not executable_name:
+            raise ValueError("No executable specified")
+        executable_path = self._get_executable_path(executable_name)
+        if not os.path.exists(executable_path):
+            raise FileNotFoundError(f"Executable not found: {executable_name}")
+        return executable_path
+    
+    def _supports_file_mode(self, executable_path: str) -> bool:
+        """
+        Return True if the executable understands --file.
+        
+        Binaries built before --file existed take it for a size argument and
+        hash stdin instead, so the probe hashes an empty file while stdin
+        holds one byte and compares the result with the digest of empty input.
+        """
+        supported = self._file_mode_support.get(executable_path)
+        if supported is None:
+            try:
+                by_path = subprocess.run([executable_path, '--file', os.devnull], input=b'\0',
+                                         capture_output=True, timeout=5)
+                empty = subprocess.run([executable_path], input=b'',
+                                       capture_output=True, timeout=5)
+                supported = (by_path.returncode == 0 and empty.returncode == 0
+                             and by_path.stdout.strip() == empty.stdout.strip())
+            except (OSError, subprocess.SubprocessError):
+                supported = False
+            self._file_mode_support[executable_path] = supported
+        return supported
+    
+    def _start_file_process(self, algorithm: str, file_path: str) -> Optional[_FileModeProcess]:
+        """Launch the executable of algorithm on file_path in --file mode, if it has one."""
+        if not self.direct_read:
+            return None
+        executable_path = self.executable_for(algorithm)
+        if not self._supports_file_mode(executable_path):
+            return None
+        proc = subprocess.Popen(
+            [executable_path, '--file', file_path],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        with self._process_lock:
+            self._active_processes.add(proc)
+        return _FileModeProcess(algorithm, proc)
+    
+    def _wait_file_processes(self,
+                             processes: dict[str, _FileModeProcess],
+                             progress_callback: Callable[[int], None],
+                             check_cancel_callback: Callable[[], bool]) -> bool:
+        """
+        Wait for --file mode executables, reporting the slowest one's progress.
+        
+        Returns:
+            False if the calculation was cancelled
+        """
+        last_progress = -1
+        for process in processes.values():
+            while True:
+                if check_cancel_callback():
+                    return False
+                try:
+                    process.proc.wait(timeout=PROCESS_POLL_INTERVAL)
+                    break
+                except subprocess.TimeoutExpired:
+                    pass
+                finally:
+                    current_progress = min(p.progress for p in processes.values())
+                    if current_progress > last_progress:
+                        progress_callback(current_progress)
+                        last_progress = current_progress
+        return True
+    
+    def _start_stream_process(self, algorithm: str) -> subprocess.Popen:
+        """Launch the executable of algorithm in stream mode (no progress output)."""
+        proc = subprocess.Popen(
+            [self.executable_for(algorithm)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0
+        )
+        with self._process_lock:
+            self._active_processes.add(proc)
+        return proc
+    
+    def _stop_process(self, proc: subprocess.Popen) -> None:
+        """Terminate proc if it is still running and stop tracking it."""
+        if proc.poll() is None:
+            proc.terminate()
+            proc.wait()
+        with self._process_lock:
+            self._active_processes.discard(proc)
 
     def _calculate_file_subprocess(self, 
                                   algorithm: str, 
@@ -218,26 +1751,21 @@ class HashCalculator:
                                   check_cancel_callback: Callable[[], bool],
                                   success_callback: Callable[[str], None]) -> None:
         """Internal method for subprocess fallback."""
-        algo_config = HashAlgorithm.get_algorithm_config(algorithm)
-        
-        if not algo_config or algo_config.get('type') != 'executable':
-            raise ValueError("Invalid algorithm configuration")
-        
-        executable_name = algo_config.get('executable')
-        if not executable_name:
-            raise ValueError("No executable specified")
-        
-        # Get base path (works for both dev and PyInstaller)
-        if getattr(sys, 'frozen', False):
-            base_path = sys._MEIPASS
-        else:
-            base_path = os.path.dirname(os.path.abspath(__file__))
-            base_path = os.path.join(base_path, '..')
-        
-        executable_path = os.path.join(base_path, 'bin', executable_name)
+        process = self._start_file_process(algorithm, file_path)
+        if process is not None:
+            # The executable reads the file itself
+            try:
+                if not self._wait_file_processes({algorithm: process}, progress_callback,
+                                                 check_cancel_callback):
+                    return
+                if not process.cannot_open():
+                    success_callback(process.hexdigest())
+                    return
+            finally:
+                self._stop_process(process.proc)
+            # It could not open the path: stream the data to it below
         
-        if not os.path.exists(executable_path):
-            raise FileNotFoundError(f"Executable not found: {executable_name}")
+        executable_path = self.executable_for(algorithm)
         
         # Get file size
         file_size = os.path.getsize(file_path)
@@ -251,22 +1779,20 @@ class HashCalculator:
             bufsize=0
         )
         
-        self._current_process = proc
+        with self._process_lock:
+            self._active_processes.add(proc)
         
         try:
-            CHUNK_SIZE = 16 * 1024 * 1024
-            
             # Thread to read stderr for progress
             progress_queue = queue.Queue()
             
             def read_stderr():
-                progress_pattern = re.compile(r'PROGRESS:(\d+)')
                 while True:
                     line = proc.stderr.readline()
                     if not line:
                         break
                     line_str = line.decode('utf-8', errors='ignore').strip()
-                    match = progress_pattern.match(line_str)
+                    match = PROGRESS_PATTERN.match(line_str)
                     if match:
                         progress_queue.put(int(match.group(1)))
             
@@ -274,36 +1800,46 @@ class HashCalculator:
             stderr_thread.start()
             
             # Stream file to stdin
-            with open(file_path, 'rb') as f:
+            with ChunkReader(file_path, self.read_size(file_size),
+                             ring=self._get_buffer_ring(1, self._ring_buffer_size(file_size)),
+                             mode=self.read_mode) as reader:
+                self.last_read_mode = reader.mode
                 while True:
                     if check_cancel_callback():
                         proc.terminate()
                         proc.wait()
                         return
                     
-                    chunk = f.read(CHUNK_SIZE)
-                    if not chunk:
+                    chunk = reader.read_chunk()
+                    if chunk is None:
                         break
                     
-                    proc.stdin.write(chunk)
+                    try:
+                        proc.stdin.write(chunk)
+                    finally:
+                        reader.release(chunk)
                     
                     while not progress_queue.empty():
                         progress_callback(progress_queue.get())
             
             proc.stdin.close()
             
-            # Wait for completion
+            # Wait for completion, waking up to check for cancellation
             while True:
                 if check_cancel_callback():
                     proc.terminate()
                     proc.wait()
                     return
-                if proc.poll() is not None:
+                try:
+                    proc.wait(timeout=PROCESS_POLL_INTERVAL)
                     break
-                while not progress_queue.empty():
-                    progress_callback(progress_queue.get())
+                except subprocess.TimeoutExpired:
+                    pass
+                finally:
+                    while not progress_queue.empty():
+                        progress_callback(progress_queue.get())
             
-            stdout, _ = proc.communicate()
+            stdout = proc.stdout.read()
             
             if proc.returncode != 0:
                 raise RuntimeError("Hash calculation failed")
@@ -314,13 +1850,18 @@ class HashCalculator:
             if proc.poll() is None:
                 proc.terminate()
                 proc.wait()
-            self._current_process = None
+            with self._process_lock:
+                self._active_processes.discard(proc)
 
     def terminate_subprocess(self):
-        """Force terminate any running subprocess."""
-        if self._current_process and self._current_process.poll() is None:
-            self._current_process.terminate()
-            try:
-                self._current_process.wait(timeout=1.0)
-            except subprocess.TimeoutExpired:
-                self._current_process.kill()
+        """Force terminate all running subprocesses and persistent workers."""
+        self._workers.shutdown()
+        with self._process_lock:
+            processes = list(self._active_processes)
+        for proc in processes:
+            if proc.poll() is None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=1.0)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
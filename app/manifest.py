@@ -0,0 +1,160 @@
+"""
+Checksum manifest parsing.
+Reads sha256sum / md5sum style manifests (`digest  path`, `digest *path`)
+and BSD style tagged lines (`SHA256 (path) = digest`).
+"""
+
+import os
+import re
+from typing import NamedTuple, Optional
+
+# Verification outcomes
+VERIFY_OK = "OK"
+VERIFY_FAILED = "FAILED"
+VERIFY_MISSING = "MISSING"
+VERIFY_ERROR = "ERROR"
+
+# Algorithm implied by the hex digest length
+_ALGORITHM_BY_LENGTH = {
+    8: "CRC-32",
+    32: "MD5",
+    40: "SHA-1",
+    64: "SHA-256",
+    96: "SHA-384",
+    128: "SHA-512",
+}
+
+# Hex digest length of each algorithm a manifest name can imply
+_DIGEST_LENGTH = {
+    "CRC-32": 8,
+    "CRC-32C": 8,
+    "MD5": 32,
+    "SHA-1": 40,
+    "SHA-256": 64,
+    "SHA3-256": 64,
+    "SHA-384": 96,
+    "SHA-512": 128,
+    "BLAKE2b": 128,
+}
+
+# Algorithm implied by a BSD tag or a manifest file name, compared without
+# '-' and '_' (checked in order, so "crc32c" wins over "crc32")
+_ALGORITHM_BY_NAME = (
+    ("sha3256", "SHA3-256"),
+    ("blake2b", "BLAKE2b"),
+    ("sha256", "SHA-256"),
+    ("sha384", "SHA-384"),
+    ("sha512", "SHA-512"),
+    ("sha1", "SHA-1"),
+    ("md5", "MD5"),
+    ("crc32c", "CRC-32C"),
+    ("crc32", "CRC-32"),
+)
+
+_TAGGED_LINE = re.compile(r'^(?P<tag>[A-Za-z0-9-]+) \((?P<path>.*)\) = (?P<digest>[0-9A-Fa-f]+)$')
+_PLAIN_LINE = re.compile(r'^(?P<digest>[0-9A-Fa-f]+) [ *](?P<path>.+)$')
+
+
+class ManifestEntry(NamedTuple):
+    """One expected digest from a manifest."""
+    name: str        # Path as written in the manifest
+    path: str        # Resolved path
+    algorithm: str
+    expected: str
+    line: int
+
+
+def algorithm_from_tag(tag: str) -> Optional[str]:
+    """Map a BSD tag such as "SHA256" or "SHA-256" to an algorithm name."""
+    normalized = tag.lower().replace('-', '').replace('_', '')
+    for token, algorithm in _ALGORITHM_BY_NAME:
+        if normalized == token:
+            return algorithm
+    return None
+
+
+def algorithm_from_file_name(manifest_path: str) -> Optional[str]:
+    """Guess the algorithm from names like "file.sha256" or "SHA512SUMS"."""
+    name = os.path.basename(manifest_path).lower().replace('-', '').replace('_', '')
+    for token, algorithm in _ALGORITHM_BY_NAME:
+        if token in name:
+            return algorithm
+    return None
+
+
+def _unescape(path: str) -> str:
+    """Undo the escaping coreutils applies to names with '\\' or newlines."""
+    out = []
+    chars = iter(path)
+    for char in chars:
+        if char == '\\':
+            following = next(chars, '')
+            out.append({'n': '\n', 'r': '\r', '\\': '\\'}.get(following, '\\' + following))
+        else:
+            out.append(char)
+    return ''.join(out)
+
+
+def parse_manifest(manifest_path: str, algorithm: Optional[str] = None) -> list[ManifestEntry]:
+    """
+    Parse a checksum manifest.
+
+    The algorithm of a plain line is the algorithm argument if given,
+    else the one named by the manifest file (when its digest length fits),
+    else the one implied by the digest length. Relative paths are resolved
+    against the manifest's folder.
+
+    Args:
+        manifest_path: Path to the manifest
+        algorithm: Force this algorithm for untagged lines
+
+    Returns:
+        Entries in manifest order
+
+    Raises:
+        ValueError: If a line cannot be parsed or its algorithm is unknown
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    name_algorithm = algorithm_from_file_name(manifest_path)
+    entries = []
+
+    with open(manifest_path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+        for number, raw in enumerate(f, 1):
+            line = raw.rstrip('\r\n')
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            escaped = line.startswith('\\')
+            if escaped:
+                line = line[1:]
+
+            match = _TAGGED_LINE.match(line)
+            if match:
+                line_algorithm = algorithm_from_tag(match.group('tag'))
+                if line_algorithm is None:
+                    raise ValueError(f"line {number}: unknown algorithm {match.group('tag')}")
+            else:
+                match = _PLAIN_LINE.match(line)
+                if not match:
+                    raise ValueError(f"line {number}: not a checksum line")
+                digest_length = len(match.group('digest'))
+                if algorithm:
+                    line_algorithm = algorithm
+                elif name_algorithm and _DIGEST_LENGTH[name_algorithm] == digest_length:
+                    line_algorithm = name_algorithm
+                else:
+                    line_algorithm = _ALGORITHM_BY_LENGTH.get(digest_length)
+                if line_algorithm is None:
+                    raise ValueError(f"line {number}: cannot tell the algorithm of a "
+                                     f"{digest_length}-digit digest")
+
+            path = match.group('path')
+            if escaped:
+                path = _unescape(path)
+            entries.append(ManifestEntry(
+                path,
+                os.path.join(base_dir, path),
+                line_algorithm,
+                match.group('digest').lower(),
+                number
+            ))
+    return entries
@@ -0,0 +1,287 @@
+"""
+In-process native hash backend.
+Loads the C++ hash cores (src/HashCore.cpp) as a shared library through
+ctypes, so data is hashed straight from Python buffers with no pipe and
+no copy.
+"""
+
+import os
+import sys
+import ctypes
+import threading
+from typing import Optional
+
+# Shared library file name per platform
+if sys.platform == 'win32':
+    LIBRARY_NAME = 'HashCore.dll'
+elif sys.platform == 'darwin':
+    LIBRARY_NAME = 'libHashCore.dylib'
+else:
+    LIBRARY_NAME = 'libHashCore.so'
+
+_PyBUF_SIMPLE = 0
+
+# Bytes reserved per digest in batch output (SHA-512 hex plus NUL)
+BATCH_DIGEST_STRIDE = 129
+# Largest exported hasher state (SHA-512: 8 words, byte count, a block)
+STATE_MAX_SIZE = 8 * 8 + 8 + 128
+
+
+class _PyBuffer(ctypes.Structure):
+    """Mirror of CPython's Py_buffer, used to borrow a pointer to any buffer."""
+    _fields_ = [
+        ('buf', ctypes.c_void_p),
+        ('obj', ctypes.c_void_p),
+        ('len', ctypes.c_ssize_t),
+        ('itemsize', ctypes.c_ssize_t),
+        ('readonly', ctypes.c_int),
+        ('ndim', ctypes.c_int),
+        ('format', ctypes.c_char_p),
+        ('shape', ctypes.POINTER(ctypes.c_ssize_t)),
+        ('strides', ctypes.POINTER(ctypes.c_ssize_t)),
+        ('suboffsets', ctypes.POINTER(ctypes.c_ssize_t)),
+        ('internal', ctypes.c_void_p),
+    ]
+
+
+_get_buffer = ctypes.pythonapi.PyObject_GetBuffer
+_get_buffer.argtypes = [ctypes.py_object, ctypes.POINTER(_PyBuffer), ctypes.c_int]
+_get_buffer.restype = ctypes.c_int
+_release_buffer = ctypes.pythonapi.PyBuffer_Release
+_release_buffer.argtypes = [ctypes.POINTER(_PyBuffer)]
+_release_buffer.restype = None
+
+
+class NativeLibrary:
+    """Thin ctypes binding of the HashCore shared library."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lib = ctypes.CDLL(path)
+
+        self._lib.hc_algorithm_id.argtypes = [ctypes.c_char_p]
+        self._lib.hc_algorithm_id.restype = ctypes.c_int
+        self._lib.hc_context_size.argtypes = [ctypes.c_int]
+        self._lib.hc_context_size.restype = ctypes.c_size_t
+        self._lib.hc_init.argtypes = [ctypes.c_int, ctypes.c_void_p]
+        self._lib.hc_init.restype = None
+        self._lib.hc_update.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t]
+        self._lib.hc_update.restype = None
+        self._lib.hc_final_hex.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_char_p, ctypes.c_size_t]
+        self._lib.hc_final_hex.restype = ctypes.c_size_t
+        # Batch hashing came later; libraries built before it lack it
+        self.has_batch = hasattr(self._lib, 'hc_hash_many')
+        if self.has_batch:
+            self._lib.hc_batch_lanes.argtypes = [ctypes.c_int]
+            self._lib.hc_batch_lanes.restype = ctypes.c_int
+            self._lib.hc_hash_many.argtypes = [
+                ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(ctypes.c_size_t),
+                ctypes.c_size_t, ctypes.c_char_p, ctypes.c_size_t
+            ]
+            self._lib.hc_hash_many.restype = ctypes.c_size_t
+        # Layout-independent state export, for checkpoints that outlive a build
+        self.has_portable_state = hasattr(self._lib, 'hc_state_export')
+        if self.has_portable_state:
+            self._lib.hc_state_export.argtypes = [ctypes.c_int, ctypes.c_void_p,
+                                                  ctypes.c_char_p, ctypes.c_size_t]
+            self._lib.hc_state_export.restype = ctypes.c_size_t
+            self._lib.hc_state_import.argtypes = [ctypes.c_int, ctypes.c_void_p,
+                                                  ctypes.c_char_p, ctypes.c_size_t]
+            self._lib.hc_state_import.restype = ctypes.c_int
+        # Per-kernel CRC entry points, for testing every kernel the CPU runs
+        self.has_crc_kernels = hasattr(self._lib, 'hc_crc_with_kernel')
+        if self.has_crc_kernels:
+            self._lib.hc_crc_kernel_count.argtypes = []
+            self._lib.hc_crc_kernel_count.restype = ctypes.c_int
+            self._lib.hc_crc_kernel_name.argtypes = [ctypes.c_int]
+            self._lib.hc_crc_kernel_name.restype = ctypes.c_char_p
+            self._lib.hc_crc_with_kernel.argtypes = [
+                ctypes.c_int, ctypes.c_int, ctypes.c_void_p, ctypes.c_size_t,
+                ctypes.POINTER(ctypes.c_uint32)
+            ]
+            self._lib.hc_crc_with_kernel.restype = ctypes.c_int
+
+    def algorithm_id(self, native_name: str) -> int:
+        """Return the library's id for an algorithm, or -1 if unsupported."""
+        return self._lib.hc_algorithm_id(native_name.encode('ascii'))
+
+    def new(self, native_name: str) -> 'NativeHasher':
+        """Create a hasher for native_name (e.g. "sha256")."""
+        algo_id = self.algorithm_id(native_name)
+        if algo_id < 0:
+            raise ValueError(f"Unsupported native algorithm: {native_name}")
+        return NativeHasher(self, algo_id)
+
+    def restore(self, native_name: str, state: bytes) -> 'NativeHasher':
+        """
+        Create a hasher from the state of an earlier one (NativeHasher.state).
+
+        Raises:
+            ValueError: If the library cannot import states or state is not
+                a valid native_name state
+        """
+        if not self.has_portable_state:
+            raise ValueError("Native library was built without state export")
+        hasher = self.new(native_name)
+        if not self._lib.hc_state_import(hasher._algo_id, hasher._context, state, len(state)):
+            raise ValueError(f"Not a {native_name} state")
+        return hasher
+
+    def batch_lanes(self, native_name: str) -> int:
+        """Return how many messages hash_many processes at once (1 if not batched)."""
+        algo_id = self.algorithm_id(native_name)
+        if not self.has_batch or algo_id < 0:
+            return 1
+        return self._lib.hc_batch_lanes(algo_id)
+
+    def hash_many(self, native_name: str, buffers: list) -> list[str]:
+        """
+        Hash independent buffers in one call.
+
+        SHA-256 runs one buffer per SIMD lane (multi-buffer), so a batch of
+        small files costs about as much as its largest few. The buffers are
+        joined into one block first; the call is meant for small inputs.
+
+        Args:
+            native_name: Algorithm in the library (e.g. "sha256")
+            buffers: Bytes-like objects
+
+        Returns:
+            Hex digest per buffer, in order
+        """
+        algo_id = self.algorithm_id(native_name)
+        if algo_id < 0:
+            raise ValueError(f"Unsupported native algorithm: {native_name}")
+        if not self.has_batch:
+            raise ValueError("Native library was built without batch hashing")
+        if not buffers:
+            return []
+
+        count = len(buffers)
+        joined = b''.join(buffers)
+        lengths = (ctypes.c_size_t * count)(*map(len, buffers))
+        out = ctypes.create_string_buffer(count * BATCH_DIGEST_STRIDE)
+        # ctypes releases the GIL for the duration of the call
+        length = self._lib.hc_hash_many(algo_id, joined, lengths, count,
+                                        out, BATCH_DIGEST_STRIDE)
+        raw = out.raw
+        return [
+            raw[offset:offset + length].decode('ascii')
+            for offset in range(0, count * BATCH_DIGEST_STRIDE, BATCH_DIGEST_STRIDE)
+        ]
+
+    def crc_kernels(self) -> list[str]:
+        """Return the names of the CRC kernels this CPU can run, by index."""
+        if not self.has_crc_kernels:
+            return []
+        return [self._lib.hc_crc_kernel_name(index).decode('ascii')
+                for index in range(self._lib.hc_crc_kernel_count())]
+
+    def crc_with_kernel(self, native_name: str, kernel: int, data) -> int:
+        """
+        Compute a CRC in one call through a specific kernel.
+
+        Args:
+            native_name: "crc32" or "crc32c"
+            kernel: Index into crc_kernels()
+            data: Any contiguous buffer
+
+        Returns:
+            The final CRC as an integer (comparable to zlib.crc32)
+        """
+        if not self.has_crc_kernels:
+            raise ValueError("Native library was built without per-kernel CRC entry points")
+        algo_id = self.algorithm_id(native_name)
+        crc = ctypes.c_uint32()
+        view = _PyBuffer()
+        _get_buffer(data, ctypes.byref(view), _PyBUF_SIMPLE)
+        try:
+            ok = self._lib.hc_crc_with_kernel(algo_id, kernel, view.buf, view.len, ctypes.byref(crc))
+        finally:
+            _release_buffer(ctypes.byref(view))
+        if not ok:
+            raise ValueError(f"No CRC kernel {kernel} for {native_name}")
+        return crc.value
+
+
+class NativeHasher:
+    """hashlib-style hasher backed by a context in the native library."""
+
+    def __init__(self, library: NativeLibrary, algo_id: int, _context=None):
+        self._library = library
+        self._lib = library._lib
+        self._algo_id = algo_id
+        if _context is None:
+            size = self._lib.hc_context_size(algo_id)
+            # uint64 storage keeps the context 8-byte aligned
+            _context = (ctypes.c_uint64 * ((size + 7) // 8))()
+            self._lib.hc_init(algo_id, _context)
+        self._context = _context
+
+    def update(self, data) -> None:
+        """Hash any contiguous buffer (bytes, bytearray, memoryview, mmap)."""
+        view = _PyBuffer()
+        _get_buffer(data, ctypes.byref(view), _PyBUF_SIMPLE)
+        try:
+            # ctypes releases the GIL for the duration of the call
+            self._lib.hc_update(self._algo_id, self._context, view.buf, view.len)
+        finally:
+            _release_buffer(ctypes.byref(view))
+
+    def copy(self) -> 'NativeHasher':
+        """Return an independent copy of the current state."""
+        context = type(self._context)()
+        ctypes.memmove(context, self._context, ctypes.sizeof(context))
+        return NativeHasher(self._library, self._algo_id, context)
+
+    def state(self) -> bytes:
+        """
+        Return the chaining words, byte count and pending input in a fixed
+        little-endian layout, for NativeLibrary.restore in a later run or
+        another build of the library.
+
+        Raises:
+            ValueError: If the library was built without state export
+        """
+        if not self._library.has_portable_state:
+            raise ValueError("Native library was built without state export")
+        out = ctypes.create_string_buffer(STATE_MAX_SIZE)
+        length = self._lib.hc_state_export(self._algo_id, self._context, out, len(out))
+        return out.raw[:length]
+
+    def hexdigest(self) -> str:
+        """Return the digest of the data so far without consuming the state."""
+        final = self.copy()
+        out = ctypes.create_string_buffer(256)
+        length = self._lib.hc_final_hex(self._algo_id, final._context, out, len(out))
+        return out.value[:length].decode('ascii')
+
+
+_library: Optional[NativeLibrary] = None
+_library_loaded = False
+_library_lock = threading.Lock()
+
+
+def load_library() -> Optional[NativeLibrary]:
+    """
+    Load the native hash library from bin/ once.
+
+    Returns:
+        The library, or None if it has not been built for this platform
+    """
+    global _library, _library_loaded
+    with _library_lock:
+        if not _library_loaded:
+            _library_loaded = True
+            # Get base path (works for both dev and PyInstaller)
+            if getattr(sys, 'frozen', False):
+                base_path = sys._MEIPASS
+            else:
+                base_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+            path = os.path.join(base_path, 'bin', LIBRARY_NAME)
+            if os.path.exists(path):
+                try:
+                    _library = NativeLibrary(path)
+                except OSError:
+                    _library = None
+        return _library
@@ -0,0 +1,122 @@
+"""
+Batch progress aggregation.
+Hashing workers only bump thread-safe counters; the UI reads a coalesced
+snapshot at its own frame rate, so the number of UI updates does not grow
+with the number of files or chunks.
+"""
+
+import threading
+import time
+from typing import NamedTuple, Optional
+
+# Weight of the newest rate sample in the smoothed MB/s and files/s
+RATE_SMOOTHING = 0.3
+# Snapshots closer together than this reuse the previous rates
+MIN_RATE_INTERVAL = 0.05
+
+
+class ProgressSnapshot(NamedTuple):
+    """Progress of a batch at one point in time."""
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+    percent: int
+    bytes_per_second: float
+    files_per_second: float
+    eta_seconds: Optional[float]   # None until a rate is known
+
+
+class ProgressAggregator:
+    """
+    Thread-safe bytes and files counters for a batch of files.
+
+    Totals may grow while the batch runs (a folder walk still adding files).
+    Percent and ETA are based on bytes, or on files while the byte total is
+    unknown.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every counter and restart the clock."""
+        with self._lock:
+            self._files_done = 0
+            self._files_total = 0
+            self._bytes_done = 0
+            self._bytes_total = 0
+            self._sample_time = time.perf_counter()
+            self._sample_bytes = 0
+            self._sample_files = 0
+            self._bytes_per_second: Optional[float] = None
+            self._files_per_second: Optional[float] = None
+
+    def set_total(self, files: int, size: int) -> None:
+        """Set the number of files and bytes in the batch."""
+        with self._lock:
+            self._files_total = files
+            self._bytes_total = max(0, size)
+
+    def add_bytes(self, count: int) -> None:
+        """Count bytes that every algorithm has consumed (any thread)."""
+        with self._lock:
+            self._bytes_done += count
+
+    def set_files_done(self, count: int) -> None:
+        """Set the number of finished files (any thread)."""
+        with self._lock:
+            self._files_done = count
+
+    @staticmethod
+    def _smooth(previous: Optional[float], sample: float) -> float:
+        if previous is None:
+            return sample
+        return (1 - RATE_SMOOTHING) * previous + RATE_SMOOTHING * sample
+
+    def snapshot(self) -> ProgressSnapshot:
+        """Return the current progress with smoothed rates and the ETA."""
+        now = time.perf_counter()
+        with self._lock:
+            files_done, files_total = self._files_done, self._files_total
+            bytes_done, bytes_total = self._bytes_done, self._bytes_total
+
+            elapsed = now - self._sample_time
+            if elapsed >= MIN_RATE_INTERVAL:
+                self._bytes_per_second = self._smooth(
+                    self._bytes_per_second, (bytes_done - self._sample_bytes) / elapsed)
+                self._files_per_second = self._smooth(
+                    self._files_per_second, (files_done - self._sample_files) / elapsed)
+                self._sample_time = now
+                self._sample_bytes = bytes_done
+                self._sample_files = files_done
+            bytes_per_second = self._bytes_per_second or 0.0
+            files_per_second = self._files_per_second or 0.0
+
+        eta = None
+        if bytes_total:
+            percent = bytes_done * 100 // bytes_total
+            if bytes_per_second > 0:
+                eta = max(0, bytes_total - bytes_done) / bytes_per_second
+        elif files_total:
+            percent = files_done * 100 // files_total
+            if files_per_second > 0:
+                eta = max(0, files_total - files_done) / files_per_second
+        else:
+            percent = 0
+        return ProgressSnapshot(
+            files_done, files_total, bytes_done, bytes_total, min(100, percent),
+            bytes_per_second, files_per_second, eta
+        )
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    """Format an ETA as m:ss or h:mm:ss ("--:--" when unknown)."""
+    if seconds is None:
+        return "--:--"
+    minutes, secs = divmod(int(seconds + 0.5), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
@@ -0,0 +1,178 @@
+"""
+Zero-copy chunked file reading for the hashing engine.
+Chunks are either read with readinto() into a small ring of preallocated
+buffers, or sliced straight out of a memory map of the file.
+"""
+
+import os
+import sys
+import mmap
+import queue
+import stat
+import threading
+from typing import Optional
+
+# Read modes
+READ_MODE_AUTO = 'auto'
+READ_MODE_READINTO = 'readinto'
+READ_MODE_MMAP = 'mmap'
+
+# Regular files at least this large are memory-mapped in auto mode
+MMAP_MIN_SIZE = 64 * 1024 * 1024
+
+
+class BufferRing:
+    """
+    Fixed pool of bytearrays that are reused for every chunk.
+
+    Buffers are allocated on first use, so a ring that only ever serves
+    memory-mapped files costs nothing.
+    """
+
+    def __init__(self, count: int, size: int):
+        self.size = size
+        self._count = max(1, count)
+        self._allocated = 0
+        self._free: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bytearray:
+        """Take a free buffer, blocking until one is released."""
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._allocated < self._count:
+                self._allocated += 1
+                return bytearray(self.size)
+        return self._free.get()
+
+    def release(self, buffer: bytearray) -> None:
+        """Return a buffer to the ring."""
+        self._free.put(buffer)
+
+
+class ChunkReader:
+    """
+    Reads a file as a sequence of read-only memoryview chunks.
+
+    Every chunk returned by read_chunk() must be handed back with release()
+    once all consumers are done with it; in readinto mode this frees the
+    ring buffer for the next read, so buffer_count bounds the chunks that
+    can be in flight at once.
+    """
+
+    def __init__(self,
+                 file_path: str,
+                 chunk_size: int,
+                 ring: Optional[BufferRing] = None,
+                 buffer_count: int = 1,
+                 mode: str = READ_MODE_AUTO,
+                 start_offset: int = 0):
+        """
+        Args:
+            file_path: Path to file
+            chunk_size: Maximum number of bytes per chunk
+            ring: Shared buffer ring to read into; a private one of
+                buffer_count buffers is allocated when omitted
+            buffer_count: Number of buffers in the private ring
+            mode: READ_MODE_AUTO, READ_MODE_READINTO or READ_MODE_MMAP
+            start_offset: Byte offset of the first chunk
+        """
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self._buffer_count = buffer_count
+        self._requested_mode = mode
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._map_view: Optional[memoryview] = None
+        self._ring = ring
+        self._offset = start_offset
+        self.mode: Optional[str] = None
+
+    def _choose_mode(self, file_size: int) -> str:
+        if self._requested_mode == READ_MODE_READINTO or file_size == 0:
+            return READ_MODE_READINTO
+        if self._requested_mode == READ_MODE_MMAP:
+            return READ_MODE_MMAP
+        # Auto: only map large regular files, and never on 32-bit builds
+        if file_size >= MMAP_MIN_SIZE and sys.maxsize > 2 ** 32:
+            return READ_MODE_MMAP
+        return READ_MODE_READINTO
+
+    def __enter__(self) -> 'ChunkReader':
+        self._file = open(self.file_path, 'rb', buffering=0)
+        try:
+            st = os.fstat(self._file.fileno())
+            regular = stat.S_ISREG(st.st_mode)
+            self.mode = self._choose_mode(st.st_size if regular else 0)
+
+            if self.mode == READ_MODE_MMAP:
+                try:
+                    self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                    if hasattr(self._mmap, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+                    self._map_view = memoryview(self._mmap)
+                except (OSError, ValueError):
+                    # Special files and some filesystems cannot be mapped
+                    self._mmap = None
+                    self.mode = READ_MODE_READINTO
+
+            if self.mode == READ_MODE_READINTO and self._offset:
+                self._file.seek(self._offset)
+
+            if self.mode == READ_MODE_READINTO and self._ring is None:
+                size = self.chunk_size
+                if regular:
+                    # Do not allocate more than a small file needs
+                    size = min(size, max(st.st_size, 64 * 1024))
+                self._ring = BufferRing(self._buffer_count, size)
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def read_chunk(self) -> Optional[memoryview]:
+        """Return the next chunk, or None at end of file."""
+        if self._map_view is not None:
+            if self._offset >= len(self._map_view):
+                return None
+            view = self._map_view[self._offset:self._offset + self.chunk_size]
+            self._offset += len(view)
+            return view.toreadonly()
+
+        buffer = self._ring.acquire()
+        view = memoryview(buffer)[:self.chunk_size]
+        count = self._file.readinto(view)
+        if not count:
+            view.release()
+            self._ring.release(buffer)
+            return None
+        self._offset += count
+        return view[:count].toreadonly()
+
+    def release(self, chunk: memoryview) -> None:
+        """Hand a chunk back once every consumer has finished with it."""
+        buffer = chunk.obj
+        chunk.release()
+        if self._ring is not None and isinstance(buffer, bytearray):
+            self._ring.release(buffer)
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if self._map_view is not None:
+            self._map_view.release()
+            self._map_view = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # A consumer still holds a chunk; the map closes with it
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
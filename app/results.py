@@ -0,0 +1,228 @@
+"""
+Hash result formatting and the GUI result sink.
+The record formats are shared by the command line and the GUI export; the
+sink streams every result to an export file and hands the view batches that
+keep only a bounded tail.
+"""
+
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import deque
+from typing import Optional
+
+# Export formats and their file extensions
+EXPORT_FORMATS = {'sum': '.txt', 'csv': '.csv', 'jsonl': '.jsonl'}
+
+# Result chunks the view keeps (older ones remain in the export file)
+VIEW_TAIL_RESULTS = 2000
+
+
+def _escape_sum_path(path: str) -> tuple[str, str]:
+    """Return (line prefix, path) escaped the way coreutils *sum tools do."""
+    if '\\' in path or '\n' in path or '\r' in path:
+        return '\\', path.replace('\\', '\\\\').replace('\n', '\\n').replace('\r', '\\r')
+    return '', path
+
+
+def bsd_tag(algorithm: str) -> str:
+    """Return the coreutils tag of an algorithm, e.g. SHA256, CRC32C, SHA3-256."""
+    return re.sub(r'^(SHA|CRC)-', r'\1', algorithm)
+
+
+def format_sum(path: str, results: dict[str, str], tag: bool) -> str:
+    """
+    Format one file in sha256sum style.
+
+    Args:
+        path: File path as given
+        results: Dictionary mapping algorithm name to hash string
+        tag: Use BSD style "SHA256 (path) = digest" lines, one per algorithm
+
+    Returns:
+        Output lines for the file, newline terminated
+    """
+    prefix, escaped = _escape_sum_path(path)
+    if not tag and len(results) == 1:
+        (digest,) = results.values()
+        return f"{prefix}{digest}  {escaped}\n"
+    return ''.join(
+        f"{prefix}{bsd_tag(algo)} ({escaped}) = {digest}\n"
+        for algo, digest in results.items()
+    )
+
+
+def format_sum_error(path: str, error: str) -> str:
+    """
+    Format a file that could not be hashed as a sha256sum-style comment.
+
+    Manifest readers skip '#' lines, so an export with failures still
+    verifies, while the failure stays visible in it.
+    """
+    _, escaped = _escape_sum_path(path)
+    message = ' '.join(error.splitlines())
+    return f"# ERROR {escaped}: {message}\n"
+
+
+def format_jsonl(path: str, results: Optional[dict[str, str]], error: Optional[str]) -> str:
+    """Format one file as a JSON Lines record."""
+    record = {'path': path}
+    if error is not None:
+        record['error'] = error
+    else:
+        record['digests'] = results
+    return json.dumps(record, ensure_ascii=False) + '\n'
+
+
+def _csv_line(values: list[str]) -> str:
+    out = io.StringIO()
+    csv.writer(out, lineterminator='\n').writerow(values)
+    return out.getvalue()
+
+
+def csv_header(algorithms: list[str]) -> str:
+    """Return the CSV header line for format_csv."""
+    return _csv_line(['path', *algorithms, 'error'])
+
+
+def format_csv(path: str, results: Optional[dict[str, str]], error: Optional[str],
+               algorithms: list[str]) -> str:
+    """Format one file as a CSV row with one column per algorithm."""
+    results = results or {}
+    return _csv_line([path, *(results.get(algo, '') for algo in algorithms), error or ''])
+
+
+def duplicates_csv_header() -> str:
+    """Return the CSV header line for format_duplicates."""
+    return _csv_line(['group', 'size', 'path'])
+
+
+def format_duplicates(export_format: str, index: int, size: int, paths: list[str]) -> str:
+    """
+    Format one group of duplicate files.
+
+    Args:
+        export_format: 'sum' (a comment line, then one path per line and a
+            blank line, like fdupes), 'csv' or 'jsonl'
+        index: Group number, starting at 1
+        size: Size of each file
+        paths: Files with identical content
+
+    Returns:
+        Group text, newline terminated
+    """
+    wasted = size * (len(paths) - 1)
+    if export_format == 'jsonl':
+        return json.dumps({'group': index, 'size': size, 'wasted': wasted, 'paths': paths},
+                          ensure_ascii=False) + '\n'
+    if export_format == 'csv':
+        return ''.join(_csv_line([str(index), str(size), path]) for path in paths)
+    return (f"# {len(paths)} files of {size} bytes, {wasted} bytes wasted\n"
+            + ''.join(f"{path}\n" for path in paths) + "\n")
+
+
+def format_record(export_format: str, path: str, results: Optional[dict[str, str]],
+                  error: Optional[str], algorithms: list[str]) -> str:
+    """
+    Format one file in an export format.
+
+    Args:
+        export_format: 'sum', 'csv' or 'jsonl'
+        path: File path
+        results: Dictionary mapping algorithm name to hash string, or None
+        error: Error message, or None
+        algorithms: Algorithms of the batch (the CSV columns)
+
+    Returns:
+        Record text, newline terminated; errors in 'sum' format become a
+        comment line (format_sum_error)
+    """
+    if export_format == 'jsonl':
+        return format_jsonl(path, results, error)
+    if export_format == 'csv':
+        return format_csv(path, results, error, algorithms)
+    if error is not None:
+        return format_sum_error(path, error)
+    return format_sum(path, results, tag=False)
+
+
+class ResultSink:
+    """
+    Thread-safe collector for the results of a batch.
+
+    Every record goes straight to the export file; the text meant for the
+    view is buffered until the UI drains it, and only the newest
+    tail_results chunks are kept, so a backed-up view never holds more
+    than it would show.
+    """
+
+    def __init__(self,
+                 export_format: str = 'sum',
+                 header: str = '',
+                 tail_results: int = VIEW_TAIL_RESULTS):
+        """
+        Args:
+            export_format: Format of the export file (a key of EXPORT_FORMATS)
+            header: Text written at the start of the export file
+            tail_results: Number of result chunks the view keeps
+        """
+        self.export_format = export_format
+        self.tail_results = tail_results
+        self._lock = threading.Lock()
+        self._pending: deque = deque(maxlen=tail_results)
+        self._count = 0
+        fd, self.path = tempfile.mkstemp(prefix='hash-results-',
+                                         suffix=EXPORT_FORMATS[export_format])
+        self._file = os.fdopen(fd, 'w', encoding='utf-8', newline='')
+        self._file.write(header)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def write(self, view_text: str, export_text: str) -> None:
+        """
+        Record one result (any thread).
+
+        Args:
+            view_text: Text shown in the view
+            export_text: Text appended to the export file
+        """
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(export_text)
+            self._pending.append(view_text)
+            self._count += 1
+
+    def drain(self) -> str:
+        """Return the view text recorded since the last call (at most the tail)."""
+        with self._lock:
+            text = ''.join(self._pending)
+            self._pending.clear()
+        return text
+
+    def flush(self) -> None:
+        """Push buffered records to the export file."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def read_export(self) -> str:
+        """Return the export file contents."""
+        self.flush()
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            return f.read()
+
+    def close(self, delete: bool = True) -> None:
+        """Close the export file and delete it unless delete is False."""
+        with self._lock:
+            self._file.close()
+        if delete:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
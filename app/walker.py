@@ -0,0 +1,199 @@
+"""
+Recursive directory walker.
+Finds files below a folder with os.scandir (reusing the DirEntry stat cache)
+and hands them out in batches from a background thread.
+"""
+
+import os
+import fnmatch
+import threading
+import time
+from typing import Callable, Iterator, Optional, Sequence
+
+# Symbolic link policies
+SYMLINKS_SKIP = 'skip'      # Ignore every symbolic link
+SYMLINKS_FILES = 'files'    # Hash links to files, do not descend into linked folders
+SYMLINKS_FOLLOW = 'follow'  # Follow links to files and folders (loops are detected)
+SYMLINK_POLICIES = (SYMLINKS_SKIP, SYMLINKS_FILES, SYMLINKS_FOLLOW)
+
+# Files collected before a batch is delivered
+BATCH_SIZE = 500
+# Seconds after which a partial batch is delivered anyway
+BATCH_INTERVAL = 0.1
+
+
+def _matches(patterns: Sequence[str], name: str, rel_path: str) -> bool:
+    """Return True if the file name or the relative path matches a glob."""
+    return any(
+        fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(rel_path, pattern)
+        for pattern in patterns
+    )
+
+
+def walk_files(root: str,
+               include: Sequence[str] = (),
+               exclude: Sequence[str] = (),
+               symlinks: str = SYMLINKS_FILES,
+               max_depth: Optional[int] = None,
+               check_cancel_callback: Optional[Callable[[], bool]] = None,
+               error_callback: Optional[Callable[[str, OSError], None]] = None) -> Iterator[os.DirEntry]:
+    """
+    Yield the files below root, depth first in sorted order.
+
+    Globs are matched against the entry name and against its path relative
+    to root (with '/' separators). Excluded folders are not descended into.
+
+    Args:
+        root: Folder to walk
+        include: Only yield files matching one of these globs (all if empty)
+        exclude: Skip files and folders matching one of these globs
+        symlinks: One of SYMLINK_POLICIES
+        max_depth: Deepest folder level to enter (0 = only root), None for no limit
+        check_cancel_callback: Function that returns True to stop the walk
+        error_callback: Function called with (path, error) for unreadable folders
+
+    Yields:
+        os.DirEntry objects of regular files; entry.stat() is cached
+    """
+    for _, entry in _walk_entries(root, include, exclude, symlinks, max_depth,
+                                  check_cancel_callback, error_callback):
+        yield entry
+
+
+def _walk_entries(root, include, exclude, symlinks, max_depth,
+                  check_cancel_callback, error_callback) -> Iterator[tuple[str, os.DirEntry]]:
+    """walk_files, yielding (folder path, entry) pairs."""
+    if symlinks not in SYMLINK_POLICIES:
+        raise ValueError(f"Unknown symlink policy: {symlinks}")
+    follow_dirs = symlinks == SYMLINKS_FOLLOW
+    visited = set()
+    if follow_dirs:
+        try:
+            root_stat = os.stat(root)
+            visited.add((root_stat.st_dev, root_stat.st_ino))
+        except OSError:
+            pass
+
+    # Stack of (folder path, path relative to root, depth)
+    stack = [(root, '', 0)]
+    while stack:
+        if check_cancel_callback and check_cancel_callback():
+            return
+        dir_path, rel_dir, depth = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as ex:
+            if error_callback:
+                error_callback(dir_path, ex)
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_link = entry.is_symlink()
+                if is_link and symlinks == SYMLINKS_SKIP:
+                    continue
+                if entry.is_dir(follow_symlinks=follow_dirs):
+                    if max_depth is not None and depth >= max_depth:
+                        continue
+                    if exclude and _matches(exclude, entry.name, rel_path):
+                        continue
+                    if follow_dirs:
+                        # Followed links may point back up the tree
+                        st = entry.stat()
+                        key = (st.st_dev, st.st_ino)
+                        if key in visited:
+                            continue
+                        visited.add(key)
+                    subdirs.append((entry.path, rel_path, depth + 1))
+                elif entry.is_file():
+                    if include and not _matches(include, entry.name, rel_path):
+                        continue
+                    if exclude and _matches(exclude, entry.name, rel_path):
+                        continue
+                    yield dir_path, entry
+            except OSError as ex:
+                if error_callback:
+                    error_callback(entry.path, ex)
+
+        # Reverse so the stack pops folders in sorted order
+        stack.extend(reversed(subdirs))
+
+
+class DirectoryWalker:
+    """
+    Runs walk_files on a background thread and delivers the found files in
+    batches of (folder, name, size) tuples, so the UI can show (and hash)
+    them during the walk. The size is -1 if the file could not be stat'ed.
+    """
+
+    def __init__(self,
+                 root: str,
+                 batch_callback: Callable[[list[tuple[str, str, int]]], None],
+                 done_callback: Callable[[int, list[str]], None],
+                 include: Sequence[str] = (),
+                 exclude: Sequence[str] = (),
+                 symlinks: str = SYMLINKS_FILES,
+                 max_depth: Optional[int] = None):
+        """
+        Args:
+            root: Folder to walk
+            batch_callback: Called on the walker thread with each list of new files
+            done_callback: Called on the walker thread with (files found, error
+                messages) once the walk finished or was cancelled
+            include: See walk_files
+            exclude: See walk_files
+            symlinks: See walk_files
+            max_depth: See walk_files
+        """
+        self.root = root
+        self._batch_callback = batch_callback
+        self._done_callback = done_callback
+        self._options = dict(include=include, exclude=exclude, symlinks=symlinks, max_depth=max_depth)
+        self._cancelled = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start walking in the background."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Stop the walk; done_callback is still called."""
+        self._cancelled = True
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        errors = []
+        found = 0
+        batch = []
+        last_delivery = time.monotonic()
+        try:
+            for folder, entry in _walk_entries(
+                self.root,
+                check_cancel_callback=lambda: self._cancelled,
+                error_callback=lambda path, ex: errors.append(f"{path}: {ex.strerror or ex}"),
+                **self._options
+            ):
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    size = -1
+                batch.append((folder, entry.name, size))
+                now = time.monotonic()
+                if len(batch) >= BATCH_SIZE or now - last_delivery >= BATCH_INTERVAL:
+                    found += len(batch)
+                    self._batch_callback(batch)
+                    batch = []
+                    last_delivery = now
+            if batch and not self._cancelled:
+                found += len(batch)
+                self._batch_callback(batch)
+        except Exception as ex:
+            errors.append(f"{self.root}: {ex}")
+        finally:
+            self._done_callback(found, errors)
@@ -0,0 +1,173 @@
+"""
+Persistent hash worker processes.
+Keeps the C++ executables running in --server mode and reuses them, so
+hashing a short text costs a pipe round trip instead of a process spawn.
+"""
+
+import struct
+import subprocess
+import threading
+from typing import Callable, Optional
+
+# Request header: 8-byte little-endian payload length
+_REQUEST_HEADER = struct.Struct('<Q')
+# Response header: 4-byte little-endian digest length
+_RESPONSE_HEADER = struct.Struct('<I')
+
+
+class WorkerError(RuntimeError):
+    """Raised when a worker process dies or answers with garbage."""
+
+
+class HashWorker:
+    """One long-lived executable running in server mode."""
+
+    def __init__(self, executable_path: str):
+        self.executable_path = executable_path
+        self.cancelled = False
+        self._proc = subprocess.Popen(
+            [executable_path, '--server'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+            creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def _read_exact(self, count: int) -> bytes:
+        data = bytearray()
+        while len(data) < count:
+            chunk = self._proc.stdout.read(count - len(data))
+            if not chunk:
+                raise WorkerError("Worker exited unexpectedly")
+            data += chunk
+        return bytes(data)
+
+    def hash(self, data: bytes) -> str:
+        """Send one request and wait for its digest."""
+        try:
+            self._proc.stdin.write(_REQUEST_HEADER.pack(len(data)))
+            self._proc.stdin.write(data)
+        except (BrokenPipeError, OSError, ValueError) as ex:
+            raise WorkerError(f"Worker exited unexpectedly: {ex}") from ex
+        (length,) = _RESPONSE_HEADER.unpack(self._read_exact(_RESPONSE_HEADER.size))
+        return self._read_exact(length).decode('ascii')
+
+    def terminate(self) -> None:
+        """Stop the worker process."""
+        if self._proc.poll() is None:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+
+
+class HashWorkerPool:
+    """
+    Pool of persistent workers, keyed by executable path.
+
+    Idle workers are reused; a worker that crashes (or is terminated to
+    cancel a request) is discarded and a fresh one is started on demand.
+    """
+
+    def __init__(self, max_idle_per_executable: int = 2):
+        self.max_idle_per_executable = max_idle_per_executable
+        self._idle: dict[str, list[HashWorker]] = {}
+        # Busy workers and the cancel check of the request they are serving
+        self._busy: dict[HashWorker, Optional[Callable[[], bool]]] = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, executable_path: str,
+                 check_cancel_callback: Optional[Callable[[], bool]]) -> HashWorker:
+        with self._lock:
+            idle = self._idle.get(executable_path, [])
+            while idle:
+                worker = idle.pop()
+                if worker.alive:
+                    self._busy[worker] = check_cancel_callback
+                    return worker
+        worker = HashWorker(executable_path)
+        with self._lock:
+            self._busy[worker] = check_cancel_callback
+        return worker
+
+    def _release(self, worker: HashWorker) -> None:
+        with self._lock:
+            self._busy.pop(worker, None)
+            idle = self._idle.setdefault(worker.executable_path, [])
+            if worker.alive and len(idle) < self.max_idle_per_executable:
+                idle.append(worker)
+                return
+        worker.terminate()
+
+    def hash(self, executable_path: str, data: bytes, timeout: Optional[float] = None,
+             check_cancel_callback: Optional[Callable[[], bool]] = None) -> str:
+        """
+        Hash data with a worker for executable_path.
+
+        Args:
+            executable_path: Path to the hash executable
+            data: Bytes to hash
+            timeout: Seconds before the worker is killed and TimeoutError raised
+            check_cancel_callback: Function that returns True once the request is
+                no longer wanted; cancel_requests() then kills its worker
+
+        Returns:
+            Hex digest string
+        """
+        # A worker found dead mid-request is restarted once before giving up
+        for attempt in range(2):
+            worker = self._acquire(executable_path, check_cancel_callback)
+            timed_out = threading.Event()
+            timer = None
+            if timeout is not None:
+                def expire(w=worker):
+                    timed_out.set()
+                    w.terminate()
+                timer = threading.Timer(timeout, expire)
+                timer.daemon = True
+                timer.start()
+            try:
+                return worker.hash(data)
+            except WorkerError:
+                worker.terminate()
+                if timed_out.is_set():
+                    raise TimeoutError(f"Timeout after {timeout}s")
+                if worker.cancelled:
+                    raise WorkerError("Cancelled")
+                if attempt:
+                    raise
+            finally:
+                if timer:
+                    timer.cancel()
+                self._release(worker)
+
+    def cancel_requests(self) -> None:
+        """Kill workers whose in-flight request reports itself cancelled."""
+        with self._lock:
+            busy = [
+                worker for worker, is_cancelled in self._busy.items()
+                if is_cancelled is not None and is_cancelled()
+            ]
+        for worker in busy:
+            worker.cancelled = True
+            worker.terminate()
+
+    def shutdown(self) -> None:
+        """Stop every worker, idle or busy."""
+        with self._lock:
+            workers = list(self._busy)
+            for idle in self._idle.values():
+                workers.extend(idle)
+            self._idle.clear()
+        for worker in workers:
+            worker.terminate()
@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+Hash engine benchmark suite.
+Generates synthetic inputs, runs every configured algorithm through each
+backend path of HashCalculator and writes the timings as JSON, so builds
+can be compared for regressions.
+
+Usage:
+    python benchmarks/bench.py [--quick] [--output results.json]
+    python benchmarks/bench.py --startup-only
+    python benchmarks/bench.py --compare baseline.json --output new.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Optional
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app')
+sys.path.insert(0, APP_DIR)
+
+from config import HashAlgorithm  # noqa: E402
+from hasher import HashCalculator  # noqa: E402
+from native import load_library  # noqa: E402
+
+MB = 1024 * 1024
+
+# Synthetic inputs: name -> (file size, file count)
+INPUTS = {
+    'tiny': (64, 1),
+    '1mb': (MB, 1),
+    '1gb': (1024 * MB, 1),
+    'small-files': (4096, 1000),
+}
+# Text mode keeps the whole input in memory; larger inputs are skipped
+TEXT_MAX_SIZE = 64 * MB
+
+BACKENDS = ('text', 'file', 'subprocess')
+# Chunk size of the adaptive read size (HashCalculator.chunk_size = None)
+CHUNK_AUTO = 'auto'
+DEFAULT_CHUNK_SIZES = (CHUNK_AUTO, 1 * MB, 4 * MB, 16 * MB)
+
+CACHE_WARM = 'warm'
+CACHE_COLD = 'cold'
+
+# Combined single-pass row name
+ALL_ALGORITHMS = 'all'
+
+# Cold start: command line -> interpreter arguments; 'python' is the bare
+# interpreter the CLI's own import cost is measured against
+STARTUP_COMMANDS = {
+    'python': ['-c', 'pass'],
+    'cli': ['-m', 'app', '--help'],
+}
+# Goal for the CLI's import cost on top of the bare interpreter
+STARTUP_BUDGET_MS = 100
+# Modules a CLI start must not load (GUI toolkit, database, event loop)
+STARTUP_FORBIDDEN_MODULES = ('tkinter', 'sqlite3', 'asyncio')
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Percentile q (0-100) of samples, linearly interpolated."""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def drop_page_cache(path: str) -> bool:
+    """
+    Evict a file from the OS page cache.
+
+    Returns:
+        False if the platform has no way to do it without privileges
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+
+def warm_page_cache(path: str) -> None:
+    """Read a file once so the timed runs hit the page cache."""
+    with open(path, 'rb', buffering=0) as f:
+        while f.read(16 * MB):
+            pass
+
+
+def _write_random_file(path: str, size: int, rng: random.Random) -> None:
+    with open(path, 'wb') as f:
+        remaining = size
+        while remaining:
+            block = min(remaining, 16 * MB)
+            f.write(rng.randbytes(block))
+            remaining -= block
+        f.flush()
+        # Written pages must be clean for the cold cache runs to evict them
+        os.fsync(f.fileno())
+
+
+def prepare_input(work_dir: str, name: str, size: int, count: int) -> list[str]:
+    """
+    Create (or reuse) the files of a synthetic input.
+
+    The content is seeded by the input name, so every run hashes the same bytes.
+
+    Returns:
+        Paths of the input files
+    """
+    folder = os.path.join(work_dir, name)
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(name)
+    paths = []
+    for index in range(count):
+        path = os.path.join(folder, f"{index:05d}.bin")
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            _write_random_file(path, size, rng)
+        paths.append(path)
+    return paths
+
+
+def time_runs(run: Callable[[], None], repeat: int,
+              before_each: Optional[Callable[[], None]] = None) -> list[float]:
+    """Time repeat calls of run, calling before_each untimed before each one."""
+    samples = []
+    for _ in range(repeat):
+        if before_each:
+            before_each()
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples: list[float], total_bytes: int) -> dict:
+    """
+    Turn timings into result fields.
+
+    Args:
+        samples: Seconds per timed run (one file, or one pass over the input)
+        total_bytes: Bytes hashed by all samples together
+    """
+    elapsed = sum(samples)
+    return {
+        'samples': len(samples),
+        'bytes': total_bytes,
+        'seconds': elapsed,
+        'mb_per_s': total_bytes / MB / elapsed if elapsed > 0 else None,
+        'latency_ms': {
+            'min': min(samples) * 1000,
+            'p50': percentile(samples, 50) * 1000,
+            'p90': percentile(samples, 90) * 1000,
+            'p99': percentile(samples, 99) * 1000,
+            'max': max(samples) * 1000,
+        },
+    }
+
+
+def _hash_file(calculator: HashCalculator, algorithms: list[str], path: str) -> None:
+    """Run the calculate_file fast path and raise on failure."""
+    errors = []
+    calculator.calculate_file(
+        algorithms, path,
+        lambda progress: None,
+        lambda: False,
+        errors.append,
+        lambda results: None
+    )
+    if errors:
+        raise RuntimeError(errors[0])
+
+
+def _hash_file_subprocess(calculator: HashCalculator, algorithm: str, path: str) -> None:
+    """Run the executable fallback path."""
+    calculator._calculate_file_subprocess(
+        algorithm, path,
+        lambda progress: None,
+        lambda: False,
+        lambda digest: None
+    )
+
+
+def _hash_text(calculator: HashCalculator, algorithms: list[str], text: str) -> None:
+    # Hashing the empty text first drops the prefix checkpoints, so the
+    # timed call hashes everything instead of resuming
+    calculator.calculate_text_sync(algorithms, '')
+    calculator.calculate_text_sync(algorithms, text)
+
+
+def backend_skip_reason(backend: str, algorithm: str) -> Optional[str]:
+    """Return why a backend cannot run an algorithm here, or None."""
+    if backend != 'subprocess':
+        return None
+    algo_config = HashAlgorithm.get_algorithm_config(algorithm)
+    executable = algo_config.get('executable') if algo_config else None
+    if not executable:
+        return "no executable configured"
+    if not os.path.exists(HashCalculator._get_executable_path(executable)):
+        return f"{executable} not built"
+    return None
+
+
+def run_benchmarks(args: argparse.Namespace) -> list[dict]:
+    """Run every selected input/backend/algorithm/chunk size/cache combination."""
+    results = []
+    algorithms = args.algorithms or HashAlgorithm.all()
+    rows = [[algo] for algo in algorithms]
+    if len(algorithms) > 1:
+        rows.append(list(algorithms))
+
+    for input_name in args.inputs:
+        size, count = INPUTS[input_name]
+        if input_name == '1gb':
+            size = args.large_size
+        paths = prepare_input(args.work_dir, input_name, size, count)
+        repeat = args.repeat if count == 1 else 1
+
+        for backend in args.backends:
+            if backend == 'text' and (count > 1 or size > TEXT_MAX_SIZE):
+                continue
+            chunk_sizes = [None] if backend == 'text' else args.chunk_sizes
+            cache_states = [CACHE_WARM] if backend == 'text' else args.cache_states
+
+            for chunk_size in chunk_sizes:
+                # A fresh calculator, so adaptive sizing starts unmeasured
+                calculator = HashCalculator(warmup=False)
+                if chunk_size != CHUNK_AUTO:
+                    calculator.chunk_size = chunk_size
+                try:
+                    text = None
+                    hashed_size = size
+                    if backend == 'text':
+                        with open(paths[0], 'rb') as f:
+                            text = f.read().decode('latin-1')
+                        # Text is hashed as UTF-8, which widens bytes >= 0x80
+                        hashed_size = len(text.encode('utf-8'))
+
+                    for row in rows:
+                        if backend == 'subprocess' and len(row) > 1:
+                            continue  # The executables hash one algorithm each
+                        label = row[0] if len(row) == 1 else ALL_ALGORITHMS
+                        backend_reason = backend_skip_reason(backend, row[0])
+
+                        for cache_state in cache_states:
+                            record = {
+                                'input': input_name,
+                                'files': count,
+                                'file_size': size,
+                                'backend': backend,
+                                'algorithm': label,
+                                'algorithms': row,
+                                'chunk_size': chunk_size,
+                                'cache': cache_state,
+                            }
+                            reason = backend_reason
+                            if cache_state == CACHE_COLD and not hasattr(os, 'posix_fadvise'):
+                                reason = reason or "page cache cannot be dropped on this platform"
+                            if reason:
+                                record['skipped'] = reason
+                                results.append(record)
+                                report_progress(record)
+                                continue
+
+                            if backend == 'text':
+                                def run_one(path=None):
+                                    _hash_text(calculator, row, text)
+                            elif backend == 'file':
+                                def run_one(path):
+                                    _hash_file(calculator, row, path)
+                            else:
+                                def run_one(path):
+                                    _hash_file_subprocess(calculator, row[0], path)
+
+                            def prepare(path):
+                                if cache_state == CACHE_COLD:
+                                    drop_page_cache(path)
+                                else:
+                                    warm_page_cache(path)
+
+                            try:
+                                if count == 1:
+                                    run_one(paths[0])  # Untimed warm-up of the code path
+                                    samples = time_runs(lambda: run_one(paths[0]), repeat,
+                                                        lambda: prepare(paths[0]))
+                                else:
+                                    samples = []
+                                    for path in paths:
+                                        samples += time_runs(lambda: run_one(path), 1,
+                                                             lambda: prepare(path))
+                            except Exception as ex:
+                                record['error'] = str(ex)
+                            else:
+                                record.update(summarize(samples, hashed_size * len(samples)))
+                            results.append(record)
+                            report_progress(record)
+                finally:
+                    calculator.terminate_subprocess()
+    return results
+
+
+def run_startup(repeat: int) -> list[dict]:
+    """
+    Time cold starts of the CLI as wall-clock subprocess runs.
+
+    Each command runs repeat times from the repository root after one
+    untimed run. The 'cli' record gets 'overhead_ms', its median minus the
+    bare interpreter's, checked against STARTUP_BUDGET_MS, and the
+    STARTUP_FORBIDDEN_MODULES the CLI loaded (python -X importtime).
+    """
+    root = os.path.dirname(APP_DIR)
+    results = []
+    for label, arguments in STARTUP_COMMANDS.items():
+        command = [sys.executable, *arguments]
+
+        def run_one():
+            subprocess.run(command, cwd=root, stdout=subprocess.DEVNULL, check=True)
+
+        record = {
+            'input': 'startup',
+            'files': 0,
+            'file_size': 0,
+            'backend': 'process',
+            'algorithm': label,
+            'algorithms': [],
+            'chunk_size': None,
+            'cache': CACHE_WARM,
+        }
+        try:
+            run_one()
+            samples = time_runs(run_one, max(repeat, 5))
+        except (OSError, subprocess.CalledProcessError) as ex:
+            record['error'] = str(ex)
+        else:
+            record.update(summarize(samples, 0))
+        results.append(record)
+
+    python, cli = results
+    if 'latency_ms' in python and 'latency_ms' in cli:
+        overhead = cli['latency_ms']['p50'] - python['latency_ms']['p50']
+        imported = subprocess.run(
+            [sys.executable, '-X', 'importtime', *STARTUP_COMMANDS['cli']],
+            cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+        ).stderr
+        # importtime lines end in "| <indent><module>"
+        loaded = {line.rsplit('|', 1)[-1].strip() for line in imported.splitlines()}
+        cli.update({
+            'overhead_ms': overhead,
+            'budget_ms': STARTUP_BUDGET_MS,
+            'within_budget': overhead < STARTUP_BUDGET_MS,
+            'forbidden_modules': [name for name in STARTUP_FORBIDDEN_MODULES if name in loaded],
+        })
+    for record in results:
+        report_progress(record)
+    return results
+
+
+def _result_key(record: dict) -> tuple:
+    return (record['input'], record['backend'], record['algorithm'],
+            record['chunk_size'], record['cache'])
+
+
+def _format_chunk(chunk_size) -> str:
+    if chunk_size is None:
+        return '-'
+    if chunk_size == CHUNK_AUTO:
+        return chunk_size
+    return f"{chunk_size // MB}M" if chunk_size >= MB else f"{chunk_size // 1024}K"
+
+
+def report_progress(record: dict) -> None:
+    """Print one result line to stderr."""
+    head = (f"{record['input']:<12} {record['backend']:<10} {record['algorithm']:<8} "
+            f"{_format_chunk(record['chunk_size']):>4} {record['cache']:<4}")
+    if 'skipped' in record:
+        line = f"{head}  skipped: {record['skipped']}"
+    elif 'error' in record:
+        line = f"{head}  error: {record['error']}"
+    elif record['input'] == 'startup':
+        latency = record['latency_ms']
+        line = f"{head}  p50 {latency['p50']:9.3f} ms  p99 {latency['p99']:9.3f} ms"
+        if 'overhead_ms' in record:
+            line += f"  +{record['overhead_ms']:.1f} ms over python"
+            if not record['within_budget']:
+                line += f"  OVER {record['budget_ms']} ms BUDGET"
+            if record['forbidden_modules']:
+                line += f"  loads {', '.join(record['forbidden_modules'])}"
+    else:
+        rate = record['mb_per_s']
+        latency = record['latency_ms']
+        line = (f"{head}  {rate if rate is not None else 0:9.1f} MB/s  "
+                f"p50 {latency['p50']:9.3f} ms  p99 {latency['p99']:9.3f} ms")
+    print(line, file=sys.stderr)
+
+
+def git_revision() -> Optional[str]:
+    """Return the current commit of the repository, if git is available."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(APP_DIR),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_info(args: argparse.Namespace) -> dict:
+    """Describe the machine and build the results were taken on."""
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'native_library': load_library() is not None,
+        'repeat': args.repeat,
+        'chunk_sizes': args.chunk_sizes,
+        'cold_cache_supported': hasattr(os, 'posix_fadvise'),
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    """
+    Print throughput changes against a baseline run to stderr.
+
+    Startup records have no throughput; their median latency is compared
+    instead, and a CLI start over its budget counts as a regression too.
+
+    Returns:
+        Number of results slower than the baseline by more than threshold (0-1)
+    """
+    regressions = 0
+    for record in current['results']:
+        if record.get('within_budget') is False or record.get('forbidden_modules'):
+            print(f"startup: CLI imports take {record['overhead_ms']:.1f} ms "
+                  f"(budget {record['budget_ms']} ms), loads "
+                  f"{', '.join(record['forbidden_modules']) or 'no forbidden modules'}  REGRESSION",
+                  file=sys.stderr)
+            regressions += 1
+
+    previous_startup = {
+        _result_key(record): record
+        for record in baseline.get('results', [])
+        if record['input'] == 'startup' and 'latency_ms' in record
+    }
+    for record in current['results']:
+        old = previous_startup.get(_result_key(record))
+        if not old or 'latency_ms' not in record:
+            continue
+        before, after = old['latency_ms']['p50'], record['latency_ms']['p50']
+        change = after / before - 1
+        marker = ''
+        if change > threshold:
+            marker = '  REGRESSION'
+            regressions += 1
+        print(f"startup {record['algorithm']:<8}  {before:9.1f} -> {after:9.1f} ms  "
+              f"{change * 100:+6.1f}%{marker}", file=sys.stderr)
+
+    previous = {
+        _result_key(record): record
+        for record in baseline.get('results', [])
+        if record.get('mb_per_s')
+    }
+    for record in current['results']:
+        old = previous.get(_result_key(record))
+        if not old or not record.get('mb_per_s'):
+            continue
+        change = record['mb_per_s'] / old['mb_per_s'] - 1
+        marker = ''
+        if change < -threshold:
+            marker = '  REGRESSION'
+            regressions += 1
+        print(f"{record['input']:<12} {record['backend']:<10} {record['algorithm']:<8} "
+              f"{_format_chunk(record['chunk_size']):>4} {record['cache']:<4}  "
+              f"{old['mb_per_s']:9.1f} -> {record['mb_per_s']:9.1f} MB/s  "
+              f"{change * 100:+6.1f}%{marker}", file=sys.stderr)
+    return regressions
+
+
+def parse_size(text: str) -> int:
+    """Parse sizes like 65536, 512K, 4M or 1G."""
+    units = {'K': 1024, 'M': MB, 'G': 1024 * MB}
+    text = text.strip().upper()
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def parse_chunk_size(text: str):
+    """Parse a chunk size, or 'auto' for adaptive sizing."""
+    return CHUNK_AUTO if text.strip().lower() == CHUNK_AUTO else parse_size(text)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the hash backends and write the results as JSON."
+    )
+    parser.add_argument('--inputs', nargs='+', choices=list(INPUTS), default=list(INPUTS),
+                        help="synthetic inputs to run (default: all)")
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS),
+                        help="backend paths to run (default: all)")
+    parser.add_argument('-a', '--algorithm', action='append', dest='algorithms', metavar='NAME',
+                        help="algorithm to run, may be repeated (default: all in algorithms.json)")
+    parser.add_argument('--chunk-sizes', nargs='+', type=parse_chunk_size,
+                        default=list(DEFAULT_CHUNK_SIZES), metavar='SIZE',
+                        help="read chunk sizes to sweep for the file backends, 'auto' for "
+                             "adaptive sizing (default: auto 1M 4M 16M)")
+    parser.add_argument('--cache', nargs='+', dest='cache_states', choices=(CACHE_WARM, CACHE_COLD),
+                        default=[CACHE_WARM, CACHE_COLD],
+                        help="page cache states for the file backends (default: both)")
+    parser.add_argument('--large-size', type=parse_size, default=INPUTS['1gb'][0], metavar='SIZE',
+                        help="size of the '1gb' input (default: 1G)")
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help="timed runs per single-file measurement (default: 5)")
+    parser.add_argument('--quick', action='store_true',
+                        help="smoke run: 64M large input, one chunk size, 2 repeats")
+    parser.add_argument('--work-dir', default=os.path.join(tempfile.gettempdir(), 'hash-bench-data'),
+                        help="where the generated inputs are kept between runs")
+    parser.add_argument('--no-startup', dest='startup', action='store_false',
+                        help="skip the CLI cold start measurement")
+    parser.add_argument('--startup-only', action='store_true',
+                        help="only measure the CLI cold start")
+    parser.add_argument('-o', '--output', help="write the results to this JSON file")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="compare throughput with an earlier JSON result file")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="slowdown that counts as a regression with --compare (default: 0.10)")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Run the benchmarks.
+
+    Returns:
+        Process exit status: 1 if --compare found a regression, else 0
+    """
+    args = build_parser().parse_args(argv)
+    if args.quick:
+        args.large_size = min(args.large_size, 64 * MB)
+        args.chunk_sizes = [CHUNK_AUTO]
+        args.repeat = min(args.repeat, 2)
+    unknown = [algo for algo in args.algorithms or [] if algo not in HashAlgorithm.all()]
+    if unknown:
+        print(f"bench: unknown algorithm: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    results = run_startup(args.repeat) if args.startup or args.startup_only else []
+    if not args.startup_only:
+        results += run_benchmarks(args)
+
+    report = {'environment': environment_info(args), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,12 @@ if %errorlevel% neq 0 (
     exit /b %errorlevel%
 )
 
+bin\Sha256.exe --selftest
+if %errorlevel% neq 0 (
+    echo SHA-256 self-test failed
+    exit /b %errorlevel%
+)
+
 g++ -O3 -march=native -o bin/Sha384.exe src/Sha384.cpp  
 if %errorlevel% neq 0 (
     echo Error compiling Sha384.cpp
@@ -28,6 +34,18 @@ if %errorlevel% neq 0 (
     exit /b %errorlevel%
 )
 
+g++ -O3 -march=native -o bin/Crc32c.exe src/Crc32c.cpp
+if %errorlevel% neq 0 (
+    echo Error compiling Crc32c.cpp
+    exit /b %errorlevel%
+)
+
+bin\Crc.exe --selftest && bin\Crc32c.exe --selftest
+if %errorlevel% neq 0 (
+    echo CRC self-test failed
+    exit /b %errorlevel%
+)
+
 g++ -O3 -march=native -o bin/Md5.exe src/Md5.cpp
 if %errorlevel% neq 0 (
     echo Error compiling Md5.cpp
@@ -40,6 +58,12 @@ if %errorlevel% neq 0 (
     exit /b %errorlevel%
 )
 
+g++ -O3 -march=native -shared -o bin/HashCore.dll src/HashCore.cpp
+if %errorlevel% neq 0 (
+    echo Error compiling HashCore.cpp
+    exit /b %errorlevel%
+)
+
 echo.
 echo All executables compiled successfully!
 echo Optimization flags: -O3 -march=native
@@ -0,0 +1,14 @@
+#include <cstdint>
+#include "common.h"
+#include "CrcCore.h"
+
+// 1MB buffer
+const size_t BUFFER_SIZE = 1024 * 1024;
+
+int main(int argc, char* argv[]) {
+    if (argc > 1 && std::string(argv[1]) == "--selftest") {
+        return crc32::selfTest();
+    }
+    return runHashTool<crc32c::Context>(argc, argv, BUFFER_SIZE,
+                                        crc32c::init, crc32c::update, crc32c::finalHex);
+}
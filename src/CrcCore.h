@@ -0,0 +1,317 @@
+#ifndef CRC_CORE_H
+#define CRC_CORE_H
+
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <string>
+#include <vector>
+#include "common.h"
+
+#if defined(__GNUC__) && (defined(__x86_64__) || defined(__i386__))
+    #include <immintrin.h>
+    #define CRC_HAVE_PCLMUL 1
+#endif
+
+namespace crc32 {
+
+// CRC-32 polynomial (IEEE 802.3), reflected
+const uint32_t CRC32_POLYNOMIAL = 0xEDB88320;
+// CRC-32C polynomial (Castagnoli, used by iSCSI, ext4, SCTP), reflected
+const uint32_t CRC32C_POLYNOMIAL = 0x82F63B78;
+
+// Slicing-by-8 lookup tables: table[0] is the classic byte table, table[k]
+// advances a byte through k further zero bytes. Built at compile time.
+struct SliceTables {
+    uint32_t table[8][256];
+};
+
+constexpr SliceTables makeSliceTables(uint32_t polynomial) {
+    SliceTables t{};
+    for (uint32_t i = 0; i < 256; i++) {
+        uint32_t crc = i;
+        for (int j = 0; j < 8; j++) {
+            crc = (crc & 1) ? (crc >> 1) ^ polynomial : crc >> 1;
+        }
+        t.table[0][i] = crc;
+    }
+    for (uint32_t i = 0; i < 256; i++) {
+        for (int k = 1; k < 8; k++) {
+            uint32_t previous = t.table[k - 1][i];
+            t.table[k][i] = (previous >> 8) ^ t.table[0][previous & 0xFF];
+        }
+    }
+    return t;
+}
+
+template <uint32_t Polynomial>
+inline const SliceTables& sliceTables() {
+    static constexpr SliceTables tables = makeSliceTables(Polynomial);
+    return tables;
+}
+
+// Reference kernel: one table lookup per byte
+template <uint32_t Polynomial>
+inline uint32_t updateBytewise(uint32_t crc, const uint8_t* data, size_t len) {
+    const uint32_t (&table)[256] = sliceTables<Polynomial>().table[0];
+    for (size_t i = 0; i < len; ++i) {
+        crc = (crc >> 8) ^ table[(crc ^ data[i]) & 0xFF];
+    }
+    return crc;
+}
+
+// Portable kernel: eight bytes per iteration through eight tables
+template <uint32_t Polynomial>
+inline uint32_t updateSlicing8(uint32_t crc, const uint8_t* data, size_t len) {
+    const uint32_t (&t)[8][256] = sliceTables<Polynomial>().table;
+    while (len >= 8) {
+        uint32_t low = crc ^ ((uint32_t)data[0] | (uint32_t)data[1] << 8 |
+                              (uint32_t)data[2] << 16 | (uint32_t)data[3] << 24);
+        crc = t[7][low & 0xFF] ^ t[6][(low >> 8) & 0xFF] ^
+              t[5][(low >> 16) & 0xFF] ^ t[4][low >> 24] ^
+              t[3][data[4]] ^ t[2][data[5]] ^ t[1][data[6]] ^ t[0][data[7]];
+        data += 8;
+        len -= 8;
+    }
+    return updateBytewise<Polynomial>(crc, data, len);
+}
+
+#ifdef CRC_HAVE_PCLMUL
+// Carry-less multiplication folding constants (Intel, "Fast CRC Computation
+// Using PCLMULQDQ"): x^544, x^480, x^160, x^96 and x^64 mod P, bit-reflected
+// and shifted left by one, then floor(x^64 / P) and P itself, reflected
+struct FoldConstants {
+    uint64_t k1, k2, k3, k4, k5, mu, poly;
+};
+
+template <uint32_t Polynomial>
+FoldConstants foldConstants();
+
+template <>
+inline FoldConstants foldConstants<CRC32_POLYNOMIAL>() {
+    return {0x154442bd4, 0x1c6e41596, 0x1751997d0, 0x0ccaa009e, 0x163cd6124,
+            0x1f7011641, 0x1db710641};
+}
+
+template <>
+inline FoldConstants foldConstants<CRC32C_POLYNOMIAL>() {
+    return {0x0740eef02, 0x09e4addf8, 0x0f20c0dfe, 0x14cd00bd6, 0x0dd45aab8,
+            0x0dea713f1, 0x105ec76f1};
+}
+
+// Bytes the folding kernel needs to be worth it (and its block granularity)
+const size_t PCLMUL_MIN_LENGTH = 64;
+
+// Folds four 128-bit lanes over 64-byte blocks, then reduces to 32 bits
+// with a Barrett reduction. Handles len rounded down to 16 bytes (len >= 64).
+template <uint32_t Polynomial>
+__attribute__((target("pclmul,sse4.1")))
+inline uint32_t foldPclmul(uint32_t crc, const uint8_t* data, size_t len) {
+    const FoldConstants c = foldConstants<Polynomial>();
+    const __m128i k1k2 = _mm_set_epi64x((long long)c.k2, (long long)c.k1);
+    const __m128i k3k4 = _mm_set_epi64x((long long)c.k4, (long long)c.k3);
+    const __m128i k5 = _mm_set_epi64x(0, (long long)c.k5);
+    const __m128i polyMu = _mm_set_epi64x((long long)c.mu, (long long)c.poly);
+    const __m128i low32 = _mm_setr_epi32(~0, 0, ~0, 0);
+
+    __m128i x1 = _mm_loadu_si128((const __m128i*)(data + 0x00));
+    __m128i x2 = _mm_loadu_si128((const __m128i*)(data + 0x10));
+    __m128i x3 = _mm_loadu_si128((const __m128i*)(data + 0x20));
+    __m128i x4 = _mm_loadu_si128((const __m128i*)(data + 0x30));
+    x1 = _mm_xor_si128(x1, _mm_cvtsi32_si128((int)crc));
+    data += 64;
+    len -= 64;
+
+    // Fold 64 bytes at a time into the four lanes
+    while (len >= 64) {
+        __m128i x5 = _mm_clmulepi64_si128(x1, k1k2, 0x00);
+        __m128i x6 = _mm_clmulepi64_si128(x2, k1k2, 0x00);
+        __m128i x7 = _mm_clmulepi64_si128(x3, k1k2, 0x00);
+        __m128i x8 = _mm_clmulepi64_si128(x4, k1k2, 0x00);
+        x1 = _mm_clmulepi64_si128(x1, k1k2, 0x11);
+        x2 = _mm_clmulepi64_si128(x2, k1k2, 0x11);
+        x3 = _mm_clmulepi64_si128(x3, k1k2, 0x11);
+        x4 = _mm_clmulepi64_si128(x4, k1k2, 0x11);
+        x1 = _mm_xor_si128(_mm_xor_si128(x1, x5), _mm_loadu_si128((const __m128i*)(data + 0x00)));
+        x2 = _mm_xor_si128(_mm_xor_si128(x2, x6), _mm_loadu_si128((const __m128i*)(data + 0x10)));
+        x3 = _mm_xor_si128(_mm_xor_si128(x3, x7), _mm_loadu_si128((const __m128i*)(data + 0x20)));
+        x4 = _mm_xor_si128(_mm_xor_si128(x4, x8), _mm_loadu_si128((const __m128i*)(data + 0x30)));
+        data += 64;
+        len -= 64;
+    }
+
+    // Fold the four lanes into one
+    __m128i x5 = _mm_clmulepi64_si128(x1, k3k4, 0x00);
+    x1 = _mm_xor_si128(_mm_xor_si128(_mm_clmulepi64_si128(x1, k3k4, 0x11), x2), x5);
+    x5 = _mm_clmulepi64_si128(x1, k3k4, 0x00);
+    x1 = _mm_xor_si128(_mm_xor_si128(_mm_clmulepi64_si128(x1, k3k4, 0x11), x3), x5);
+    x5 = _mm_clmulepi64_si128(x1, k3k4, 0x00);
+    x1 = _mm_xor_si128(_mm_xor_si128(_mm_clmulepi64_si128(x1, k3k4, 0x11), x4), x5);
+
+    // Fold the remaining 16-byte blocks
+    while (len >= 16) {
+        x5 = _mm_clmulepi64_si128(x1, k3k4, 0x00);
+        x1 = _mm_clmulepi64_si128(x1, k3k4, 0x11);
+        x1 = _mm_xor_si128(_mm_xor_si128(x1, x5), _mm_loadu_si128((const __m128i*)data));
+        data += 16;
+        len -= 16;
+    }
+
+    // 128 -> 64 bits
+    x2 = _mm_clmulepi64_si128(x1, k3k4, 0x10);
+    x1 = _mm_xor_si128(_mm_srli_si128(x1, 8), x2);
+    x2 = _mm_srli_si128(x1, 4);
+    x1 = _mm_and_si128(x1, low32);
+    x1 = _mm_xor_si128(_mm_clmulepi64_si128(x1, k5, 0x00), x2);
+
+    // Barrett reduction to 32 bits
+    x2 = _mm_and_si128(x1, low32);
+    x2 = _mm_clmulepi64_si128(x2, polyMu, 0x10);
+    x2 = _mm_and_si128(x2, low32);
+    x2 = _mm_clmulepi64_si128(x2, polyMu, 0x00);
+    x1 = _mm_xor_si128(x1, x2);
+    return (uint32_t)_mm_extract_epi32(x1, 1);
+}
+
+template <uint32_t Polynomial>
+inline uint32_t updatePclmul(uint32_t crc, const uint8_t* data, size_t len) {
+    if (len >= PCLMUL_MIN_LENGTH) {
+        size_t folded = len & ~(size_t)15;
+        crc = foldPclmul<Polynomial>(crc, data, folded);
+        data += folded;
+        len -= folded;
+    }
+    return updateSlicing8<Polynomial>(crc, data, len);
+}
+
+inline bool cpuHasPclmul() {
+    __builtin_cpu_init();
+    return __builtin_cpu_supports("pclmul") && __builtin_cpu_supports("sse4.1");
+}
+#else
+inline bool cpuHasPclmul() {
+    return false;
+}
+#endif
+
+typedef uint32_t (*Kernel)(uint32_t, const uint8_t*, size_t);
+
+// Fastest kernel this CPU supports, picked once per process
+template <uint32_t Polynomial>
+inline Kernel bestKernel() {
+    static const Kernel kernel =
+#ifdef CRC_HAVE_PCLMUL
+        cpuHasPclmul() ? updatePclmul<Polynomial> :
+#endif
+        updateSlicing8<Polynomial>;
+    return kernel;
+}
+
+// A kernel with the name tests and --selftest report it by
+struct NamedKernel {
+    const char* name;
+    Kernel kernel;
+};
+
+// Every kernel this CPU can run, portable one first
+template <uint32_t Polynomial>
+inline std::vector<NamedKernel> availableKernels() {
+    std::vector<NamedKernel> kernels = {{"slicing-by-8", updateSlicing8<Polynomial>}};
+#ifdef CRC_HAVE_PCLMUL
+    if (cpuHasPclmul()) kernels.push_back({"pclmul", updatePclmul<Polynomial>});
+#endif
+    return kernels;
+}
+
+inline const char* kernelName() {
+    return cpuHasPclmul() ? "pclmul" : "slicing-by-8";
+}
+
+// Streaming state
+struct Context {
+    uint32_t crc;
+};
+
+inline void init(Context& ctx) {
+    ctx.crc = 0xFFFFFFFF; // Initial value
+}
+
+template <uint32_t Polynomial>
+inline void updateWith(Context& ctx, const uint8_t* data, size_t len) {
+    ctx.crc = bestKernel<Polynomial>()(ctx.crc, data, len);
+}
+
+inline void update(Context& ctx, const uint8_t* data, size_t len) {
+    updateWith<CRC32_POLYNOMIAL>(ctx, data, len);
+}
+
+inline std::string finalHex(Context& ctx) {
+    uint32_t crc = ctx.crc ^ 0xFFFFFFFF; // Final XOR
+    return wordsToHex(&crc, 1);
+}
+
+// Known-answer test of one polynomial: the standard check value of
+// "123456789", then every kernel against the bytewise reference over
+// lengths and misalignments that cover each kernel's tail handling
+template <uint32_t Polynomial>
+inline bool selfTestWith(const char* name, uint32_t checkValue) {
+    bool ok = true;
+    const uint8_t* check = (const uint8_t*)"123456789";
+    uint32_t crc = bestKernel<Polynomial>()(0xFFFFFFFF, check, 9) ^ 0xFFFFFFFF;
+    if (crc != checkValue) {
+        std::printf("%s: check value %08x, expected %08x\n", name, crc, checkValue);
+        ok = false;
+    }
+
+    std::vector<uint8_t> data(4096 + 16);
+    uint32_t seed = 0x12345678;
+    for (uint8_t& byte : data) {
+        seed = seed * 1103515245 + 12345;
+        byte = (uint8_t)(seed >> 16);
+    }
+    for (const NamedKernel& candidate : availableKernels<Polynomial>()) {
+        for (size_t offset = 0; offset < 16 && ok; ++offset) {
+            for (size_t len = 0; len <= 4096 && ok; len += (len < 300 ? 1 : 61)) {
+                uint32_t expected = updateBytewise<Polynomial>(0xFFFFFFFF, data.data() + offset, len);
+                uint32_t actual = candidate.kernel(0xFFFFFFFF, data.data() + offset, len);
+                if (actual != expected) {
+                    std::printf("%s: %s kernel wrong for %zu bytes at offset %zu\n",
+                                name, candidate.name, len, offset);
+                    ok = false;
+                }
+            }
+        }
+    }
+    return ok;
+}
+
+// --selftest: run the known-answer tests and report the kernel in use
+inline int selfTest() {
+    bool ok = selfTestWith<CRC32_POLYNOMIAL>("CRC-32", 0xCBF43926);
+    ok = selfTestWith<CRC32C_POLYNOMIAL>("CRC-32C", 0xE3069283) && ok;
+    std::printf("kernel: %s\n%s\n", kernelName(), ok ? "OK" : "FAILED");
+    return ok ? 0 : 1;
+}
+
+} // namespace crc32
+
+// CRC-32C: same register, init and final XOR, different polynomial
+namespace crc32c {
+
+using Context = crc32::Context;
+
+inline void init(Context& ctx) {
+    crc32::init(ctx);
+}
+
+inline void update(Context& ctx, const uint8_t* data, size_t len) {
+    crc32::updateWith<crc32::CRC32C_POLYNOMIAL>(ctx, data, len);
+}
+
+inline std::string finalHex(Context& ctx) {
+    return crc32::finalHex(ctx);
+}
+
+} // namespace crc32c
+
+#endif
@@ -0,0 +1,303 @@
+// Shared library exposing the hash cores to the GUI through ctypes.
+// Build: g++ -O3 -march=native -shared -o bin/HashCore.dll src/HashCore.cpp
+
+#include <cstdint>
+#include <cstring>
+#include <string>
+#include <vector>
+#include "common.h"
+#include "Sha256Core.h"
+#include "Sha256Multi.h"
+#include "Sha512Core.h"
+#include "Sha1Core.h"
+#include "Md5Core.h"
+#include "CrcCore.h"
+
+#ifdef _WIN32
+    #define HASHCORE_API extern "C" __declspec(dllexport)
+#else
+    #define HASHCORE_API extern "C" __attribute__((visibility("default")))
+#endif
+
+// Algorithm identifiers used by every exported function
+enum Algorithm {
+    ALGO_SHA256 = 0,
+    ALGO_SHA384 = 1,
+    ALGO_SHA512 = 2,
+    ALGO_SHA1 = 3,
+    ALGO_MD5 = 4,
+    ALGO_CRC32 = 5,
+    ALGO_CRC32C = 6,
+    ALGO_COUNT
+};
+
+static const char* ALGORITHM_NAMES[ALGO_COUNT] = {
+    "sha256", "sha384", "sha512", "sha1", "md5", "crc32", "crc32c"
+};
+
+// Look up an algorithm by name, returns -1 if unknown
+HASHCORE_API int hc_algorithm_id(const char* name) {
+    for (int i = 0; i < ALGO_COUNT; ++i) {
+        if (std::strcmp(name, ALGORITHM_NAMES[i]) == 0) return i;
+    }
+    return -1;
+}
+
+// Size in bytes of the opaque context the caller must allocate
+HASHCORE_API size_t hc_context_size(int algo) {
+    switch (algo) {
+        case ALGO_SHA256: return sizeof(sha256::Context);
+        case ALGO_SHA384: return sizeof(sha384::Context);
+        case ALGO_SHA512: return sizeof(sha512::Context);
+        case ALGO_SHA1: return sizeof(sha1::Context);
+        case ALGO_MD5: return sizeof(md5::Context);
+        case ALGO_CRC32: return sizeof(crc32::Context);
+        case ALGO_CRC32C: return sizeof(crc32c::Context);
+        default: return 0;
+    }
+}
+
+HASHCORE_API void hc_init(int algo, void* ctx) {
+    switch (algo) {
+        case ALGO_SHA256: sha256::init(*static_cast<sha256::Context*>(ctx)); break;
+        case ALGO_SHA384: sha384::init(*static_cast<sha384::Context*>(ctx)); break;
+        case ALGO_SHA512: sha512::init(*static_cast<sha512::Context*>(ctx)); break;
+        case ALGO_SHA1: sha1::init(*static_cast<sha1::Context*>(ctx)); break;
+        case ALGO_MD5: md5::init(*static_cast<md5::Context*>(ctx)); break;
+        case ALGO_CRC32: crc32::init(*static_cast<crc32::Context*>(ctx)); break;
+        case ALGO_CRC32C: crc32c::init(*static_cast<crc32c::Context*>(ctx)); break;
+    }
+}
+
+HASHCORE_API void hc_update(int algo, void* ctx, const uint8_t* data, size_t len) {
+    switch (algo) {
+        case ALGO_SHA256: sha256::update(*static_cast<sha256::Context*>(ctx), data, len); break;
+        case ALGO_SHA384: sha384::update(*static_cast<sha384::Context*>(ctx), data, len); break;
+        case ALGO_SHA512: sha512::update(*static_cast<sha512::Context*>(ctx), data, len); break;
+        case ALGO_SHA1: sha1::update(*static_cast<sha1::Context*>(ctx), data, len); break;
+        case ALGO_MD5: md5::update(*static_cast<md5::Context*>(ctx), data, len); break;
+        case ALGO_CRC32: crc32::update(*static_cast<crc32::Context*>(ctx), data, len); break;
+        case ALGO_CRC32C: crc32c::update(*static_cast<crc32c::Context*>(ctx), data, len); break;
+    }
+}
+
+// Finalize the context and write the NUL-terminated hex digest to out.
+// Returns the digest length, or 0 if out is too small.
+HASHCORE_API size_t hc_final_hex(int algo, void* ctx, char* out, size_t outSize) {
+    std::string digest;
+    switch (algo) {
+        case ALGO_SHA256: digest = sha256::finalHex(*static_cast<sha256::Context*>(ctx)); break;
+        case ALGO_SHA384: digest = sha384::finalHex(*static_cast<sha384::Context*>(ctx)); break;
+        case ALGO_SHA512: digest = sha512::finalHex(*static_cast<sha512::Context*>(ctx)); break;
+        case ALGO_SHA1: digest = sha1::finalHex(*static_cast<sha1::Context*>(ctx)); break;
+        case ALGO_MD5: digest = md5::finalHex(*static_cast<md5::Context*>(ctx)); break;
+        case ALGO_CRC32: digest = crc32::finalHex(*static_cast<crc32::Context*>(ctx)); break;
+        case ALGO_CRC32C: digest = crc32c::finalHex(*static_cast<crc32c::Context*>(ctx)); break;
+        default: return 0;
+    }
+    if (digest.size() + 1 > outSize) return 0;
+    std::memcpy(out, digest.c_str(), digest.size() + 1);
+    return digest.size();
+}
+
+// Fields of a context that make up its portable state
+struct StateFields {
+    void* words[8];        // Chaining words, in digest order
+    int wordCount;
+    int wordBytes;         // 4 or 8
+    uint8_t* block;        // Pending input, nullptr for CRCs
+    size_t blockSize;
+    size_t* blockLen;
+    uint64_t* totalBytes;  // nullptr for CRCs
+};
+
+template <typename Context, typename Word, int N>
+static StateFields blockFields(Context& ctx, Word (&words)[N]) {
+    StateFields fields = {};
+    for (int i = 0; i < N; ++i) fields.words[i] = &words[i];
+    fields.wordCount = N;
+    fields.wordBytes = sizeof(Word);
+    fields.block = ctx.block;
+    fields.blockSize = sizeof(ctx.block);
+    fields.blockLen = &ctx.blockLen;
+    fields.totalBytes = &ctx.totalBytes;
+    return fields;
+}
+
+static bool stateFields(int algo, void* ctx, StateFields& fields) {
+    switch (algo) {
+        case ALGO_SHA256: {
+            sha256::Context& c = *static_cast<sha256::Context*>(ctx);
+            fields = blockFields(c, c.H);
+            return true;
+        }
+        case ALGO_SHA384:
+        case ALGO_SHA512: {
+            sha512::Context& c = *static_cast<sha512::Context*>(ctx);
+            fields = blockFields(c, c.H);
+            return true;
+        }
+        case ALGO_SHA1: {
+            sha1::Context& c = *static_cast<sha1::Context*>(ctx);
+            fields = blockFields(c, c.h);
+            return true;
+        }
+        case ALGO_MD5: {
+            md5::Context& c = *static_cast<md5::Context*>(ctx);
+            uint32_t unused[4];
+            fields = blockFields(c, unused);
+            fields.words[0] = &c.a0;
+            fields.words[1] = &c.b0;
+            fields.words[2] = &c.c0;
+            fields.words[3] = &c.d0;
+            return true;
+        }
+        case ALGO_CRC32:
+        case ALGO_CRC32C: {
+            crc32::Context& c = *static_cast<crc32::Context*>(ctx);
+            fields = {};
+            fields.words[0] = &c.crc;
+            fields.wordCount = 1;
+            fields.wordBytes = 4;
+            return true;
+        }
+        default:
+            return false;
+    }
+}
+
+static size_t stateSize(const StateFields& fields) {
+    size_t size = (size_t)fields.wordCount * fields.wordBytes;
+    if (fields.totalBytes) size += 8 + *fields.blockLen;
+    return size;
+}
+
+// Serialize a context independently of its memory layout: the chaining
+// words and then, for block hashes, the byte count and the pending input
+// (byte count modulo the block size), all little-endian. Returns the
+// state length, or 0 if out is too small or algo unknown.
+HASHCORE_API size_t hc_state_export(int algo, void* ctx, uint8_t* out, size_t outSize) {
+    StateFields fields;
+    if (!stateFields(algo, ctx, fields) || stateSize(fields) > outSize) return 0;
+    uint8_t* p = out;
+    for (int i = 0; i < fields.wordCount; ++i) {
+        uint64_t word = fields.wordBytes == 4 ? *static_cast<uint32_t*>(fields.words[i])
+                                              : *static_cast<uint64_t*>(fields.words[i]);
+        for (int b = 0; b < fields.wordBytes; ++b) *p++ = (uint8_t)(word >> (8 * b));
+    }
+    if (fields.totalBytes) {
+        for (int b = 0; b < 8; ++b) *p++ = (uint8_t)(*fields.totalBytes >> (8 * b));
+        std::memcpy(p, fields.block, *fields.blockLen);
+        p += *fields.blockLen;
+    }
+    return (size_t)(p - out);
+}
+
+// Load a state written by hc_state_export into ctx. Returns 0, leaving ctx
+// initialized, if the state is not a valid one of algo.
+HASHCORE_API int hc_state_import(int algo, void* ctx, const uint8_t* state, size_t len) {
+    StateFields fields;
+    if (!stateFields(algo, ctx, fields)) return 0;
+    hc_init(algo, ctx);
+    size_t wordsSize = (size_t)fields.wordCount * fields.wordBytes;
+    size_t pending = 0;
+    uint64_t totalBytes = 0;
+    if (fields.totalBytes) {
+        if (len < wordsSize + 8) return 0;
+        for (int b = 0; b < 8; ++b) totalBytes |= (uint64_t)state[wordsSize + b] << (8 * b);
+        pending = (size_t)(totalBytes % fields.blockSize);
+        if (len != wordsSize + 8 + pending) return 0;
+    } else if (len != wordsSize) {
+        return 0;
+    }
+
+    for (int i = 0; i < fields.wordCount; ++i) {
+        uint64_t word = 0;
+        for (int b = 0; b < fields.wordBytes; ++b) {
+            word |= (uint64_t)state[i * fields.wordBytes + b] << (8 * b);
+        }
+        if (fields.wordBytes == 4) {
+            *static_cast<uint32_t*>(fields.words[i]) = (uint32_t)word;
+        } else {
+            *static_cast<uint64_t*>(fields.words[i]) = word;
+        }
+    }
+    if (fields.totalBytes) {
+        *fields.totalBytes = totalBytes;
+        *fields.blockLen = pending;
+        std::memcpy(fields.block, state + wordsSize + 8, pending);
+    }
+    return 1;
+}
+
+// Messages a batch hashes at the same time: SIMD lanes for SHA-256, else 1
+HASHCORE_API int hc_batch_lanes(int algo) {
+    return algo == ALGO_SHA256 ? sha256::laneCount() : 1;
+}
+
+// Hash count independent messages stored back to back in data, message i
+// being lengths[i] bytes long. Writes the NUL-terminated hex digest of
+// message i to out + i * stride; returns the digest length, or 0 if stride
+// is too small or algo unknown.
+HASHCORE_API size_t hc_hash_many(int algo, const uint8_t* data, const size_t* lengths,
+                                 size_t count, char* out, size_t stride) {
+    std::vector<const uint8_t*> messages(count);
+    for (size_t i = 0; i < count; ++i) {
+        messages[i] = data;
+        data += lengths[i];
+    }
+
+    if (algo == ALGO_SHA256) {
+        const size_t digestLen = 64;
+        if (stride < digestLen + 1) return 0;
+        std::vector<sha256::Digest> digests(count);
+        sha256::hashMany(messages.data(), lengths, count, digests.data());
+        for (size_t i = 0; i < count; ++i) {
+            std::string hex = sha256::digestHex(digests[i]);
+            std::memcpy(out + i * stride, hex.c_str(), digestLen + 1);
+        }
+        return digestLen;
+    }
+
+    size_t size = hc_context_size(algo);
+    if (size == 0) return 0;
+    std::vector<uint64_t> context((size + 7) / 8);
+    size_t digestLen = 0;
+    for (size_t i = 0; i < count; ++i) {
+        hc_init(algo, context.data());
+        hc_update(algo, context.data(), messages[i], lengths[i]);
+        digestLen = hc_final_hex(algo, context.data(), out + i * stride, stride);
+        if (digestLen == 0) return 0;
+    }
+    return digestLen;
+}
+
+// CRC kernels this CPU can run: 0 is slicing-by-8, 1 the PCLMULQDQ folding
+// kernel where supported. update() always uses the fastest; these let tests
+// check each one.
+HASHCORE_API int hc_crc_kernel_count() {
+    return (int)crc32::availableKernels<crc32::CRC32_POLYNOMIAL>().size();
+}
+
+HASHCORE_API const char* hc_crc_kernel_name(int kernel) {
+    std::vector<crc32::NamedKernel> kernels = crc32::availableKernels<crc32::CRC32_POLYNOMIAL>();
+    if (kernel < 0 || kernel >= (int)kernels.size()) return nullptr;
+    return kernels[kernel].name;
+}
+
+// One-shot CRC-32 or CRC-32C of data through a given kernel. Writes the
+// final CRC to *out; returns 0 if algo is not a CRC or kernel is unknown.
+HASHCORE_API int hc_crc_with_kernel(int algo, int kernel, const uint8_t* data, size_t len,
+                                    uint32_t* out) {
+    std::vector<crc32::NamedKernel> kernels;
+    if (algo == ALGO_CRC32) {
+        kernels = crc32::availableKernels<crc32::CRC32_POLYNOMIAL>();
+    } else if (algo == ALGO_CRC32C) {
+        kernels = crc32::availableKernels<crc32::CRC32C_POLYNOMIAL>();
+    } else {
+        return 0;
+    }
+    if (kernel < 0 || kernel >= (int)kernels.size()) return 0;
+    *out = kernels[kernel].kernel(0xFFFFFFFF, data, len) ^ 0xFFFFFFFF;
+    return 1;
+}
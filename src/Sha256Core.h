@@ -0,0 +1,117 @@
+#ifndef SHA256_CORE_H
+#define SHA256_CORE_H
+
+#include <cstdint>
+#include <cstring>
+#include <string>
+#include "common.h"
+
+namespace sha256 {
+
+// SHA-256 Circular Rotate Right
+inline uint32_t rightRotate(uint32_t x, uint32_t c) {
+    return (x >> c) | (x << (32 - c));
+}
+
+// SHA-256 Constants
+const uint32_t K[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+};
+
+// Process a single 64-byte block
+__attribute__((always_inline))
+inline void transform(const uint8_t* block, uint32_t H[8]) {
+    uint32_t w[64];
+
+    // Prepare message schedule
+    for (int i = 0; i < 16; ++i) {
+        w[i] = (block[i * 4] << 24) |
+               (block[i * 4 + 1] << 16) |
+               (block[i * 4 + 2] << 8) |
+               (block[i * 4 + 3]);
+    }
+
+    for (int i = 16; i < 64; ++i) {
+        uint32_t s0 = rightRotate(w[i - 15], 7) ^ rightRotate(w[i - 15], 18) ^ (w[i - 15] >> 3);
+        uint32_t s1 = rightRotate(w[i - 2], 17) ^ rightRotate(w[i - 2], 19) ^ (w[i - 2] >> 10);
+        w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+    }
+
+    uint32_t a = H[0];
+    uint32_t b = H[1];
+    uint32_t c = H[2];
+    uint32_t d = H[3];
+    uint32_t e = H[4];
+    uint32_t f = H[5];
+    uint32_t g = H[6];
+    uint32_t h = H[7];
+
+    for (int i = 0; i < 64; ++i) {
+        uint32_t S1 = rightRotate(e, 6) ^ rightRotate(e, 11) ^ rightRotate(e, 25);
+        uint32_t ch = (e & f) ^ (~e & g);
+        uint32_t temp1 = h + S1 + ch + K[i] + w[i];
+        uint32_t S0 = rightRotate(a, 2) ^ rightRotate(a, 13) ^ rightRotate(a, 22);
+        uint32_t maj = (a & b) ^ (a & c) ^ (b & c);
+        uint32_t temp2 = S0 + maj;
+
+        h = g;
+        g = f;
+        f = e;
+        e = d + temp1;
+        d = c;
+        c = b;
+        b = a;
+        a = temp1 + temp2;
+    }
+
+    H[0] += a;
+    H[1] += b;
+    H[2] += c;
+    H[3] += d;
+    H[4] += e;
+    H[5] += f;
+    H[6] += g;
+    H[7] += h;
+}
+
+// Streaming state
+struct Context {
+    uint32_t H[8];
+    uint8_t block[64];
+    size_t blockLen;
+    uint64_t totalBytes;
+};
+
+inline void init(Context& ctx) {
+    // Initial Hash Values
+    const uint32_t initial[8] = {
+        0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+        0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+    };
+    memcpy(ctx.H, initial, sizeof(initial));
+    ctx.blockLen = 0;
+    ctx.totalBytes = 0;
+}
+
+inline void update(Context& ctx, const uint8_t* data, size_t len) {
+    ctx.totalBytes += len;
+    feedBlocks(ctx.block, ctx.blockLen, data, len,
+               [&ctx](const uint8_t* block) { transform(block, ctx.H); });
+}
+
+inline std::string finalHex(Context& ctx) {
+    finishBlocks<8>(ctx.block, ctx.blockLen, ctx.totalBytes, true,
+                 [&ctx](const uint8_t* block) { transform(block, ctx.H); });
+    return wordsToHex(ctx.H, 8);
+}
+
+} // namespace sha256
+
+#endif
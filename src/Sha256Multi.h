@@ -0,0 +1,303 @@
+#ifndef SHA256_MULTI_H
+#define SHA256_MULTI_H
+
+#include <cstdint>
+#include <cstring>
+#include <string>
+#include "common.h"
+#include "Sha256Core.h"
+
+// Multi-buffer SHA-256: one message per SIMD lane, so a batch of small
+// messages is hashed 4 or 8 at a time. SHA-256 has no parallelism inside a
+// message, but the rounds of independent messages line up lane by lane.
+#if defined(__GNUC__)
+    #define SHA256_HAVE_LANES 1
+    #if defined(__x86_64__) || defined(__i386__)
+        #define SHA256_HAVE_AVX2 1
+    #endif
+#endif
+
+namespace sha256 {
+
+// Final state of one message, the words wordsToHex formats
+struct Digest {
+    uint32_t H[8];
+};
+
+// Reference path: one message after the other through transform()
+inline void hashManyScalar(const uint8_t* const* data, const size_t* lengths,
+                           size_t count, Digest* digests) {
+    for (size_t i = 0; i < count; ++i) {
+        Context ctx;
+        init(ctx);
+        update(ctx, data[i], lengths[i]);
+        finishBlocks<8>(ctx.block, ctx.blockLen, ctx.totalBytes, true,
+                        [&ctx](const uint8_t* block) { transform(block, ctx.H); });
+        std::memcpy(digests[i].H, ctx.H, sizeof(ctx.H));
+    }
+}
+
+#ifdef SHA256_HAVE_LANES
+// GCC vector extensions: the same code becomes SSE2/NEON for 4 lanes and,
+// inlined into an AVX2 function, AVX2 for 8 lanes
+typedef uint32_t Lanes4 __attribute__((vector_size(16)));
+typedef uint32_t Lanes8 __attribute__((vector_size(32)));
+
+// Rotate every lane right; a macro so no vector is passed by value, whose
+// ABI differs with and without AVX
+#define SHA256_ROTATE_LANES(x, c) (((x) >> (c)) | ((x) << (32 - (c))))
+
+// Process one 64-byte block in every lane; blocks[lane] is that lane's block
+template <typename V, int N>
+__attribute__((always_inline))
+inline void transformLanes(const uint8_t* const (&blocks)[N], V H[8]) {
+    V w[64];
+
+    // Transpose the big-endian message words into lanes
+    for (int i = 0; i < 16; ++i) {
+        for (int lane = 0; lane < N; ++lane) {
+            const uint8_t* p = blocks[lane] + i * 4;
+            w[i][lane] = ((uint32_t)p[0] << 24) | ((uint32_t)p[1] << 16) |
+                         ((uint32_t)p[2] << 8) | (uint32_t)p[3];
+        }
+    }
+
+    for (int i = 16; i < 64; ++i) {
+        V s0 = SHA256_ROTATE_LANES(w[i - 15], 7) ^ SHA256_ROTATE_LANES(w[i - 15], 18) ^ (w[i - 15] >> 3);
+        V s1 = SHA256_ROTATE_LANES(w[i - 2], 17) ^ SHA256_ROTATE_LANES(w[i - 2], 19) ^ (w[i - 2] >> 10);
+        w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+    }
+
+    V a = H[0], b = H[1], c = H[2], d = H[3];
+    V e = H[4], f = H[5], g = H[6], h = H[7];
+
+    for (int i = 0; i < 64; ++i) {
+        V S1 = SHA256_ROTATE_LANES(e, 6) ^ SHA256_ROTATE_LANES(e, 11) ^ SHA256_ROTATE_LANES(e, 25);
+        V ch = (e & f) ^ (~e & g);
+        V temp1 = h + S1 + ch + K[i] + w[i];
+        V S0 = SHA256_ROTATE_LANES(a, 2) ^ SHA256_ROTATE_LANES(a, 13) ^ SHA256_ROTATE_LANES(a, 22);
+        V maj = (a & b) ^ (a & c) ^ (b & c);
+        V temp2 = S0 + maj;
+
+        h = g;
+        g = f;
+        f = e;
+        e = d + temp1;
+        d = c;
+        c = b;
+        b = a;
+        a = temp1 + temp2;
+    }
+
+    H[0] += a;
+    H[1] += b;
+    H[2] += c;
+    H[3] += d;
+    H[4] += e;
+    H[5] += f;
+    H[6] += g;
+    H[7] += h;
+}
+
+// A message assigned to a lane: its whole blocks are read in place, the
+// padded remainder (one or two blocks) from tail
+struct LaneJob {
+    size_t message;
+    const uint8_t* next;
+    size_t wholeBlocks;
+    uint8_t tail[128];
+    size_t tailBlocks;
+    size_t tailIndex;
+};
+
+inline void startLaneJob(LaneJob& job, size_t message, const uint8_t* data, size_t len) {
+    job.message = message;
+    job.next = data;
+    job.wholeBlocks = len / 64;
+    job.tailBlocks = 0;
+    job.tailIndex = 0;
+
+    uint8_t block[64];
+    size_t blockLen = len % 64;
+    std::memcpy(block, data + len - blockLen, blockLen);
+    finishBlocks<8>(block, blockLen, len, true, [&job](const uint8_t* padded) {
+        std::memcpy(job.tail + 64 * job.tailBlocks++, padded, 64);
+    });
+}
+
+// Hash count messages N at a time; a lane takes the next message as soon as
+// its current one is finished, idle lanes hash a dummy block
+template <typename V, int N>
+__attribute__((always_inline))
+inline void hashManyLanes(const uint8_t* const* data, const size_t* lengths,
+                          size_t count, Digest* digests) {
+    static const uint8_t idleBlock[64] = {};
+    const uint32_t initial[8] = {
+        0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+        0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+    };
+
+    V H[8];
+    LaneJob jobs[N];
+    bool active[N];
+    size_t nextMessage = 0;
+    size_t running = 0;
+
+    for (int lane = 0; lane < N; ++lane) {
+        active[lane] = nextMessage < count;
+        if (active[lane]) {
+            startLaneJob(jobs[lane], nextMessage, data[nextMessage], lengths[nextMessage]);
+            ++nextMessage;
+            ++running;
+        }
+        for (int k = 0; k < 8; ++k) H[k][lane] = initial[k];
+    }
+
+    while (running > 0) {
+        const uint8_t* blocks[N];
+        for (int lane = 0; lane < N; ++lane) {
+            LaneJob& job = jobs[lane];
+            if (!active[lane]) {
+                blocks[lane] = idleBlock;
+            } else if (job.wholeBlocks > 0) {
+                blocks[lane] = job.next;
+                job.next += 64;
+                --job.wholeBlocks;
+            } else {
+                blocks[lane] = job.tail + 64 * job.tailIndex++;
+            }
+        }
+
+        transformLanes<V, N>(blocks, H);
+
+        for (int lane = 0; lane < N; ++lane) {
+            LaneJob& job = jobs[lane];
+            if (!active[lane] || job.wholeBlocks > 0 || job.tailIndex < job.tailBlocks) continue;
+            for (int k = 0; k < 8; ++k) {
+                digests[job.message].H[k] = H[k][lane];
+                H[k][lane] = initial[k];
+            }
+            if (nextMessage < count) {
+                startLaneJob(job, nextMessage, data[nextMessage], lengths[nextMessage]);
+                ++nextMessage;
+            } else {
+                active[lane] = false;
+                --running;
+            }
+        }
+    }
+}
+
+inline void hashManyLanes4(const uint8_t* const* data, const size_t* lengths,
+                           size_t count, Digest* digests) {
+    hashManyLanes<Lanes4, 4>(data, lengths, count, digests);
+}
+
+#ifdef SHA256_HAVE_AVX2
+__attribute__((target("avx2")))
+inline void hashManyLanes8(const uint8_t* const* data, const size_t* lengths,
+                           size_t count, Digest* digests) {
+    hashManyLanes<Lanes8, 8>(data, lengths, count, digests);
+}
+
+inline bool cpuHasAvx2() {
+    __builtin_cpu_init();
+    return __builtin_cpu_supports("avx2");
+}
+#endif
+#endif
+
+typedef void (*ManyKernel)(const uint8_t* const*, const size_t*, size_t, Digest*);
+
+// Widest lane count this CPU supports (1 means the scalar path)
+inline int laneCount() {
+#if defined(SHA256_HAVE_AVX2)
+    static const int lanes = cpuHasAvx2() ? 8 : 4;
+    return lanes;
+#elif defined(SHA256_HAVE_LANES)
+    return 4;
+#else
+    return 1;
+#endif
+}
+
+inline ManyKernel kernelFor(int lanes) {
+#ifdef SHA256_HAVE_LANES
+    #ifdef SHA256_HAVE_AVX2
+    if (lanes >= 8) return hashManyLanes8;
+    #endif
+    if (lanes >= 4) return hashManyLanes4;
+#endif
+    (void)lanes;
+    return hashManyScalar;
+}
+
+// Hash count independent messages into digests[0..count)
+inline void hashMany(const uint8_t* const* data, const size_t* lengths,
+                     size_t count, Digest* digests) {
+    // A single message gains nothing from idle lanes
+    kernelFor(count > 1 ? laneCount() : 1)(data, lengths, count, digests);
+}
+
+inline std::string digestHex(const Digest& digest) {
+    return wordsToHex(digest.H, 8);
+}
+
+// Check every kernel this CPU can run against the scalar path and the
+// FIPS 180-2 examples; prints the widest kernel and returns 0 on success
+inline int selfTest() {
+    const char* known[][2] = {
+        {"", "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"},
+        {"abc", "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"},
+        {"abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq",
+         "248d6a61d20638b8e5c026930c3e6039a33ce45964ff2167f6ecedd419db06c1"},
+    };
+    // Lengths around the one/two padding block boundary and a few blocks long
+    std::vector<uint8_t> pool(4096);
+    uint32_t seed = 12345;
+    for (uint8_t& byte : pool) {
+        seed = seed * 1103515245 + 12345;
+        byte = (uint8_t)(seed >> 16);
+    }
+    std::vector<const uint8_t*> data;
+    std::vector<size_t> lengths;
+    for (const auto& entry : known) {
+        data.push_back((const uint8_t*)entry[0]);
+        lengths.push_back(std::strlen(entry[0]));
+    }
+    for (size_t len = 0; len <= 300; ++len) {
+        data.push_back(pool.data() + len % 7);
+        lengths.push_back(len);
+    }
+    for (size_t len = 1000; len <= 4000; len += 999) {
+        data.push_back(pool.data());
+        lengths.push_back(len);
+    }
+
+    std::vector<Digest> expected(data.size());
+    hashManyScalar(data.data(), lengths.data(), data.size(), expected.data());
+    bool ok = true;
+    for (size_t i = 0; i < 3; ++i) {
+        ok = ok && digestHex(expected[i]) == known[i][1];
+    }
+
+    int widest = laneCount();
+    for (int lanes = 4; lanes <= widest; lanes *= 2) {
+        // Every batch size up to a few lanes full, so lanes go idle at each point
+        for (size_t count = 1; count <= data.size(); count += (count < 24 ? 1 : 97)) {
+            std::vector<Digest> actual(count);
+            kernelFor(lanes)(data.data() + data.size() - count, lengths.data() + data.size() - count,
+                             count, actual.data());
+            for (size_t i = 0; i < count; ++i) {
+                ok = ok && std::memcmp(&actual[i], &expected[data.size() - count + i], sizeof(Digest)) == 0;
+            }
+        }
+    }
+
+    std::printf("lanes: %d\n%s\n", widest, ok ? "OK" : "FAILED");
+    return ok ? 0 : 1;
+}
+
+} // namespace sha256
+
+#endif
@@ -0,0 +1,166 @@
+#ifndef SHA512_CORE_H
+#define SHA512_CORE_H
+
+#include <cstdint>
+#include <cstring>
+#include <string>
+#include "common.h"
+
+namespace sha512 {
+
+// SHA-512 Circular Rotate Right
+inline uint64_t rightRotate(uint64_t x, uint64_t c) {
+    return (x >> c) | (x << (64 - c));
+}
+
+// SHA-512 Constants
+const uint64_t K[80] = {
+    0x428a2f98d728ae22ULL, 0x7137449123ef65cdULL, 0xb5c0fbcfec4d3b2fULL, 0xe9b5dba58189dbbcULL,
+    0x3956c25bf348b538ULL, 0x59f111f1b605d019ULL, 0x923f82a4af194f9bULL, 0xab1c5ed5da6d8118ULL,
+    0xd807aa98a3030242ULL, 0x12835b0145706fbeULL, 0x243185be4ee4b28cULL, 0x550c7dc3d5ffb4e2ULL,
+    0x72be5d74f27b896fULL, 0x80deb1fe3b1696b1ULL, 0x9bdc06a725c71235ULL, 0xc19bf174cf692694ULL,
+    0xe49b69c19ef14ad2ULL, 0xefbe4786384f25e3ULL, 0x0fc19dc68b8cd5b5ULL, 0x240ca1cc77ac9c65ULL,
+    0x2de92c6f592b0275ULL, 0x4a7484aa6ea6e483ULL, 0x5cb0a9dcbd41fbd4ULL, 0x76f988da831153b5ULL,
+    0x983e5152ee66dfabULL, 0xa831c66d2db43210ULL, 0xb00327c898fb213fULL, 0xbf597fc7beef0ee4ULL,
+    0xc6e00bf33da88fc2ULL, 0xd5a79147930aa725ULL, 0x06ca6351e003826fULL, 0x142929670a0e6e70ULL,
+    0x27b70a8546d22ffcULL, 0x2e1b21385c26c926ULL, 0x4d2c6dfc5ac42aedULL, 0x53380d139d95b3dfULL,
+    0x650a73548baf63deULL, 0x766a0abb3c77b2a8ULL, 0x81c2c92e47edaee6ULL, 0x92722c851482353bULL,
+    0xa2bfe8a14cf10364ULL, 0xa81a664bbc423001ULL, 0xc24b8b70d0f89791ULL, 0xc76c51a30654be30ULL,
+    0xd192e819d6ef5218ULL, 0xd69906245565a910ULL, 0xf40e35855771202aULL, 0x106aa07032bbd1b8ULL,
+    0x19a4c116b8d2d0c8ULL, 0x1e376c085141ab53ULL, 0x2748774cdf8eeb99ULL, 0x34b0bcb5e19b48a8ULL,
+    0x391c0cb3c5c95a63ULL, 0x4ed8aa4ae3418acbULL, 0x5b9cca4f7763e373ULL, 0x682e6ff3d6b2b8a3ULL,
+    0x748f82ee5defb2fcULL, 0x78a5636f43172f60ULL, 0x84c87814a1f0ab72ULL, 0x8cc702081a6439ecULL,
+    0x90befffa23631e28ULL, 0xa4506cebde82bde9ULL, 0xbef9a3f7b2c67915ULL, 0xc67178f2e372532bULL,
+    0xca273eceea26619cULL, 0xd186b8c721c0c207ULL, 0xeada7dd6cde0eb1eULL, 0xf57d4f7fee6ed178ULL,
+    0x06f067aa72176fbaULL, 0x0a637dc5a2c898a6ULL, 0x113f9804bef90daeULL, 0x1b710b35131c471bULL,
+    0x28db77f523047d84ULL, 0x32caab7b40c72493ULL, 0x3c9ebe0a15c9bebcULL, 0x431d67c49c100d4cULL,
+    0x4cc5d4becb3e42b6ULL, 0x597f299cfc657e2aULL, 0x5fcb6fab3ad6faecULL, 0x6c44198c4a475817ULL
+};
+
+// Process a single 128-byte block
+void transform(const uint8_t* block, uint64_t H[8]) {
+    uint64_t w[80];
+
+    // Prepare message schedule
+    for (int i = 0; i < 16; ++i) {
+        w[i] = ((uint64_t)block[i * 8] << 56) |
+               ((uint64_t)block[i * 8 + 1] << 48) |
+               ((uint64_t)block[i * 8 + 2] << 40) |
+               ((uint64_t)block[i * 8 + 3] << 32) |
+               ((uint64_t)block[i * 8 + 4] << 24) |
+               ((uint64_t)block[i * 8 + 5] << 16) |
+               ((uint64_t)block[i * 8 + 6] << 8) |
+               ((uint64_t)block[i * 8 + 7]);
+    }
+
+    for (int i = 16; i < 80; ++i) {
+        uint64_t s0 = rightRotate(w[i - 15], 1) ^ rightRotate(w[i - 15], 8) ^ (w[i - 15] >> 7);
+        uint64_t s1 = rightRotate(w[i - 2], 19) ^ rightRotate(w[i - 2], 61) ^ (w[i - 2] >> 6);
+        w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+    }
+
+    uint64_t a = H[0];
+    uint64_t b = H[1];
+    uint64_t c = H[2];
+    uint64_t d = H[3];
+    uint64_t e = H[4];
+    uint64_t f = H[5];
+    uint64_t g = H[6];
+    uint64_t h = H[7];
+
+    for (int i = 0; i < 80; ++i) {
+        uint64_t S1 = rightRotate(e, 14) ^ rightRotate(e, 18) ^ rightRotate(e, 41);
+        uint64_t ch = (e & f) ^ (~e & g);
+        uint64_t temp1 = h + S1 + ch + K[i] + w[i];
+        uint64_t S0 = rightRotate(a, 28) ^ rightRotate(a, 34) ^ rightRotate(a, 39);
+        uint64_t maj = (a & b) ^ (a & c) ^ (b & c);
+        uint64_t temp2 = S0 + maj;
+
+        h = g;
+        g = f;
+        f = e;
+        e = d + temp1;
+        d = c;
+        c = b;
+        b = a;
+        a = temp1 + temp2;
+    }
+
+    H[0] += a;
+    H[1] += b;
+    H[2] += c;
+    H[3] += d;
+    H[4] += e;
+    H[5] += f;
+    H[6] += g;
+    H[7] += h;
+}
+
+// Streaming state (shared by SHA-512 and SHA-384)
+struct Context {
+    uint64_t H[8];
+    uint8_t block[128];
+    size_t blockLen;
+    uint64_t totalBytes;
+};
+
+inline void initWith(Context& ctx, const uint64_t initial[8]) {
+    memcpy(ctx.H, initial, 8 * sizeof(uint64_t));
+    ctx.blockLen = 0;
+    ctx.totalBytes = 0;
+}
+
+inline void init(Context& ctx) {
+    // Initial Hash Values for SHA-512
+    const uint64_t initial[8] = {
+        0x6a09e667f3bcc908ULL, 0xbb67ae8584caa73bULL, 0x3c6ef372fe94f82bULL, 0xa54ff53a5f1d36f1ULL,
+        0x510e527fade682d1ULL, 0x9b05688c2b3e6c1fULL, 0x1f83d9abfb41bd6bULL, 0x5be0cd19137e2179ULL
+    };
+    initWith(ctx, initial);
+}
+
+inline void update(Context& ctx, const uint8_t* data, size_t len) {
+    ctx.totalBytes += len;
+    feedBlocks(ctx.block, ctx.blockLen, data, len,
+               [&ctx](const uint8_t* block) { transform(block, ctx.H); });
+}
+
+// Pad the final block(s) and format the first wordCount state words
+inline std::string finalHexWords(Context& ctx, size_t wordCount) {
+    finishBlocks<16>(ctx.block, ctx.blockLen, ctx.totalBytes, true,
+                 [&ctx](const uint8_t* block) { transform(block, ctx.H); });
+    return wordsToHex(ctx.H, wordCount);
+}
+
+inline std::string finalHex(Context& ctx) {
+    // SHA-512 is all 8 words
+    return finalHexWords(ctx, 8);
+}
+
+} // namespace sha512
+
+namespace sha384 {
+
+using Context = sha512::Context;
+
+inline void init(Context& ctx) {
+    // Initial Hash Values for SHA-384
+    const uint64_t initial[8] = {
+        0xcbbb9d5dc1059ed8ULL, 0x629a292a367cd507ULL, 0x9159015a3070dd17ULL, 0x152fecd8f70e5939ULL,
+        0x67332667ffc00b31ULL, 0x8eb44a8768581511ULL, 0xdb0c2e0d64f98fa7ULL, 0x47b5481dbefa4fa4ULL
+    };
+    sha512::initWith(ctx, initial);
+}
+
+inline void update(Context& ctx, const uint8_t* data, size_t len) {
+    sha512::update(ctx, data, len);
+}
+
+inline std::string finalHex(Context& ctx) {
+    // SHA-384 truncates the output to the first 6 words
+    return sha512::finalHexWords(ctx, 6);
+}
+
+} // namespace sha384
+
+#endif
@@ -3,14 +3,35 @@
 
 #include <iostream>
 #include <string>
+#include <vector>
 #include <cstdio>
+#include <cstdint>
+#include <cstring>
+#include <cerrno>
 
-// Platform-specific includes for binary mode
+// Platform-specific includes for binary mode and direct file reads
 #ifdef _WIN32
     #include <io.h>
     #include <fcntl.h>
+    #ifndef NOMINMAX
+        #define NOMINMAX
+    #endif
+    #ifndef WIN32_LEAN_AND_MEAN
+        #define WIN32_LEAN_AND_MEAN
+    #endif
+    #include <windows.h>
+    #include <shellapi.h>
+    #ifdef _MSC_VER
+        #pragma comment(lib, "shell32.lib")
+    #endif
+#else
+    #include <fcntl.h>
+    #include <unistd.h>
 #endif
 
+// Read size of --file mode (reads go straight into the hash buffer)
+const size_t FILE_READ_SIZE = 8 * 1024 * 1024;
+
 // Initialize stdin to binary mode to prevent corruption of binary data
 inline void initBinaryMode() {
     #ifdef _WIN32
@@ -18,6 +39,13 @@ inline void initBinaryMode() {
     #endif
 }
 
+// Initialize stdout to binary mode (server responses carry raw length headers)
+inline void initBinaryOutput() {
+    #ifdef _WIN32
+        _setmode(_fileno(stdout), _O_BINARY);
+    #endif
+}
+
 // Read all input from stdin
 inline std::string readStdinToString() {
     return std::string((std::istreambuf_iterator<char>(std::cin)), std::istreambuf_iterator<char>());
@@ -37,4 +65,284 @@ inline void reportProgress(size_t bytesProcessed, size_t totalBytes) {
     }
 }
 
+// Feed bytes into a block-based hash, transforming every complete block.
+// Partial trailing bytes are kept in block/blockLen for the next call.
+template <size_t BlockSize, typename TransformFn>
+inline void feedBlocks(uint8_t (&block)[BlockSize], size_t& blockLen,
+                       const uint8_t* data, size_t len, TransformFn transformBlock) {
+    if (blockLen > 0) {
+        size_t take = BlockSize - blockLen;
+        if (take > len) take = len;
+        std::memcpy(block + blockLen, data, take);
+        blockLen += take;
+        data += take;
+        len -= take;
+        if (blockLen < BlockSize) return;
+        transformBlock(block);
+        blockLen = 0;
+    }
+    while (len >= BlockSize) {
+        transformBlock(data);
+        data += BlockSize;
+        len -= BlockSize;
+    }
+    if (len > 0) {
+        std::memcpy(block, data, len);
+        blockLen = len;
+    }
+}
+
+// Merkle-Damgard padding: 0x80, zeros, then the message length in bits in
+// the last LengthBytes bytes of the final block (8 for MD5/SHA-1/SHA-256,
+// 16 for SHA-384/512). Only the low 64 bits of the length are ever non-zero.
+template <size_t LengthBytes, size_t BlockSize, typename TransformFn>
+inline void finishBlocks(uint8_t (&block)[BlockSize], size_t blockLen,
+                         uint64_t totalBytes, bool bigEndianLength, TransformFn transformBlock) {
+    block[blockLen++] = 0x80;
+    if (blockLen > BlockSize - LengthBytes) {
+        std::memset(block + blockLen, 0, BlockSize - blockLen);
+        transformBlock(block);
+        blockLen = 0;
+    }
+    std::memset(block + blockLen, 0, BlockSize - blockLen);
+
+    uint64_t totalBits = totalBytes * 8;
+    for (int i = 0; i < 8; ++i) {
+        int shift = bigEndianLength ? (7 - i) * 8 : i * 8;
+        block[BlockSize - 8 + i] = (totalBits >> shift) & 0xFF;
+    }
+    transformBlock(block);
+}
+
+// Format words as concatenated zero-padded hex (most significant digit first)
+template <typename T>
+inline std::string wordsToHex(const T* words, size_t count) {
+    static const char digits[] = "0123456789abcdef";
+    std::string out;
+    out.reserve(count * sizeof(T) * 2);
+    for (size_t i = 0; i < count; ++i) {
+        for (int shift = sizeof(T) * 8 - 4; shift >= 0; shift -= 4) {
+            out += digits[(words[i] >> shift) & 0xF];
+        }
+    }
+    return out;
+}
+
+// Parse the optional total-size argument used for progress reporting
+inline size_t parseExpectedSize(int argc, char* argv[]) {
+    if (argc > 1) {
+        try {
+            return std::stoull(argv[1]);
+        } catch (...) {
+            return 0;
+        }
+    }
+    return 0;
+}
+
+// Stream stdin through a hash and print the hex digest
+template <typename Context>
+int runStreamMode(size_t totalExpectedSize, size_t bufferSize,
+                  void (*init)(Context&),
+                  void (*update)(Context&, const uint8_t*, size_t),
+                  std::string (*finalHex)(Context&)) {
+    Context ctx;
+    init(ctx);
+
+    std::vector<uint8_t> buffer(bufferSize);
+    uint64_t totalBytes = 0;
+
+    // Report initial progress
+    if (totalExpectedSize > 0) reportProgress(0, totalExpectedSize);
+
+    while (std::cin) {
+        std::cin.read((char*)buffer.data(), bufferSize);
+        size_t bytesRead = std::cin.gcount();
+        if (bytesRead == 0) break;
+
+        update(ctx, buffer.data(), bytesRead);
+        totalBytes += bytesRead;
+
+        // Report progress
+        if (totalExpectedSize > 0) {
+            reportProgress(totalBytes, totalExpectedSize);
+        }
+    }
+
+    std::cout << finalHex(ctx);
+    std::cout.flush();
+    std::cout << std::endl;
+    return 0;
+}
+
+// Persistent server mode: hash any number of requests over stdin/stdout.
+//   Request:  8-byte little-endian payload length, then the payload
+//   Response: 4-byte little-endian digest length, then the hex digest
+// The server exits cleanly when stdin is closed.
+template <typename Context>
+int runServerMode(size_t bufferSize,
+                  void (*init)(Context&),
+                  void (*update)(Context&, const uint8_t*, size_t),
+                  std::string (*finalHex)(Context&)) {
+    initBinaryOutput();
+    std::vector<uint8_t> buffer(bufferSize);
+
+    while (true) {
+        uint8_t header[8];
+        if (!std::cin.read((char*)header, sizeof(header))) break;
+
+        uint64_t remaining = 0;
+        for (int i = 7; i >= 0; --i) {
+            remaining = (remaining << 8) | header[i];
+        }
+
+        Context ctx;
+        init(ctx);
+        while (remaining > 0) {
+            size_t want = remaining < bufferSize ? (size_t)remaining : bufferSize;
+            std::cin.read((char*)buffer.data(), want);
+            size_t got = std::cin.gcount();
+            if (got == 0) return 1;  // Truncated request
+            update(ctx, buffer.data(), got);
+            remaining -= got;
+        }
+
+        std::string digest = finalHex(ctx);
+        uint32_t length = (uint32_t)digest.size();
+        uint8_t lengthBytes[4] = {
+            (uint8_t)(length & 0xFF), (uint8_t)((length >> 8) & 0xFF),
+            (uint8_t)((length >> 16) & 0xFF), (uint8_t)((length >> 24) & 0xFF)
+        };
+        std::cout.write((const char*)lengthBytes, sizeof(lengthBytes));
+        std::cout.write(digest.data(), digest.size());
+        std::cout.flush();
+    }
+    return 0;
+}
+
+// Unbuffered file access for --file mode
+#ifdef _WIN32
+// Open the path given as command line argument index. argv[] is converted
+// to the ANSI code page, which cannot spell every file name, so the path
+// is taken from the UTF-16 command line and opened with _wopen.
+inline int openArgumentForReading(int index, const char* narrowPath) {
+    // _O_SEQUENTIAL asks Windows for sequential read-ahead
+    const int flags = _O_RDONLY | _O_BINARY | _O_SEQUENTIAL;
+    int count = 0;
+    wchar_t** wideArgv = CommandLineToArgvW(GetCommandLineW(), &count);
+    int fd = wideArgv != nullptr && index < count ? _wopen(wideArgv[index], flags)
+                                                 : _open(narrowPath, flags);
+    LocalFree(wideArgv);
+    return fd;
+}
+inline int64_t seekFile(int fd, int64_t offset, int whence) { return _lseeki64(fd, offset, whence); }
+inline int64_t readFile(int fd, uint8_t* buffer, size_t count) { return _read(fd, buffer, (unsigned int)count); }
+inline void closeFile(int fd) { _close(fd); }
+#else
+// File names are bytes on POSIX, argv holds them unchanged
+inline int openArgumentForReading(int, const char* narrowPath) { return open(narrowPath, O_RDONLY); }
+inline int64_t seekFile(int fd, int64_t offset, int whence) { return lseek(fd, offset, whence); }
+inline int64_t readFile(int fd, uint8_t* buffer, size_t count) { return read(fd, buffer, count); }
+inline void closeFile(int fd) { close(fd); }
+#endif
+
+// Hash a file by path, optionally only length bytes from offset (length < 0:
+// to the end), and print the hex digest. The tool reads the file itself
+// with large unbuffered reads, so nothing passes through a pipe; progress
+// is reported on stderr and errors as "ERROR: ..." with exit status 2.
+// pathIndex is the path's position in argv (see openArgumentForReading).
+template <typename Context>
+int runFileMode(int pathIndex, const char* path, int64_t offset, int64_t length,
+                void (*init)(Context&),
+                void (*update)(Context&, const uint8_t*, size_t),
+                std::string (*finalHex)(Context&)) {
+    int fd = openArgumentForReading(pathIndex, path);
+    if (fd < 0) {
+        std::fprintf(stderr, "ERROR: cannot open %s: %s\n", path, std::strerror(errno));
+        return 2;
+    }
+
+    int64_t fileSize = seekFile(fd, 0, SEEK_END);
+    if (fileSize < 0 || seekFile(fd, offset < fileSize ? offset : fileSize, SEEK_SET) < 0) {
+        std::fprintf(stderr, "ERROR: cannot seek in %s: %s\n", path, std::strerror(errno));
+        closeFile(fd);
+        return 2;
+    }
+    if (offset > fileSize) {
+        std::fprintf(stderr, "ERROR: offset beyond the end of %s\n", path);
+        closeFile(fd);
+        return 2;
+    }
+    if (length < 0 || length > fileSize - offset) {
+        length = fileSize - offset;
+    }
+#if defined(POSIX_FADV_SEQUENTIAL)
+    posix_fadvise(fd, offset, length, POSIX_FADV_SEQUENTIAL);
+#endif
+
+    Context ctx;
+    init(ctx);
+    std::vector<uint8_t> buffer(FILE_READ_SIZE);
+    uint64_t total = (uint64_t)length;
+    uint64_t done = 0;
+    reportProgress(0, total);
+
+    while (done < total) {
+        uint64_t want = total - done < FILE_READ_SIZE ? total - done : FILE_READ_SIZE;
+        int64_t got = readFile(fd, buffer.data(), (size_t)want);
+        if (got < 0 && errno == EINTR) continue;
+        if (got <= 0) {
+            std::fprintf(stderr, "ERROR: cannot read %s: %s\n", path,
+                         got < 0 ? std::strerror(errno) : "file shrank while reading");
+            closeFile(fd);
+            return 2;
+        }
+        update(ctx, buffer.data(), (size_t)got);
+        done += (uint64_t)got;
+        reportProgress(done, total);
+    }
+    closeFile(fd);
+
+    std::cout << finalHex(ctx) << std::endl;
+    return 0;
+}
+
+// Parse a non-negative integer argument, or return -1
+inline int64_t parseOffset(const char* text) {
+    try {
+        return (int64_t)std::stoull(text);
+    } catch (...) {
+        return -1;
+    }
+}
+
+// Common entry point:
+//   --server                      persistent server mode
+//   --file PATH [OFFSET LENGTH]   hash a file (range) read by the tool itself
+//   [SIZE]                        hash stdin once, SIZE enables progress reports
+template <typename Context>
+int runHashTool(int argc, char* argv[], size_t bufferSize,
+                void (*init)(Context&),
+                void (*update)(Context&, const uint8_t*, size_t),
+                std::string (*finalHex)(Context&)) {
+    initBinaryMode();
+    if (argc > 1 && std::string(argv[1]) == "--server") {
+        return runServerMode(bufferSize, init, update, finalHex);
+    }
+    if (argc > 1 && std::string(argv[1]) == "--file") {
+        if (argc != 3 && argc != 5) {
+            std::fprintf(stderr, "ERROR: usage: %s --file PATH [OFFSET LENGTH]\n", argv[0]);
+            return 2;
+        }
+        int64_t offset = argc == 5 ? parseOffset(argv[3]) : 0;
+        int64_t length = argc == 5 ? parseOffset(argv[4]) : -1;
+        if (offset < 0 || (argc == 5 && length < 0)) {
+            std::fprintf(stderr, "ERROR: invalid range\n");
+            return 2;
+        }
+        return runFileMode(2, argv[2], offset, length, init, update, finalHex);
+    }
+    return runStreamMode(parseExpectedSize(argc, argv), bufferSize, init, update, finalHex);
+}
+
 #endif
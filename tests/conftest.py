@@ -0,0 +1,24 @@
+"""
+Shared pytest setup.
+The app modules import each other by bare name (they run from app/), so
+the tests put that directory on sys.path the same way.
+"""
+
+import os
+import sys
+
+import pytest
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app')
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+
+@pytest.fixture(scope='session')
+def native_library():
+    """The HashCore library from bin/, or skip when it has not been built."""
+    import native
+    library = native.load_library()
+    if library is None:
+        pytest.skip(f"{native.LIBRARY_NAME} has not been built (see build.bat)")
+    return library
@@ -0,0 +1,61 @@
+"""
+Tests of HashCalculator.calculate_files progress accounting.
+"""
+
+import hashlib
+
+from hasher import HashCalculator
+
+
+def run(paths, **options):
+    hasher = HashCalculator(warmup=False)
+    results, consumed = [], []
+    hasher.calculate_files(['SHA-256'], paths, lambda done: None, lambda: False,
+                           lambda path, res, error: results.append((path, res, error)),
+                           bytes_callback=consumed.append, **options)
+    return results, sum(consumed)
+
+
+def test_directory_counts_no_bytes(tmp_path):
+    data = b'x' * 5000
+    sample = tmp_path / 'sample.bin'
+    sample.write_bytes(data)
+    folder = tmp_path / 'folder'
+    folder.mkdir()
+
+    results, consumed = run([str(folder), str(sample)], max_workers=2)
+
+    assert results[0][0] == str(folder) and results[0][2] is not None
+    assert results[1] == (str(sample), {'SHA-256': hashlib.sha256(data).hexdigest()}, None)
+    # Only the real file's bytes reach the progress total
+    assert consumed == len(data)
+
+
+def test_read_buffers_fit_the_reservation(tmp_path):
+    paths = []
+    for size in (0, 10, 3 * 1024 * 1024 + 1):
+        path = tmp_path / f'{size}.bin'
+        path.write_bytes(b'y' * size)
+        paths.append(str(path))
+    hasher = HashCalculator(warmup=False)
+    reserved, rings = [], []
+    read_buffer_bytes, get_buffer_ring = hasher._read_buffer_bytes, hasher._get_buffer_ring
+
+    def record_reservation(algorithms, file_size):
+        reserved.append(read_buffer_bytes(algorithms, file_size))
+        return reserved[-1]
+
+    def record_ring(count, size):
+        rings.append(count * size)
+        return get_buffer_ring(count, size)
+
+    hasher._read_buffer_bytes = record_reservation
+    hasher._get_buffer_ring = record_ring
+    results = []
+    hasher.calculate_files(['SHA-256', 'MD5'], paths, lambda done: None, lambda: False,
+                           lambda path, res, error: results.append(error), max_workers=2)
+
+    assert results == [None] * len(paths)
+    # Small files are read whole; the large one through a one-buffer ring
+    assert reserved[:2] == [1, 10]
+    assert rings and max(rings) <= reserved[2]
@@ -0,0 +1,37 @@
+"""
+Tests of the command line interface's Ctrl+C handling.
+"""
+
+import signal
+
+import cli
+
+
+def test_rejected_arguments_keep_the_sigint_handler(capsys):
+    before = signal.getsignal(signal.SIGINT)
+
+    assert cli.main(['--duplicates']) == 2
+    assert signal.getsignal(signal.SIGINT) is before
+    assert 'not stdin' in capsys.readouterr().err
+
+
+def test_interrupt_during_check_cancels_the_workers(tmp_path, monkeypatch):
+    sample = tmp_path / 'sample.txt'
+    sample.write_bytes(b'abc')
+    manifest = tmp_path / 'SHA256SUMS'
+    manifest.write_text(f'{"0" * 64}  {sample}\n')
+    before = signal.getsignal(signal.SIGINT)
+    cancelled = []
+
+    def interrupted(self, entries, check_cancel_callback, result_callback, **options):
+        handler = signal.getsignal(signal.SIGINT)
+        try:
+            handler(signal.SIGINT, None)
+        finally:
+            cancelled.append(check_cancel_callback())
+
+    monkeypatch.setattr(cli.HashCalculator, 'verify_manifest', interrupted)
+
+    assert cli.main(['--check', str(manifest)]) == 130
+    assert cancelled == [True]
+    assert signal.getsignal(signal.SIGINT) is before
@@ -0,0 +1,52 @@
+"""
+The command line interface must start without the GUI toolkit, the
+database or the asyncio event loop; each costs tens of milliseconds of
+import time. Timing itself is tracked by benchmarks/bench.py (startup).
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from conftest import APP_DIR
+
+FORBIDDEN_MODULES = ('tkinter', '_tkinter', 'sqlite3', '_sqlite3', 'asyncio')
+
+# Runs the CLI in a fresh interpreter and reports what it loaded
+PROBE = """
+import json, sys
+sys.path.insert(0, sys.argv[1])
+import cli
+try:
+    status = cli.main(sys.argv[2:])
+except SystemExit as ex:
+    status = ex.code
+sys.stdout = sys.__stdout__
+print(json.dumps({'status': status, 'modules': sorted(sys.modules)}))
+"""
+
+
+def loaded_modules(*argv: str) -> set[str]:
+    completed = subprocess.run(
+        [sys.executable, '-c', PROBE, APP_DIR, *argv],
+        capture_output=True, text=True, check=True
+    )
+    report = json.loads(completed.stdout.splitlines()[-1])
+    assert report['status'] in (0, None), completed.stderr
+    return set(report['modules'])
+
+
+@pytest.mark.parametrize('argv', [
+    ['--help'],
+    ['--list-algorithms'],
+    ['-a', 'SHA-256', '-a', 'CRC-32', '{file}'],
+    ['--duplicates', '{dir}'],
+])
+def test_cli_does_not_load_heavy_modules(tmp_path, argv):
+    sample = tmp_path / 'sample.bin'
+    sample.write_bytes(b'hash me' * 1000)
+    argv = [arg.format(file=sample, dir=tmp_path) for arg in argv]
+    loaded = loaded_modules(*argv)
+    assert not loaded.intersection(FORBIDDEN_MODULES)
@@ -0,0 +1,68 @@
+"""
+Tests of the staged duplicate search (HashCalculator.find_duplicates).
+"""
+
+import os
+
+import pytest
+
+from dedupe import PARTIAL_HASH_SIZE
+from hasher import HashCalculator
+
+
+def write(path, data: bytes) -> str:
+    with open(path, 'wb') as f:
+        f.write(data)
+    return str(path)
+
+
+def find(entries):
+    hasher = HashCalculator(warmup=False)
+    return hasher.find_duplicates([(path, -1) for path in entries], lambda: False)
+
+
+def test_groups_and_bytes_read(tmp_path):
+    small = os.urandom(2 * PARTIAL_HASH_SIZE)       # settled by the partial stage
+    large = os.urandom(10 * PARTIAL_HASH_SIZE + 1)  # needs the full stage
+    paths = [write(tmp_path / f'small{i}', small) for i in range(3)]
+    paths += [write(tmp_path / f'large{i}', large) for i in range(2)]
+    paths.append(write(tmp_path / 'unique', os.urandom(100)))
+
+    summary = find(paths)
+
+    assert [group.paths for group in summary['groups']] == [paths[3:5], paths[:3]]
+    assert summary['duplicates'] == 3
+    assert summary['wasted'] == len(large) + 2 * len(small)
+    # Every byte of the five candidates is counted once, the unique file never read
+    assert summary['bytes_read'] == 3 * len(small) + 2 * len(large)
+    assert summary['total_bytes'] == summary['bytes_read'] + 100
+
+
+def test_same_ends_different_middle(tmp_path):
+    data = bytearray(os.urandom(4 * PARTIAL_HASH_SIZE))
+    first = write(tmp_path / 'a', bytes(data))
+    data[len(data) // 2] ^= 1
+    second = write(tmp_path / 'b', bytes(data))
+
+    summary = find([first, second])
+
+    assert summary['groups'] == []
+    assert summary['bytes_read'] == 2 * len(data) <= summary['total_bytes']
+
+
+def test_hard_links_and_empty_files_skipped(tmp_path):
+    data = os.urandom(3 * PARTIAL_HASH_SIZE)
+    original = write(tmp_path / 'original', data)
+    link = str(tmp_path / 'link')
+    try:
+        os.link(original, link)
+    except OSError:
+        pytest.skip("file system without hard links")
+    empties = [write(tmp_path / f'empty{i}', b'') for i in range(2)]
+
+    summary = find([original, link] + empties)
+
+    # The link is the same file: nothing is read and nothing is wasted
+    assert summary['groups'] == []
+    assert summary['bytes_read'] == 0
+    assert summary['errors'] == 0
@@ -0,0 +1,114 @@
+"""
+Known-answer tests of the native CRC kernels.
+Every kernel the CPU can run (slicing-by-8, and PCLMULQDQ folding where
+supported) is called directly through the library, so a kernel that
+update() does not dispatch to on this machine is still checked. CRC-32 is
+compared with zlib.crc32, CRC-32C with a bytewise reference.
+"""
+
+import random
+import zlib
+
+import pytest
+
+# Lengths around the 16-byte fold width and the 64-byte fold block
+EDGE_LENGTHS = [0, 1, 15, 16, 17, 63, 64, 65]
+# Large enough for the folding kernel's main loop and its tail
+MULTI_MB_LENGTH = 3 * 1024 * 1024 + 7
+
+
+def _crc32c_table() -> list[int]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ (0x82F63B78 if crc & 1 else 0)
+        table.append(crc)
+    return table
+
+
+_CRC32C_TABLE = _crc32c_table()
+
+
+def crc32c_reference(data: bytes) -> int:
+    """Bytewise CRC-32C (Castagnoli), the definition the kernels must match."""
+    crc = 0xFFFFFFFF
+    table = _CRC32C_TABLE
+    for byte in data:
+        crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+
+REFERENCES = {'crc32': zlib.crc32, 'crc32c': crc32c_reference}
+
+
+@pytest.fixture(scope='module')
+def library(native_library):
+    if not native_library.has_crc_kernels:
+        pytest.skip("native library predates the per-kernel CRC entry points")
+    return native_library
+
+
+@pytest.fixture(scope='module')
+def data():
+    return random.Random(22).randbytes(MULTI_MB_LENGTH + 16)
+
+
+def kernel_ids(library) -> list[int]:
+    return list(range(len(library.crc_kernels())))
+
+
+def test_slicing_kernel_always_present(library):
+    assert library.crc_kernels()[0] == 'slicing-by-8'
+
+
+@pytest.mark.parametrize('name, message, expected', [
+    ('crc32', b'123456789', 0xCBF43926),
+    ('crc32c', b'123456789', 0xE3069283),
+    # RFC 3720 (iSCSI) examples
+    ('crc32c', bytes(32), 0x8A9136AA),
+    ('crc32c', b'\xff' * 32, 0x62A8AB43),
+    ('crc32c', bytes(range(32)), 0x46DD794E),
+])
+def test_check_values(library, name, message, expected):
+    for kernel in kernel_ids(library):
+        assert library.crc_with_kernel(name, kernel, message) == expected
+
+
+@pytest.mark.parametrize('name', ['crc32', 'crc32c'])
+@pytest.mark.parametrize('length', EDGE_LENGTHS)
+def test_edge_lengths_unaligned(library, data, name, length):
+    reference = REFERENCES[name]
+    for offset in range(8):
+        message = memoryview(data)[offset:offset + length]
+        expected = reference(bytes(message))
+        for kernel in kernel_ids(library):
+            assert library.crc_with_kernel(name, kernel, message) == expected, \
+                f"{library.crc_kernels()[kernel]}: {length} bytes at offset {offset}"
+
+
+@pytest.mark.parametrize('name', ['crc32', 'crc32c'])
+def test_multi_megabyte(library, data, name):
+    message = memoryview(data)[3:3 + MULTI_MB_LENGTH]
+    expected = REFERENCES[name](message)
+    for kernel in kernel_ids(library):
+        assert library.crc_with_kernel(name, kernel, message) == expected
+
+
+@pytest.mark.parametrize('name', ['crc32', 'crc32c'])
+def test_streaming_hasher_matches(library, data, name):
+    # The dispatched update() over uneven chunks equals the one-shot CRC
+    hasher = library.new(name)
+    position = 0
+    for size in (1, 15, 17, 63, 65, 4096, 1 << 20):
+        hasher.update(memoryview(data)[position:position + size])
+        position += size
+    expected = REFERENCES[name](data[:position])
+    assert int(hasher.hexdigest(), 16) == expected
+
+
+def test_unknown_kernel_rejected(library):
+    with pytest.raises(ValueError):
+        library.crc_with_kernel('crc32', len(library.crc_kernels()), b'abc')
+    with pytest.raises(ValueError):
+        library.crc_with_kernel('sha256', 0, b'abc')
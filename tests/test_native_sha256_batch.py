@@ -0,0 +1,73 @@
+"""
+Cross-check of the multi-buffer SHA-256 batch API against hashlib.
+Batches mix lengths around the one/two padding block boundary with
+~256KB messages, in counts that do and do not fill the SIMD lanes, so
+lanes start, finish and go idle at every point of a batch.
+"""
+
+import hashlib
+import random
+
+import pytest
+
+# Padding edges (55/56 fit one or two final blocks, 119/120 likewise for
+# two blocks), block multiples, and the largest size batching is used for
+EDGE_LENGTHS = [0, 1, 55, 56, 63, 64, 65, 119, 120, 127, 128]
+LARGE_LENGTH = 256 * 1024
+
+
+@pytest.fixture(scope='module')
+def library(native_library):
+    if not native_library.has_batch:
+        pytest.skip("native library predates batch hashing")
+    return native_library
+
+
+@pytest.fixture(scope='module')
+def messages():
+    rng = random.Random(23)
+    lengths = EDGE_LENGTHS + [LARGE_LENGTH - 1, LARGE_LENGTH, LARGE_LENGTH + 1]
+    lengths += [rng.randrange(LARGE_LENGTH) for _ in range(13)]
+    rng.shuffle(lengths)
+    return [rng.randbytes(length) for length in lengths]
+
+
+def expected(buffers) -> list[str]:
+    return [hashlib.sha256(buffer).hexdigest() for buffer in buffers]
+
+
+def test_lane_count(library):
+    assert library.batch_lanes('sha256') in (1, 4, 8)
+
+
+@pytest.mark.parametrize('count', [1, 2, 3, 4, 5, 7, 8, 9, 15, 16, 17, 24, 27])
+def test_batch_matches_hashlib(library, messages, count):
+    # Rotate through the pool so each count sees different length mixes
+    buffers = [messages[(count + i) % len(messages)] for i in range(count)]
+    assert library.hash_many('sha256', buffers) == expected(buffers)
+
+
+def test_every_edge_length_in_one_batch(library):
+    buffers = [bytes([length % 251]) * length for length in EDGE_LENGTHS]
+    assert library.hash_many('sha256', buffers) == expected(buffers)
+
+
+def test_equal_lengths_finish_together(library):
+    # Every lane finishes on the same block, then refills from the queue
+    buffers = [random.Random(i).randbytes(119) for i in range(16)]
+    assert library.hash_many('sha256', buffers) == expected(buffers)
+
+
+def test_buffer_types(library):
+    data = random.Random(5).randbytes(300)
+    buffers = [data[:56], bytearray(data[:64]), memoryview(data)[3:123]]
+    assert library.hash_many('sha256', buffers) == expected(buffers)
+
+
+def test_empty_batch(library):
+    assert library.hash_many('sha256', []) == []
+
+
+def test_other_algorithms_fall_back_per_message(library, messages):
+    buffers = messages[:9]
+    assert library.hash_many('md5', buffers) == [hashlib.md5(b).hexdigest() for b in buffers]
@@ -0,0 +1,59 @@
+"""
+Tests of the native library's portable hasher state, which checkpoints
+store so an interrupted hash resumes even in another build.
+"""
+
+import hashlib
+import os
+import struct
+
+import pytest
+
+REFERENCES = {
+    'sha256': hashlib.sha256,
+    'sha384': hashlib.sha384,
+    'sha512': hashlib.sha512,
+    'sha1': hashlib.sha1,
+    'md5': hashlib.md5,
+}
+
+
+@pytest.fixture(scope='module')
+def library(native_library):
+    if not native_library.has_portable_state:
+        pytest.skip("native library predates state export")
+    return native_library
+
+
+@pytest.mark.parametrize('name', list(REFERENCES))
+@pytest.mark.parametrize('length', [0, 1, 55, 63, 64, 65, 127, 128, 129, 1000])
+def test_resume_matches_hashlib(library, name, length):
+    head, tail = os.urandom(length), os.urandom(77)
+    hasher = library.new(name)
+    hasher.update(head)
+    resumed = library.restore(name, hasher.state())
+    resumed.update(tail)
+    assert resumed.hexdigest() == REFERENCES[name](head + tail).hexdigest()
+
+
+def test_layout_is_fixed(library):
+    # SHA-256 after 3 bytes: initial words, byte count, pending input
+    hasher = library.new('sha256')
+    hasher.update(b'abc')
+    initial = (0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+               0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19)
+    assert hasher.state() == struct.pack('<8IQ', *initial, 3) + b'abc'
+
+
+def test_crc_state(library):
+    hasher = library.new('crc32c')
+    hasher.update(b'1234')
+    resumed = library.restore('crc32c', hasher.state())
+    resumed.update(b'56789')
+    assert resumed.hexdigest() == 'e3069283'
+
+
+@pytest.mark.parametrize('state', [b'', b'\0' * 10, struct.pack('<8IQ', *range(8), 3)])
+def test_invalid_state_rejected(library, state):
+    with pytest.raises(ValueError):
+        library.restore('sha256', state)
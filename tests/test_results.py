@@ -0,0 +1,34 @@
+"""
+Tests of the export formats in results.py.
+"""
+
+from manifest import parse_manifest
+from results import ResultSink, format_record
+
+
+def test_sum_export_keeps_failures(tmp_path):
+    sink = ResultSink('sum')
+    try:
+        ok = format_record('sum', str(tmp_path / 'a.bin'), {'SHA-256': 'ab' * 32}, None, ['SHA-256'])
+        failed = format_record('sum', str(tmp_path / 'gone.bin'), None,
+                               "No such file\nor directory", ['SHA-256'])
+        sink.write('', ok)
+        sink.write('', failed)
+        export = sink.read_export()
+    finally:
+        sink.close()
+
+    assert failed == f"# ERROR {tmp_path / 'gone.bin'}: No such file or directory\n"
+    assert export == ok + failed
+
+    # The failure is a comment, so the export still parses as a manifest
+    manifest = tmp_path / 'SHA256SUMS'
+    manifest.write_text(export, encoding='utf-8')
+    entries = parse_manifest(str(manifest))
+    assert [entry.name for entry in entries] == [str(tmp_path / 'a.bin')]
+
+
+def test_csv_and_jsonl_report_failures():
+    csv = format_record('csv', 'x', None, 'denied', ['SHA-256'])
+    jsonl = format_record('jsonl', 'x', None, 'denied', ['SHA-256'])
+    assert 'denied' in csv and 'denied' in jsonl